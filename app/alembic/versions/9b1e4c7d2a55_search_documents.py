@@ -0,0 +1,144 @@
+"""search documents
+
+Revision ID: 9b1e4c7d2a55
+Revises: 7c3f0b5e9a12
+Create Date: 2026-10-16 18:26:50.104733
+
+Adds ``search_document`` with a GIN-indexed, weighted ``tsvector`` per
+course, module and lesson, kept in sync by row triggers on the source tables
+and backfilled from existing rows.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "9b1e4c7d2a55"
+down_revision = '7c3f0b5e9a12'
+branch_labels = None
+depends_on = None
+
+
+COURSE_VECTOR = """
+    setweight(to_tsvector('english', coalesce({row}.title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}.category, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}.description, '')), 'C')
+"""
+NAME_VECTOR = "setweight(to_tsvector('english', coalesce({row}.name, '')), 'A')"
+
+UPSERT = """
+    ON CONFLICT (kind, source_id) DO UPDATE
+    SET course_id = EXCLUDED.course_id,
+        title = EXCLUDED.title,
+        body = EXCLUDED.body,
+        vector = EXCLUDED.vector
+"""
+
+TRIGGER_FUNCTIONS = {
+    "course": f"""
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM search_document WHERE kind = 'course' AND source_id = OLD.id;
+            RETURN OLD;
+        END IF;
+        INSERT INTO search_document (kind, source_id, course_id, title, body, vector)
+        VALUES ('course', NEW.id, NEW.id, NEW.title, coalesce(NEW.description, ''),
+                {COURSE_VECTOR.format(row="NEW")})
+        {UPSERT};
+        RETURN NEW;
+    """,
+    "module": f"""
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM search_document WHERE kind = 'module' AND source_id = OLD.id;
+            RETURN OLD;
+        END IF;
+        INSERT INTO search_document (kind, source_id, course_id, title, body, vector)
+        VALUES ('module', NEW.id, NEW.course_id, NEW.name, '', {NAME_VECTOR.format(row="NEW")})
+        {UPSERT};
+        IF TG_OP = 'UPDATE' AND NEW.course_id IS DISTINCT FROM OLD.course_id THEN
+            UPDATE search_document AS d SET course_id = NEW.course_id
+            FROM lesson AS l
+            WHERE d.kind = 'lesson' AND d.source_id = l.id AND l.module_id = NEW.id;
+        END IF;
+        RETURN NEW;
+    """,
+    "lesson": f"""
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM search_document WHERE kind = 'lesson' AND source_id = OLD.id;
+            RETURN OLD;
+        END IF;
+        INSERT INTO search_document (kind, source_id, course_id, title, body, vector)
+        SELECT 'lesson', NEW.id, m.course_id, NEW.name, '', {NAME_VECTOR.format(row="NEW")}
+        FROM module AS m WHERE m.id = NEW.module_id
+        {UPSERT};
+        RETURN NEW;
+    """,
+}
+
+TRIGGER_COLUMNS = {
+    "course": "title, description, category",
+    "module": "name, course_id",
+    "lesson": "name, module_id",
+}
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('search_document',
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), server_default='', nullable=False),
+    sa.Column('vector', postgresql.TSVECTOR(), nullable=True),
+    sa.PrimaryKeyConstraint('kind', 'source_id')
+    )
+    op.create_index('ix_search_document_course_id', 'search_document', ['course_id'], unique=False)
+    op.create_index('ix_search_document_vector', 'search_document', ['vector'], unique=False, postgresql_using='gin')
+    # ### end Alembic commands ###
+
+    for table, body in TRIGGER_FUNCTIONS.items():
+        op.execute(
+            f"CREATE FUNCTION search_document_{table}() RETURNS trigger "
+            f"LANGUAGE plpgsql AS $$ BEGIN {body} END $$"
+        )
+        op.execute(
+            f"CREATE TRIGGER trg_search_document_{table} "
+            f"AFTER INSERT OR DELETE OR UPDATE OF {TRIGGER_COLUMNS[table]} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION search_document_{table}()"
+        )
+
+    op.execute(
+        f"""
+        INSERT INTO search_document (kind, source_id, course_id, title, body, vector)
+        SELECT 'course', c.id, c.id, c.title, coalesce(c.description, ''), {COURSE_VECTOR.format(row="c")}
+        FROM course AS c
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO search_document (kind, source_id, course_id, title, body, vector)
+        SELECT 'module', m.id, m.course_id, m.name, '', {NAME_VECTOR.format(row="m")}
+        FROM module AS m
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO search_document (kind, source_id, course_id, title, body, vector)
+        SELECT 'lesson', l.id, m.course_id, l.name, '', {NAME_VECTOR.format(row="l")}
+        FROM lesson AS l JOIN module AS m ON m.id = l.module_id
+        """
+    )
+
+
+def downgrade() -> None:
+    for table in TRIGGER_FUNCTIONS:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_search_document_{table} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS search_document_{table}()")
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index('ix_search_document_vector', table_name='search_document', postgresql_using='gin')
+    op.drop_index('ix_search_document_course_id', table_name='search_document')
+    op.drop_table('search_document')
+    # ### end Alembic commands ###
@@ -0,0 +1,45 @@
+"""auditlog retention rollup
+
+Revision ID: b76e87764d03
+Revises: c5ec554a8db4
+Create Date: 2026-10-16 11:40:02.561930
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b76e87764d03"
+down_revision = 'c5ec554a8db4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('auditlog', sa.Column('route', sa.String(length=500), nullable=True))
+    op.create_index(
+        'ix_auditlog_timestamp_brin',
+        'auditlog',
+        ['timestamp'],
+        unique=False,
+        postgresql_using='brin',
+    )
+    op.create_table('auditlogrollup',
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('route', sa.String(length=500), nullable=False),
+    sa.Column('method', sa.String(length=10), nullable=False),
+    sa.Column('status_class', sa.SmallInteger(), nullable=False),
+    sa.Column('request_count', sa.Integer(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('duration_sum_ms', sa.Float(), nullable=False),
+    sa.Column('duration_max_ms', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('bucket', 'route', 'method', 'status_class')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('auditlogrollup')
+    op.drop_index('ix_auditlog_timestamp_brin', table_name='auditlog')
+    op.drop_column('auditlog', 'route')
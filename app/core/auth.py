@@ -1,13 +1,17 @@
 """
 Authentication utilities for password hashing and token generation.
 """
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 import bcrypt
 from jose import JWTError, jwt
 
 from app.core.config import get_settings
+from app.core.models.enums import UserRole
 
 settings = get_settings()
 
@@ -56,6 +60,126 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+T = TypeVar("T")
+
+
+class PasswordHashingPool:
+    """
+    Bounded executor for bcrypt work.
+
+    bcrypt at 12 rounds takes ~250 ms of CPU, so running it inline stalls the
+    event loop.  Calls are sent to a dedicated thread pool (bcrypt releases
+    the GIL) or, optionally, a process pool.  A semaphore caps how many calls
+    are in flight; time spent waiting for it is recorded as queue wait.
+    """
+
+    def __init__(self, max_workers: int = 4, kind: str = "thread") -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {kind}")
+        self.max_workers = max_workers
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+        self.completed = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_run_ms = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="bcrypt",
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        wait_ms = (started_at - queued_at) * 1000.0
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_run_ms += (time.perf_counter() - started_at) * 1000.0
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "avg_wait_ms": self.total_wait_ms / completed,
+            "max_wait_ms": self.max_wait_ms,
+            "avg_run_ms": self.total_run_ms / completed,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_pool = PasswordHashingPool(
+    max_workers=settings.password_hash_workers,
+    kind=settings.password_hash_executor,
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await password_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+class Principal:
+    """
+    Authenticated identity: just enough to make permission decisions.
+
+    Built from token claims or a cached user snapshot, so most requests can be
+    authorised without loading the ``User`` row.
+    """
+
+    __slots__ = ("id", "role", "email", "token_version")
+
+    def __init__(self, id: int, role: UserRole, email: Optional[str], token_version: int) -> None:
+        self.id = id
+        self.role = role
+        self.email = email
+        self.token_version = token_version
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(user.id, user.role, user.email, user.token_version)
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id}, role={self.role.value})"
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
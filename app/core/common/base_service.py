@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Generic, Iterable, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Set, Tuple, Type, TypeVar
 
-from sqlalchemy import Select, select
+from fastapi import HTTPException, status
+from sqlalchemy import Select, delete, insert, inspect as sa_inspect, select, tuple_, update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.common.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
 from app.core.db.base import Base
 
 
@@ -13,6 +16,12 @@ logger = logging.getLogger(__name__)
 
 TModel = TypeVar("TModel", bound=Base)
 
+# (position in the request, payload) pairs and the per-item errors of bulk calls
+BulkItems = List[Tuple[int, Dict[str, Any]]]
+BulkErrors = List[Dict[str, Any]]
+
+BULK_CHUNK_SIZE = 1000
+
 
 class BaseService(Generic[TModel]):
     """
@@ -24,6 +33,12 @@ class BaseService(Generic[TModel]):
 
     model: Type[TModel]
 
+    # Write with INSERT/UPDATE ... RETURNING (one round trip, no refresh)
+    use_returning: bool = False
+
+    # Columns clients may sort keyset pages by (``id`` is always the tiebreaker)
+    cursor_sort_keys: Tuple[str, ...] = ("id",)
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
@@ -32,9 +47,38 @@ class BaseService(Generic[TModel]):
     def _base_select(self) -> Select:
         return select(self.model)
 
+    def _column_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        ``data`` restricted to mapped columns, or ``None`` if it sets anything
+        else (relationships, properties) and needs the unit-of-work path.
+        """
+
+        columns = sa_inspect(self.model).column_attrs.keys()
+        if any(key not in columns for key in data):
+            return None
+        return data
+
+    def _apply_filters(self, stmt: Select, filters: Optional[Dict[str, Any]]) -> Select:
+        if filters:
+            for field, value in filters.items():
+                if value is None:
+                    continue
+                column = getattr(self.model, field, None)
+                if column is not None:
+                    stmt = stmt.where(column == value)
+        return stmt
+
     # ---- CRUD ---------------------------------------------------------
 
     async def create(self, data: Dict[str, Any]) -> TModel:
+        values = self._column_data(data) if self.use_returning else None
+        if values is not None:
+            stmt = insert(self.model).values(**values).returning(self.model)
+            instance = (await self.session.execute(stmt)).scalar_one()
+            await self.session.commit()
+            logger.debug("Created %s with id=%s", self.model.__name__, getattr(instance, "id", None))
+            return instance
+
         instance = self.model(**data)  # type: ignore[arg-type]
         self.session.add(instance)
         await self.session.commit()
@@ -52,20 +96,72 @@ class BaseService(Generic[TModel]):
         offset: int = 0,
         limit: int = 100,
     ) -> List[TModel]:
-        stmt = self._base_select()
-        if filters:
-            for field, value in filters.items():
-                if value is None:
-                    continue
-                column = getattr(self.model, field, None)
-                if column is not None:
-                    stmt = stmt.where(column == value)
-
+        stmt = self._apply_filters(self._base_select(), filters)
         stmt = stmt.offset(offset).limit(limit)
         result = await self.session.execute(stmt)
         return list(result.scalars().unique().all())
 
+    async def list_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        sort: str = "id",
+    ) -> Tuple[List[TModel], Optional[str]]:
+        """
+        Keyset-paginated listing ordered by ``(sort, id)``.
+
+        Returns the page and the cursor for the next one (``None`` on the last
+        page).  Cost does not grow with page depth, unlike ``list``'s offset.
+        ``limit`` must be between 1 and ``MAX_PAGE_SIZE``.
+        """
+
+        if sort not in self.cursor_sort_keys:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot sort by '{sort}'. Allowed: {list(self.cursor_sort_keys)}",
+            )
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPException(
+                status_code=422,
+                detail=f"limit must be between 1 and {MAX_PAGE_SIZE}",
+            )
+
+        id_column = self.model.id  # type: ignore[attr-defined]
+        sort_column = getattr(self.model, sort)
+        stmt = self._apply_filters(self._base_select(), filters)
+
+        if cursor:
+            position = decode_cursor(cursor, sort, sort_column, id_column)
+            if sort == "id":
+                stmt = stmt.where(id_column > position["id"])
+            else:
+                stmt = stmt.where(
+                    tuple_(sort_column, id_column) > tuple_(position["value"], position["id"])
+                )
+
+        if sort == "id":
+            stmt = stmt.order_by(id_column)
+        else:
+            stmt = stmt.order_by(sort_column, id_column)
+
+        result = await self.session.execute(stmt.limit(limit + 1))
+        rows = list(result.scalars().unique().all())
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(sort, getattr(last, sort), last.id)  # type: ignore[attr-defined]
+
     async def update(self, instance: TModel, data: Dict[str, Any]) -> TModel:
+        values = self._column_data(data) if self.use_returning else None
+        if values is not None:
+            if not values:
+                return instance
+            updated = await self._update_returning(instance.id, values)  # type: ignore[attr-defined]
+            return updated if updated is not None else instance
+
         for field, value in data.items():
             if not hasattr(instance, field):
                 continue
@@ -77,10 +173,189 @@ class BaseService(Generic[TModel]):
         logger.debug("Updated %s id=%s", self.model.__name__, getattr(instance, "id", None))
         return instance
 
+    async def update_by_id(self, id_: Any, data: Dict[str, Any]) -> Optional[TModel]:
+        """
+        Update a row without loading it first; ``None`` if it does not exist.
+
+        With ``use_returning`` this is a single ``UPDATE ... RETURNING``.
+        """
+
+        values = self._column_data(data) if self.use_returning else None
+        if values:
+            return await self._update_returning(id_, values)
+
+        instance = await self.get_by_id(id_)
+        if instance is None:
+            return None
+        return await self.update(instance, data)
+
+    async def _update_returning(self, id_: Any, values: Dict[str, Any]) -> Optional[TModel]:
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id_)  # type: ignore[attr-defined]
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        instance = (await self.session.execute(stmt)).scalar_one_or_none()
+        await self.session.commit()
+        logger.debug("Updated %s id=%s", self.model.__name__, id_)
+        return instance
+
     async def delete(self, instance: TModel) -> None:
         await self.session.delete(instance)
         await self.session.commit()
         logger.debug("Deleted %s id=%s", self.model.__name__, getattr(instance, "id", None))
 
+    # ---- Bulk ---------------------------------------------------------
+
+    async def bulk_create(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        """
+        Insert many rows in one transaction with multi-row ``INSERT ... RETURNING``.
+
+        Each chunk runs in a savepoint; if it fails, its rows are retried one by
+        one so a bad item is reported by index instead of failing the request.
+        Returns the new ids (in request order) and the per-item errors.
+        """
+
+        id_column = self.model.id  # type: ignore[attr-defined]
+        ids: List[int] = []
+        errors: BulkErrors = []
+
+        for chunk in _chunks(items, chunk_size):
+            try:
+                async with self.session.begin_nested():
+                    result = await self.session.execute(
+                        insert(self.model).returning(id_column, sort_by_parameter_order=True),
+                        [data for _, data in chunk],
+                    )
+                    ids.extend(result.scalars().all())
+                continue
+            except DBAPIError:
+                logger.info("Bulk insert of %d %s rows failed; retrying row by row", len(chunk), self.model.__name__)
+
+            for index, data in chunk:
+                try:
+                    async with self.session.begin_nested():
+                        result = await self.session.execute(
+                            insert(self.model).values(**data).returning(id_column)
+                        )
+                        ids.append(result.scalar_one())
+                except DBAPIError as exc:
+                    errors.append({"index": index, "detail": _db_error_detail(exc)})
+
+        await self.session.commit()
+        return ids, errors
+
+    async def bulk_update(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        """
+        Update many rows by primary key with executemany ``UPDATE`` statements.
+
+        Every payload must carry ``id``.  Unknown ids are reported per item;
+        the rest are written chunk by chunk in one transaction.
+        """
+
+        ids: List[int] = []
+        errors: BulkErrors = []
+
+        for chunk in _chunks(items, chunk_size):
+            existing = await self._existing_ids([data["id"] for _, data in chunk])
+            found: BulkItems = []
+            for index, data in chunk:
+                if data["id"] in existing:
+                    found.append((index, data))
+                else:
+                    errors.append({"index": index, "detail": f"{self.model.__name__} {data['id']} not found"})
+
+            changed = [data for _, data in found if len(data) > 1]
+            try:
+                async with self.session.begin_nested():
+                    if changed:
+                        await self.session.execute(update(self.model), changed)
+                ids.extend(data["id"] for _, data in found)
+                continue
+            except DBAPIError:
+                logger.info("Bulk update of %d %s rows failed; retrying row by row", len(changed), self.model.__name__)
+
+            for index, data in found:
+                try:
+                    async with self.session.begin_nested():
+                        if len(data) > 1:
+                            await self.session.execute(update(self.model), [data])
+                    ids.append(data["id"])
+                except DBAPIError as exc:
+                    errors.append({"index": index, "detail": _db_error_detail(exc)})
+
+        await self.session.commit()
+        return ids, errors
+
+    async def bulk_delete(
+        self, items: List[Tuple[int, int]], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        """
+        Delete many rows by id with one ``DELETE ... WHERE id IN (...)`` per chunk.
+        """
+
+        id_column = self.model.id  # type: ignore[attr-defined]
+        ids: List[int] = []
+        errors: BulkErrors = []
+
+        for chunk in _chunks(items, chunk_size):
+            existing = await self._existing_ids([id_ for _, id_ in chunk])
+            found = []
+            for index, id_ in chunk:
+                if id_ in existing:
+                    found.append((index, id_))
+                else:
+                    errors.append({"index": index, "detail": f"{self.model.__name__} {id_} not found"})
+
+            try:
+                async with self.session.begin_nested():
+                    if found:
+                        await self.session.execute(
+                            delete(self.model)
+                            .where(id_column.in_({id_ for _, id_ in found}))
+                            .execution_options(synchronize_session=False)
+                        )
+                ids.extend(id_ for _, id_ in found)
+                continue
+            except DBAPIError:
+                logger.info("Bulk delete of %d %s rows failed; retrying row by row", len(found), self.model.__name__)
+
+            for index, id_ in found:
+                try:
+                    async with self.session.begin_nested():
+                        await self.session.execute(
+                            delete(self.model)
+                            .where(id_column == id_)
+                            .execution_options(synchronize_session=False)
+                        )
+                    ids.append(id_)
+                except DBAPIError as exc:
+                    errors.append({"index": index, "detail": _db_error_detail(exc)})
+
+        await self.session.commit()
+        return ids, errors
+
+    async def _existing_ids(self, ids: Iterable[Any]) -> Set[Any]:
+        id_column = self.model.id  # type: ignore[attr-defined]
+        wanted = set(ids)
+        if not wanted:
+            return set()
+        result = await self.session.execute(select(id_column).where(id_column.in_(wanted)))
+        return set(result.scalars().all())
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    size = max(size, 1)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
 
 
+def _db_error_detail(exc: DBAPIError) -> str:
+    message = str(exc.orig) if exc.orig is not None else str(exc)
+    return message.strip().splitlines()[0] if message.strip() else type(exc).__name__
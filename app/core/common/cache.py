@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from app.core.auth import Principal
+from app.core.config import get_settings
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Sentinel for ``TTLCache.get`` when ``None`` is a meaningful cached value
+MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache whose entries expire after a TTL.
+
+    Lookups refresh LRU order but not expiry; once ``maxsize`` entries are
+    stored the least recently used one is evicted.  Not thread-safe: it is
+    meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K, default: Any = None) -> Any:
+        entry = self._data.get(key, MISSING)
+        if entry is MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry  # type: ignore[misc]
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, MISSING) is not MISSING  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_settings = get_settings()
+
+# user id -> True (exists) / False (known not to exist)
+user_exists_cache: TTLCache[int, bool] = TTLCache(
+    maxsize=_settings.user_cache_size,
+    ttl=_settings.user_cache_ttl,
+)
+
+# user id -> DB-verified Principal snapshot of an existing user.  Per process:
+# a role change or delete committed through another worker reaches this one
+# only when the entry expires, after at most AUTH_PRINCIPAL_CACHE_TTL seconds
+principal_cache: TTLCache[int, Principal] = TTLCache(
+    maxsize=_settings.user_cache_size,
+    ttl=_settings.auth_principal_cache_ttl,
+)
+
+# raw bearer token -> verified JWT claims (expires no later than the token)
+token_claims_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    maxsize=_settings.auth_token_cache_size,
+    ttl=_settings.auth_token_cache_ttl,
+)
+
+# (user id, catalog and progress resource_version counters) ->
+# {target course id: ordered course ids still to take}
+learning_path_cache: TTLCache[Tuple[int, int, int], Dict[int, Tuple[int, ...]]] = TTLCache(
+    maxsize=_settings.learning_path_cache_size,
+    ttl=_settings.learning_path_cache_ttl,
+)
+
+# (course id, resource_version counter) -> serialized CourseOutlineResponse JSON
+course_outline_cache: TTLCache[Tuple[int, int], bytes] = TTLCache(
+    maxsize=_settings.course_outline_cache_size,
+    ttl=_settings.course_outline_cache_ttl,
+)
+
+
+def remember_user(user_id: int, exists: bool = True) -> None:
+    """
+    Record whether a user id exists; missing ids are kept for a shorter TTL.
+    """
+
+    ttl = None if exists else _settings.user_cache_negative_ttl
+    user_exists_cache.set(user_id, exists, ttl=ttl)
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Drop every cached fact about ``user_id``; called on user updates and deletes.
+    """
+
+    user_exists_cache.invalidate(user_id)
+    principal_cache.invalidate(user_id)
+
+
+def remember_principal(principal: Principal) -> None:
+    """
+    Cache the DB-verified identity of an existing user.
+
+    Unknown ids are not cached: a user created right after a failed lookup
+    must be able to authenticate at once.
+    """
+
+    principal_cache.set(principal.id, principal)
+    remember_user(principal.id)
@@ -0,0 +1,189 @@
+"""
+Change counters and conditional GETs for the catalog read routes.
+
+Course, module, lesson and assessment writes call ``touch_courses`` before
+they commit.  The ``resource_version`` counters of those courses (and of the
+catalog, for changes visible in the course list) are bumped in the same
+transaction.  Cached course outlines are keyed by the counter, so every
+worker stops serving the old outline once the transaction commits.
+
+Read routes derive a strong ETag from the counter plus the request URL and
+answer ``304 Not Modified`` when it matches ``If-None-Match``, before any
+ORM object is loaded.
+
+Enrollment writes call ``touch_progress`` the same way.  Learning paths are
+cached under the learner's progress counter and the catalog counter (which
+prerequisite changes bump), so they go stale in every worker at once too.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import and_, event, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.models.module import Module
+from app.core.models.resource_version import resource_version
+
+CATALOG = "catalog"
+COURSE = "course"
+PROGRESS = "progress"
+CONDITIONAL_HEADERS = ("ETag", "Cache-Control")
+
+# Bump when a catalog response schema changes so old ETags stop matching
+_REPRESENTATION = "1"
+_PENDING = "catalog_versions_pending"
+
+
+def touch_courses(session: AsyncSession, course_ids: Iterable[int], catalog: bool = False) -> None:
+    """
+    Record that ``course_ids`` (and the course list, if ``catalog``) change
+    in the session's current transaction.
+    """
+
+    pending: Set[Tuple[str, int]] = session.info.setdefault(_PENDING, set())
+    pending.update((COURSE, course_id) for course_id in course_ids)
+    if catalog:
+        pending.add((CATALOG, 0))
+
+
+def touch_progress(session: AsyncSession, user_ids: Iterable[int]) -> None:
+    """
+    Record that the enrollments of ``user_ids`` change in the session's
+    current transaction.
+    """
+
+    pending: Set[Tuple[str, int]] = session.info.setdefault(_PENDING, set())
+    pending.update((PROGRESS, user_id) for user_id in user_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session: Session) -> None:
+    pending = session.info.get(_PENDING)
+    if not pending:
+        return
+    insert = sqlite_insert if session.get_bind().dialect.name == "sqlite" else pg_insert
+    stmt = insert(resource_version)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[resource_version.c.resource, resource_version.c.resource_id],
+        set_={"version": resource_version.c.version + 1},
+    )
+    # Sorted so concurrent writers take the row locks in the same order
+    rows = [{"resource": resource, "resource_id": id_, "version": 1} for resource, id_ in sorted(pending)]
+    session.execute(stmt, rows)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+# ---- Reads ------------------------------------------------------------
+
+
+async def course_version(session: AsyncSession, course_id: int) -> int:
+    """
+    The change counter of one course (0 if it was never written).
+    """
+
+    rv = resource_version.c
+    stmt = select(rv.version).where(rv.resource == COURSE, rv.resource_id == course_id)
+    return (await session.execute(stmt)).scalar_one_or_none() or 0
+
+
+async def learning_path_versions(
+    session: AsyncSession, user_ids: Sequence[int]
+) -> Dict[int, Tuple[int, int]]:
+    """
+    The ``(catalog, progress)`` counters the learning paths of each user are
+    cached under, in one query.
+    """
+
+    rv = resource_version.c
+    stmt = select(rv.resource, rv.resource_id, rv.version).where(
+        or_(
+            and_(rv.resource == CATALOG, rv.resource_id == 0),
+            and_(rv.resource == PROGRESS, rv.resource_id.in_(user_ids)),
+        )
+    )
+    catalog, progress = 0, {}
+    for resource, resource_id, version in (await session.execute(stmt)).all():
+        if resource == CATALOG:
+            catalog = version
+        else:
+            progress[resource_id] = version
+    return {user_id: (catalog, progress.get(user_id, 0)) for user_id in user_ids}
+
+
+async def not_modified(
+    request: Request,
+    response: Response,
+    session: AsyncSession,
+    *,
+    course_id: Optional[int] = None,
+    module_id: Optional[int] = None,
+) -> Optional[Response]:
+    """
+    Conditional GET for a catalog read.
+
+    The version is the course list's when no id is given, the course's for
+    ``course_id`` and the owning course's for ``module_id``.  Sets ``ETag``
+    and ``Cache-Control`` on ``response`` and returns a 304 response to send
+    instead when the client's copy is current, else ``None``.  The version
+    is left on ``request.state.resource_version`` for the route to reuse.
+    """
+
+    rv = resource_version.c
+    if module_id is not None:
+        stmt = (
+            select(Module.course_id, func.coalesce(rv.version, 0))
+            .select_from(Module)
+            .outerjoin(resource_version, and_(rv.resource == COURSE, rv.resource_id == Module.course_id))
+            .where(Module.id == module_id)
+        )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            return None
+        key, version = f"{COURSE}-{row[0]}", row[1]
+    elif course_id is not None:
+        key, version = f"{COURSE}-{course_id}", await course_version(session, course_id)
+    else:
+        stmt = select(rv.version).where(rv.resource == CATALOG, rv.resource_id == 0)
+        key, version = CATALOG, (await session.execute(stmt)).scalar_one_or_none() or 0
+    request.state.resource_version = version
+
+    url = f"{_REPRESENTATION}|{request.url.path}?{request.url.query}"
+    digest = hashlib.blake2b(url.encode(), digest_size=6).hexdigest()
+    etag = f'"{key}.{version}.{digest}"'
+    headers = dict(zip(CONDITIONAL_HEADERS, (etag, get_settings().catalog_cache_control)))
+
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def conditional_headers(response: Response) -> Dict[str, str]:
+    """
+    The headers ``not_modified`` set, for routes that return their own ``Response``.
+    """
+
+    return {name: response.headers[name] for name in CONDITIONAL_HEADERS if name in response.headers}
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/ prefixes are ignored
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
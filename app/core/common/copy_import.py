@@ -0,0 +1,58 @@
+"""
+COPY-based staging for CSV imports on PostgreSQL.
+
+With ``ImportEngine.COPY`` an import chunk is streamed into a temporary
+staging table with asyncpg's ``copy_records_to_table`` (binary COPY, one
+round trip), then rejected rows are found with one set-based query and the
+rest are written with a single ``INSERT ... SELECT``.  Other databases fall
+back to the default path, which validates in Python and inserts with an
+executemany ``INSERT``.
+"""
+from __future__ import annotations
+
+from enum import Enum
+from typing import Iterable, Sequence
+
+from sqlalchemy import Integer, Table, any_, delete, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ImportEngine(str, Enum):
+    ORM = "orm"
+    COPY = "copy"
+
+
+def copy_supported(session: AsyncSession) -> bool:
+    return session.get_bind().dialect.driver == "asyncpg"
+
+
+async def copy_to_staging(session: AsyncSession, staging: Table, records: Iterable[Sequence]) -> None:
+    """
+    Create the temporary ``staging`` table in the session's transaction and
+    COPY ``records`` into it, in column order.
+
+    ``staging`` must be declared with ``prefixes=["TEMPORARY"]`` and
+    ``postgresql_on_commit="DROP"`` so it disappears with the transaction,
+    and have an integer ``row_num`` column holding the CSV line number.
+    """
+
+    connection = await session.connection()
+    await connection.run_sync(staging.create)
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        staging.name,
+        records=list(records),
+        columns=[column.name for column in staging.columns],
+    )
+
+
+async def discard_staged(session: AsyncSession, staging: Table, row_nums: Sequence[int]) -> None:
+    """
+    Remove rows rejected in Python from ``staging`` before it is inserted.
+    """
+
+    if row_nums:
+        # One array parameter, however many rows
+        rows = literal(list(row_nums), ARRAY(Integer))
+        await session.execute(delete(staging).where(staging.c.row_num == any_(rows)))
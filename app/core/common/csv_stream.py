@@ -0,0 +1,317 @@
+"""
+Streaming CSV reading for uploads.
+
+An upload is read ``CSV_READ_CHUNK_SIZE`` bytes at a time and split into
+records at newlines outside quoted fields, so the header check reads a
+single record and an import holds at most one batch of rows, whatever the
+file size.  Records are decoded one at a time: a row that is not valid
+UTF-8 becomes a row error instead of failing the whole upload.
+"""
+from __future__ import annotations
+
+import csv
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+
+_BOM = b"\xef\xbb\xbf"
+_QUOTE = ord('"')
+_COMMA = ord(",")
+
+# (row number as reported by the importers, fields by header or why the row is unreadable)
+CsvRow = Tuple[int, Union[Dict[str, Optional[str]], ValueError]]
+
+
+class CsvPosition(NamedTuple):
+    """
+    Where a batch ends: the byte offset past its last record and the number
+    of the row after it.  Reading can resume from here.
+    """
+
+    offset: int
+    row_num: int
+
+
+# An importer's row conversion: typed values of a row, or raises with the row error
+ParseRow = Callable[[Union[Dict[str, Optional[str]], ValueError]], Dict[str, Any]]
+
+# Rows of a batch converted by a ParseRow, failures kept in place as exceptions
+ParsedRows = List[Tuple[int, Any]]
+
+# Awaited by the importers before each batch commits, with the position after
+# the batch, the number of rows inserted and the (row_num, message) errors
+ImportCheckpoint = Callable[
+    [AsyncSession, CsvPosition, int, List[Tuple[int, str]]], Awaitable[None]
+]
+
+
+async def read_records(file: UploadFile, start: int = 0) -> AsyncIterator[List[Tuple[int, bytes]]]:
+    """
+    Complete CSV records of ``file`` from byte ``start`` on, one list per
+    chunk read, each record paired with the byte offset just past it.  A
+    UTF-8 byte order mark at the start of the file is skipped.
+    """
+
+    settings = get_settings()
+    chunk_size, limit = settings.csv_read_chunk_size, settings.csv_max_record_bytes
+    await file.seek(start)
+
+    pending = bytearray()
+    offset = start  # file offset of pending[0]
+    scanned = 0  # pending[:scanned] holds whole lines of the current record
+    in_quotes = False
+    first = start == 0
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        if first:
+            first = False
+            if chunk.startswith(_BOM):
+                chunk, offset = chunk[len(_BOM) :], offset + len(_BOM)
+        pending += chunk
+
+        block = []
+        begin = 0
+        last = pending.rfind(b"\n")
+        if not in_quotes and last >= 0 and pending.find(b'"', scanned, last) < 0:
+            # No quotes: every newline ends a record
+            for line in bytes(pending[: last + 1]).split(b"\n")[:-1]:
+                begin += len(line) + 1
+                block.append((offset + begin, line))
+            scanned = begin
+        while True:
+            newline = pending.find(b"\n", scanned)
+            if newline < 0:
+                break
+            end = newline + 1
+            if in_quotes or pending.find(b'"', scanned, end) >= 0:
+                in_quotes = _quote_state(pending[scanned:end], in_quotes)
+            scanned = end
+            # A newline inside a quoted field does not end the record
+            if not in_quotes:
+                block.append((offset + end, bytes(pending[begin:end])))
+                begin = end
+
+        del pending[:begin]
+        offset += begin
+        scanned -= begin
+        if len(pending) > limit:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"CSV record at byte {offset} is longer than {limit} bytes",
+            )
+        if block:
+            yield block
+
+    if pending:
+        yield [(offset + len(pending), bytes(pending))]
+
+
+def _quote_state(line: bytes, in_quotes: bool) -> bool:
+    # Whether a quoted field is still open after ``line``, the way csv.reader
+    # sees it: quotes only open a field at its start and "" is an escaped quote
+    field_start = not in_quotes
+    i, size = 0, len(line)
+    while i < size:
+        byte = line[i]
+        if in_quotes:
+            if byte == _QUOTE:
+                if i + 1 < size and line[i + 1] == _QUOTE:
+                    i += 1
+                else:
+                    in_quotes = False
+        elif byte == _QUOTE and field_start:
+            in_quotes = True
+        field_start = byte == _COMMA and not in_quotes
+        i += 1
+    return in_quotes
+
+
+def split_records(data: bytes, offset: int = 0) -> List[Tuple[int, bytes]]:
+    """
+    ``data``, which starts at a record boundary at byte ``offset`` of its
+    file, split into records the way ``read_records`` does.  A last record
+    without a newline is kept.
+    """
+
+    if data.find(b'"') < 0:
+        records = []
+        end = offset
+        for line in data.split(b"\n"):
+            end += len(line) + 1
+            records.append((end, line))
+        if records[-1][1]:
+            records[-1] = (offset + len(data), records[-1][1])
+        else:
+            records.pop()
+        return records
+
+    records = []
+    begin = scanned = 0
+    in_quotes = False
+    while True:
+        newline = data.find(b"\n", scanned)
+        if newline < 0:
+            break
+        end = newline + 1
+        if in_quotes or data.find(b'"', scanned, end) >= 0:
+            in_quotes = _quote_state(data[scanned:end], in_quotes)
+        scanned = end
+        if not in_quotes:
+            records.append((offset + end, data[begin:end]))
+            begin = end
+    if begin < len(data):
+        records.append((offset + len(data), data[begin:]))
+    return records
+
+
+async def read_csv_header(file: UploadFile) -> Optional[List[str]]:
+    """
+    Column names from the first record of ``file`` (``None`` if it is empty),
+    reading no further than that record.  Leaves ``file`` at its start.
+    """
+
+    header = None
+    records = read_records(file)
+    try:
+        async for block in records:
+            for _, record in block:
+                header = _header(record)
+                if header:
+                    break
+            if header:
+                break
+    finally:
+        await records.aclose()
+    await file.seek(0)
+    return header
+
+
+def _header(record: bytes) -> Optional[List[str]]:
+    # Blank lines before the header are skipped
+    return next(csv.reader([record.decode("utf-8")]), None) or None
+
+
+async def iter_csv_batches(
+    file: UploadFile, batch_size: int, start: Optional[CsvPosition] = None
+) -> AsyncIterator[Tuple[List[CsvRow], CsvPosition]]:
+    """
+    Rows of ``file`` after its header, ``batch_size`` records at a time, each
+    batch with the position after it.
+
+    Rows are keyed by header like ``csv.DictReader`` (missing values are
+    ``None``, blank lines skipped) and numbered from 2 the way the importers
+    have always reported them.  ``start`` resumes at a position yielded
+    earlier.
+    """
+
+    batch_size = max(batch_size, 1)
+    header: Optional[List[str]] = None
+    row_num = 2
+    offset = 0
+    if start is not None:
+        header = await read_csv_header(file)
+        offset, row_num = start
+    records: List[bytes] = []
+    async for block in read_records(file, offset):
+        for end, record in block:
+            if header is None:
+                header = _header(record)
+                continue
+            records.append(record)
+            if len(records) >= batch_size:
+                rows, row_num = parse_records(records, header, row_num)
+                records = []
+                if rows:
+                    yield rows, CsvPosition(end, row_num)
+        offset = block[-1][0]
+    if records and header is not None:
+        rows, row_num = parse_records(records, header, row_num)
+        if rows:
+            yield rows, CsvPosition(offset, row_num)
+
+
+async def iter_parsed_batches(
+    file: UploadFile,
+    batch_size: int,
+    parse_row: ParseRow,
+    start: Optional[CsvPosition] = None,
+) -> AsyncIterator[Tuple[ParsedRows, CsvPosition]]:
+    """
+    ``iter_csv_batches`` with every row converted by ``parse_row``.
+    """
+
+    async for chunk, position in iter_csv_batches(file, batch_size, start):
+        parsed: ParsedRows = []
+        for row_num, row in chunk:
+            try:
+                parsed.append((row_num, parse_row(row)))
+            except Exception as e:
+                parsed.append((row_num, e))
+        yield parsed, position
+
+
+def parse_records(
+    records: Sequence[bytes], header: Sequence[str], row_num: int
+) -> Tuple[List[CsvRow], int]:
+    """
+    Decode and split ``records``, numbering the rows from ``row_num``.
+
+    Returns the rows and the number of the row after them.
+    """
+
+    rows: List[CsvRow] = []
+    width = len(header)
+    try:
+        texts = [record.decode("utf-8") for record in records]
+    except UnicodeDecodeError:
+        pass
+    else:
+        for values in csv.reader(texts):
+            row_num = _append_row(rows, header, width, values, row_num)
+        return rows, row_num
+
+    decoded = [_decode(record) for record in records]
+    fields = csv.reader(text for text in decoded if text is not None)
+    for text in decoded:
+        if text is None:
+            rows.append((row_num, ValueError("Row is not valid UTF-8")))
+            row_num += 1
+        else:
+            row_num = _append_row(rows, header, width, next(fields), row_num)
+    return rows, row_num
+
+
+def _decode(record: bytes) -> Optional[str]:
+    try:
+        return record.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _append_row(
+    rows: List[CsvRow], header: Sequence[str], width: int, values: List[str], row_num: int
+) -> int:
+    if not values:
+        return row_num
+    row: Dict[str, Optional[str]] = dict(zip(header, values))
+    if len(values) < width:
+        row.update(dict.fromkeys(header[len(values) :]))
+    rows.append((row_num, row))
+    return row_num + 1
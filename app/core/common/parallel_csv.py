@@ -0,0 +1,299 @@
+"""
+Parallel parsing of spooled CSV imports.
+
+Decoding, splitting and type-converting rows is pure CPU work that, inline,
+runs on the event loop.  For a file on disk it can be spread over a process
+pool instead: the file is cut into pieces of about
+``IMPORT_PARSE_PIECE_BYTES`` at record boundaries, each piece is parsed by a
+worker process into one typed array per column (``array('q')`` for ids,
+``array('d')`` for numbers) plus its row errors, and the event loop only
+rebuilds the rows of one batch at a time for the database work.
+
+Finding the boundaries needs no parsing: the file is memory-mapped and only
+newlines and quotes are searched for, so a file without quoted fields is
+split at ``bytes.find`` speed.  Pieces are parsed ahead of the importer, at
+most two per process, and handed over in file order.
+"""
+from __future__ import annotations
+
+import asyncio
+import mmap
+import multiprocessing
+import os
+from array import array
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.common.csv_stream import (
+    CsvPosition,
+    ParsedRows,
+    ParseRow,
+    _header,
+    iter_parsed_batches,
+    parse_records,
+    split_records,
+)
+from app.core.config import get_settings
+
+_BOM = b"\xef\xbb\xbf"
+_FIELD_START = (ord(","), ord("\n"))
+
+# Column name -> array typecode of its values, or None for strings
+ParseColumns = Dict[str, Optional[str]]
+
+# A parsed batch as sent back by a worker: the offset past its last record,
+# its row count, its good rows by column and (index in batch, message) errors
+_ParsedBlock = Tuple[int, int, Dict[str, Union[array, list]], List[Tuple[int, str]]]
+
+
+def _record_end(data: Union[bytes, mmap.mmap], pos: int, after: int) -> int:
+    # Offset just past the first record ending at or after ``after``, scanning
+    # from the record start ``pos``.  Quotes are followed the way _quote_state
+    # does (a quote opens a field only at its start, "" is an escaped quote);
+    # everything else is skipped with find().
+    size = len(data)
+    in_quotes = False
+    while True:
+        if in_quotes:
+            quote = data.find(b'"', pos)
+            if quote < 0:
+                return size
+            if data[quote + 1 : quote + 2] == b'"':
+                pos = quote + 2
+            else:
+                in_quotes, pos = False, quote + 1
+            continue
+        newline = data.find(b"\n", max(pos, after))
+        end = size if newline < 0 else newline + 1
+        quote = data.find(b'"', pos, end)
+        if quote < 0:
+            return end
+        if quote == 0 or data[quote - 1] in _FIELD_START:
+            in_quotes = True
+        pos = quote + 1
+
+
+def _split_file(
+    path: str, start: Optional[int], piece_bytes: int, limit: int
+) -> Tuple[Optional[List[str]], List[Tuple[int, int]]]:
+    # The header and the (begin, end) byte ranges of the pieces after it, or
+    # after ``start`` when resuming
+    if os.path.getsize(path) == 0:
+        return None, []
+    with open(path, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        size = len(data)
+        header, pos = None, len(_BOM) if data[: len(_BOM)] == _BOM else 0
+        while header is None and pos < size:
+            end = _record_end(data, pos, pos)
+            header, pos = _header(data[pos:end]), end
+        if start is not None:
+            pos = start
+
+        pieces = []
+        while pos < size:
+            target = min(pos + piece_bytes, size)
+            end = _record_end(data, pos, target - 1)
+            if end - target > limit:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"CSV record before byte {end} is longer than {limit} bytes",
+                )
+            pieces.append((pos, end))
+            pos = end
+    return header, pieces
+
+
+def _parse_piece(
+    path: str,
+    begin: int,
+    end: int,
+    header: List[str],
+    parse_row: ParseRow,
+    columns: ParseColumns,
+    batch_size: int,
+) -> List[_ParsedBlock]:
+    # Runs in a worker process
+    with open(path, "rb") as source:
+        source.seek(begin)
+        records = split_records(source.read(end - begin), begin)
+
+    blocks = []
+    for first in range(0, len(records), batch_size):
+        batch = records[first : first + batch_size]
+        rows, count = parse_records([record for _, record in batch], header, 0)
+        values: Dict[str, list] = {name: [] for name in columns}
+        errors = []
+        for index, row in rows:
+            try:
+                data = parse_row(row)
+            except Exception as e:
+                errors.append((index, str(e)))
+                continue
+            for name, column in values.items():
+                column.append(data[name])
+        blocks.append((batch[-1][0], count, _pack(values, columns), errors))
+    return blocks
+
+
+def _pack(values: Dict[str, list], columns: ParseColumns) -> Dict[str, Union[array, list]]:
+    packed: Dict[str, Union[array, list]] = {}
+    for name, column in values.items():
+        typecode = columns[name]
+        try:
+            packed[name] = array(typecode, column) if typecode else column
+        except OverflowError:
+            # Out of range for the array; the database reports it like inline parsing
+            packed[name] = column
+    return packed
+
+
+def _unpack(block: _ParsedBlock, row_num: int) -> ParsedRows:
+    _, count, packed, errors = block
+    rows: List[Any] = list(map(dict, map(zip, repeat(tuple(packed)), zip(*packed.values()))))
+    # In index order, so each error lands in place
+    for index, message in errors:
+        rows.insert(index, ValueError(message))
+    return list(zip(range(row_num, row_num + count), rows))
+
+
+class CsvParsePool:
+    """
+    Process pool that parses spooled CSV imports ahead of the importer.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        piece_bytes: int = 4 * 1024 * 1024,
+        start_method: str = "forkserver",
+    ) -> None:
+        if start_method not in ("forkserver", "spawn"):
+            raise ValueError(f"Unsupported parse pool start method: {start_method}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.piece_bytes = piece_bytes
+        self.start_method = start_method
+        self._executor: Optional[Executor] = None
+
+        self.pieces = 0
+        self.rows = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # Never fork the running server: its threads' locks and connection
+            # pools would be copied mid-use into the children
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+            )
+        return self._executor
+
+    async def parsed_batches(
+        self,
+        path: str,
+        batch_size: int,
+        parse_row: ParseRow,
+        columns: ParseColumns,
+        start: Optional[CsvPosition] = None,
+    ) -> AsyncIterator[Tuple[ParsedRows, CsvPosition]]:
+        """
+        ``iter_parsed_batches`` for the file at ``path``, parsed in the pool.
+
+        Yields the same rows, numbers and errors; batches hold up to
+        ``batch_size`` records but end at piece boundaries, and each comes
+        with a position ``start`` can resume at.  ``parse_row`` must be a
+        module-level function or static method so it can be pickled, and
+        return a dict with the keys of ``columns``.
+        """
+
+        header, pieces = await run_in_threadpool(
+            _split_file,
+            path,
+            None if start is None else start.offset,
+            self.piece_bytes,
+            get_settings().csv_max_record_bytes,
+        )
+        if header is None:
+            return
+        row_num = 2 if start is None else start.row_num
+        batch_size = max(batch_size, 1)
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        remaining = iter(pieces)
+        in_flight: Deque[asyncio.Future] = deque()
+
+        def submit() -> None:
+            piece = next(remaining, None)
+            if piece is not None:
+                in_flight.append(
+                    loop.run_in_executor(
+                        executor, _parse_piece, path, *piece, header, parse_row, columns, batch_size
+                    )
+                )
+
+        for _ in range(2 * self.max_workers):
+            submit()
+        try:
+            while in_flight:
+                blocks = await in_flight.popleft()
+                submit()
+                self.pieces += 1
+                for block in blocks:
+                    parsed = _unpack(block, row_num)
+                    row_num += block[1]
+                    self.rows += block[1]
+                    if parsed:
+                        yield parsed, CsvPosition(block[0], row_num)
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "start_method": self.start_method,
+            "pieces": self.pieces,
+            "rows": self.rows,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _build_pool() -> CsvParsePool:
+    settings = get_settings()
+    return CsvParsePool(
+        max_workers=settings.import_parse_processes,
+        piece_bytes=settings.import_parse_piece_bytes,
+        start_method=settings.import_parse_start_method,
+    )
+
+
+parse_pool = _build_pool()
+
+
+def parsed_batches(
+    file: UploadFile,
+    batch_size: int,
+    parse_row: ParseRow,
+    columns: ParseColumns,
+    start: Optional[CsvPosition] = None,
+    parallel: bool = False,
+) -> AsyncIterator[Tuple[ParsedRows, CsvPosition]]:
+    """
+    The importers' source of parsed batches: ``parse_pool`` when ``parallel``
+    is set and ``file`` is a file on disk (a spooled background import),
+    otherwise ``iter_parsed_batches`` on the event loop.
+    """
+
+    path = getattr(file.file, "name", None)
+    if parallel and isinstance(path, str) and os.path.isfile(path):
+        return parse_pool.parsed_batches(path, batch_size, parse_row, columns, start)
+    return iter_parsed_batches(file, batch_size, parse_row, start)
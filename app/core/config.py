@@ -28,6 +28,51 @@ class Settings(BaseSettings):
         "Defaults to DATABASE_URL if not set.",
     )
 
+    read_database_url: Optional[AnyUrl] = Field(
+        None,
+        env="READ_DATABASE_URL",
+        description="Optional async URL of a read replica used by read-only endpoints. "
+        "Defaults to DATABASE_URL if not set.",
+    )
+    read_primary_pin_seconds: float = Field(
+        5.0,
+        env="READ_PRIMARY_PIN_SECONDS",
+        description="Seconds a client is served reads from the primary after it writes",
+    )
+
+    # Connection pool
+    db_pool_size: int = Field(
+        10,
+        env="DB_POOL_SIZE",
+        description="Connections kept open in the pool",
+    )
+    db_max_overflow: int = Field(
+        20,
+        env="DB_MAX_OVERFLOW",
+        description="Extra connections opened when the pool is exhausted",
+    )
+    db_pool_timeout: float = Field(
+        30.0,
+        env="DB_POOL_TIMEOUT",
+        description="Seconds to wait for a free connection before failing",
+    )
+    db_pool_recycle: int = Field(
+        1800,
+        env="DB_POOL_RECYCLE",
+        description="Seconds after which a connection is replaced (-1 disables)",
+    )
+    db_pool_pre_ping: bool = Field(
+        True,
+        env="DB_POOL_PRE_PING",
+        description="Check connections for liveness on checkout",
+    )
+    db_statement_cache_size: int = Field(
+        100,
+        env="DB_STATEMENT_CACHE_SIZE",
+        description="asyncpg prepared statement cache size per connection "
+        "(0 disables, e.g. behind PgBouncer in transaction mode)",
+    )
+
     # Email configuration
     smtp_host: Optional[str] = Field(
         None,
@@ -67,6 +112,229 @@ class Settings(BaseSettings):
         description="Secret key for JWT token signing",
     )
 
+    # Audit log pipeline
+    audit_queue_size: int = Field(
+        10000,
+        env="AUDIT_QUEUE_SIZE",
+        description="Maximum number of audit events buffered in memory",
+    )
+    audit_batch_size: int = Field(
+        500,
+        env="AUDIT_BATCH_SIZE",
+        description="Maximum number of audit rows written per INSERT",
+    )
+    audit_flush_interval: float = Field(
+        1.0,
+        env="AUDIT_FLUSH_INTERVAL",
+        description="Seconds to wait before flushing a partial audit batch",
+    )
+    audit_backpressure_policy: str = Field(
+        "drop",
+        env="AUDIT_BACKPRESSURE_POLICY",
+        description="Behaviour when the audit queue is full: drop, block or sample",
+    )
+    audit_block_timeout: float = Field(
+        0.05,
+        env="AUDIT_BLOCK_TIMEOUT",
+        description="Seconds a request may wait for queue space under the block policy",
+    )
+    audit_sample_rate: float = Field(
+        0.1,
+        env="AUDIT_SAMPLE_RATE",
+        description="Fraction of events kept once the queue is half full under the sample policy",
+    )
+
+    # Audit log retention
+    audit_retention_days: int = Field(
+        30,
+        env="AUDIT_RETENTION_DAYS",
+        description="Raw audit rows older than this are compacted into per-minute rollups",
+    )
+    audit_retention_chunk_size: int = Field(
+        10000,
+        env="AUDIT_RETENTION_CHUNK_SIZE",
+        description="Maximum raw audit rows compacted and deleted per transaction",
+    )
+
+    # Live latency histograms
+    latency_slot_seconds: float = Field(
+        15.0,
+        env="LATENCY_SLOT_SECONDS",
+        description="Width of one latency histogram slot in seconds",
+    )
+    latency_slots: int = Field(
+        60,
+        env="LATENCY_SLOTS",
+        description="Number of slots kept per series (slots x width = longest window)",
+    )
+    latency_max_series: int = Field(
+        256,
+        env="LATENCY_MAX_SERIES",
+        description="Maximum (route, method) series tracked before folding into <other>",
+    )
+
+    # In-process user cache used for audit attribution
+    user_cache_size: int = Field(
+        10000,
+        env="USER_CACHE_SIZE",
+        description="Maximum number of user ids remembered per process",
+    )
+    user_cache_ttl: float = Field(
+        300.0,
+        env="USER_CACHE_TTL",
+        description="Seconds a known user id stays cached",
+    )
+    user_cache_negative_ttl: float = Field(
+        30.0,
+        env="USER_CACHE_NEGATIVE_TTL",
+        description="Seconds an unknown user id stays cached as missing",
+    )
+
+    # Authentication caches
+    auth_principal_cache_ttl: float = Field(
+        5.0,
+        env="AUTH_PRINCIPAL_CACHE_TTL",
+        description="Seconds a DB-verified user role/token version is trusted; role changes, "
+        "deletes and revocations made through another worker apply after at most this long",
+    )
+    auth_token_cache_size: int = Field(
+        10000,
+        env="AUTH_TOKEN_CACHE_SIZE",
+        description="Maximum number of verified JWTs cached per process",
+    )
+    auth_token_cache_ttl: float = Field(
+        300.0,
+        env="AUTH_TOKEN_CACHE_TTL",
+        description="Seconds a verified JWT stays cached (never past its expiry)",
+    )
+
+    # Course completion and prerequisite gating
+    course_completion_threshold: float = Field(
+        100.0,
+        env="COURSE_COMPLETION_THRESHOLD",
+        description="Enrollment completion_percentage at which a course counts as completed",
+    )
+    enrollment_prerequisite_gating: bool = Field(
+        True,
+        env="ENROLLMENT_PREREQUISITE_GATING",
+        description="Reject enrollments whose course prerequisites the learner has not completed",
+    )
+
+    # Learning paths
+    learning_path_cache_size: int = Field(
+        10000,
+        env="LEARNING_PATH_CACHE_SIZE",
+        description="Maximum number of learners' path sets cached per process",
+    )
+    learning_path_cache_ttl: float = Field(
+        300.0,
+        env="LEARNING_PATH_CACHE_TTL",
+        description="Seconds a computed learning path stays cached; writes make it stale at once",
+    )
+    learning_path_batch_max_users: int = Field(
+        10000,
+        env="LEARNING_PATH_BATCH_MAX_USERS",
+        description="Maximum number of users in one batch learning-path request",
+    )
+
+    # Course outlines
+    course_outline_cache_size: int = Field(
+        1000,
+        env="COURSE_OUTLINE_CACHE_SIZE",
+        description="Maximum number of serialized course outlines cached per process",
+    )
+    course_outline_cache_ttl: float = Field(
+        300.0,
+        env="COURSE_OUTLINE_CACHE_TTL",
+        description="Seconds a serialized course outline stays cached",
+    )
+    catalog_cache_control: str = Field(
+        "private, no-cache",
+        env="CATALOG_CACHE_CONTROL",
+        description="Cache-Control sent with ETag-validated catalog reads",
+    )
+
+    # Catalog search
+    search_backend: str = Field(
+        "auto",
+        env="SEARCH_BACKEND",
+        description="postgres (tsvector), memory (in-process index) or auto (by database dialect)",
+    )
+    search_index_ttl: float = Field(
+        60.0,
+        env="SEARCH_INDEX_TTL",
+        description="Seconds before the in-process search index is rebuilt",
+    )
+
+    # Bulk endpoints
+    bulk_max_items: int = Field(
+        10000,
+        env="BULK_MAX_ITEMS",
+        description="Maximum number of items accepted by one /bulk request",
+    )
+    bulk_chunk_size: int = Field(
+        1000,
+        env="BULK_CHUNK_SIZE",
+        description="Rows per multi-row statement inside a bulk request",
+    )
+
+    # CSV uploads
+    csv_read_chunk_size: int = Field(
+        64 * 1024,
+        env="CSV_READ_CHUNK_SIZE",
+        description="Bytes read from an uploaded CSV file at a time",
+    )
+    csv_max_record_bytes: int = Field(
+        1024 * 1024,
+        env="CSV_MAX_RECORD_BYTES",
+        description="Largest CSV record (header or row) accepted in an upload",
+    )
+
+    # Background imports
+    import_spool_dir: Optional[str] = Field(
+        None,
+        env="IMPORT_SPOOL_DIR",
+        description="Directory background import uploads are spooled to, on storage every "
+        "app host mounts at the same path. Background imports are refused while unset.",
+    )
+    import_poll_interval: float = Field(
+        2.0,
+        env="IMPORT_POLL_INTERVAL",
+        description="Seconds between import worker polls for queued jobs",
+    )
+    import_job_lease: float = Field(
+        300.0,
+        env="IMPORT_JOB_LEASE",
+        description="Seconds without progress after which a running import job can be taken over",
+    )
+    import_parse_processes: int = Field(
+        0,
+        env="IMPORT_PARSE_PROCESSES",
+        description="Worker processes parsing parallel background imports (0: one per CPU)",
+    )
+    import_parse_piece_bytes: int = Field(
+        4 * 1024 * 1024,
+        env="IMPORT_PARSE_PIECE_BYTES",
+        description="Bytes of a spooled CSV file parsed by one worker task",
+    )
+    import_parse_start_method: str = Field(
+        "forkserver",
+        env="IMPORT_PARSE_START_METHOD",
+        description="How parse workers are started: forkserver or spawn (never fork)",
+    )
+
+    # Password hashing
+    password_hash_workers: int = Field(
+        4,
+        env="PASSWORD_HASH_WORKERS",
+        description="Maximum concurrent bcrypt operations per process",
+    )
+    password_hash_executor: str = Field(
+        "thread",
+        env="PASSWORD_HASH_EXECUTOR",
+        description="Executor used for bcrypt: thread or process",
+    )
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,6 +1,19 @@
+from typing import Any
+
 from .base import Base
-from .session import AsyncSessionLocal, engine, get_db_session
+from .session import AsyncSessionLocal, get_db_session, get_engine, get_read_session
 
-__all__ = ["Base", "AsyncSessionLocal", "engine", "get_db_session"]
+__all__ = [
+    "Base",
+    "AsyncSessionLocal",
+    "engine",
+    "get_db_session",
+    "get_engine",
+    "get_read_session",
+]
 
 
+def __getattr__(name: str) -> Any:
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,30 +1,101 @@
-from typing import AsyncGenerator
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict
 
+from fastapi import Request
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import get_settings
 from app.core.db.base import Base
+from app.core.db.pool import InstrumentedAsyncPool
 
 
 settings = get_settings()
 
-print("🔥 SESSION DATABASE_URL =", settings.database_url) 
 
+def _engine_options(url: str) -> Dict[str, Any]:
+    """
+    Pool and driver options from settings for the given database URL.
+    """
+
+    options: Dict[str, Any] = {"echo": False, "future": True}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # SQLite picks its own pool; sizing options do not apply
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+def _engine_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.get_driver_name() == "asyncpg" and "prepared_statement_cache_size" not in parsed.query:
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_statement_cache_size)}
+        )
+    return parsed.render_as_string(hide_password=False)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(_engine_url(url), **_engine_options(url))
+
+
+@lru_cache()
 def get_engine() -> AsyncEngine:
     """
-    Create the async SQLAlchemy engine.
+    Create the async SQLAlchemy engine on first use.
     """
 
-    return create_async_engine(str(settings.database_url), echo=False, future=True)
+    return _create_engine(str(settings.database_url))
+
+
+@lru_cache()
+def get_read_engine() -> AsyncEngine:
+    """
+    Engine for the read replica, or the primary engine if none is configured.
+    """
 
+    if settings.read_database_url is None:
+        return get_engine()
+    return _create_engine(str(settings.read_database_url))
 
-engine: AsyncEngine = get_engine()
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    expire_on_commit=False,
-    class_=AsyncSession,
-)
+@lru_cache()
+def get_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(
+        get_engine(),
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+
+
+@lru_cache()
+def get_read_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(
+        get_read_engine(),
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+
+
+class _LazySessionFactory:
+    """
+    Drop-in for an ``async_sessionmaker`` that builds the engine on first call.
+    """
+
+    def __call__(self, **kwargs: Any) -> AsyncSession:
+        return get_sessionmaker()(**kwargs)
+
+
+AsyncSessionLocal = _LazySessionFactory()
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -36,6 +107,46 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-__all__ = ["Base", "engine", "AsyncSessionLocal", "get_db_session"]
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that yields a session for read-only endpoints.
+
+    Uses the read replica unless the request is pinned to the primary (see
+    ``ReadYourWritesMiddleware``), so clients always see their own writes.
+    """
+
+    if getattr(request.state, "read_primary", False):
+        factory = get_sessionmaker()
+    else:
+        factory = get_read_sessionmaker()
+    async with factory() as session:
+        yield session
+
+
+async def dispose_engine() -> None:
+    """
+    Close pooled connections of every engine that was ever created.
+    """
+
+    if get_read_engine.cache_info().currsize and settings.read_database_url is not None:
+        await get_read_engine().dispose()
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+
+
+def __getattr__(name: str) -> Any:
+    # ``engine`` used to be created at import time; keep it importable lazily
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+__all__ = [
+    "Base",
+    "engine",
+    "AsyncSessionLocal",
+    "get_db_session",
+    "get_engine",
+    "get_read_engine",
+    "get_read_session",
+]
@@ -0,0 +1,206 @@
+"""
+In-memory request latency histograms.
+
+Each (route template, method) series keeps a ring of fixed-size histograms,
+one per ``slot_seconds`` interval, with HDR-style logarithmic buckets (eight
+sub-buckets per power of two, i.e. roughly 9% relative precision).  Memory per
+series is fixed, and the number of series is capped, so the whole registry has
+a hard upper bound regardless of traffic.
+"""
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+
+
+MIN_VALUE_MS = 0.01
+SUB_BUCKETS = 8
+OCTAVES = 24  # 0.01 ms .. ~168 s
+BUCKET_COUNT = SUB_BUCKETS * OCTAVES + 1  # last bucket catches overflow
+
+_LOG_GROWTH = math.log(2.0) / SUB_BUCKETS
+
+UNMATCHED_ROUTE = "<unmatched>"
+OTHER_ROUTE = "<other>"
+
+
+def bucket_index(value_ms: float) -> int:
+    if value_ms <= MIN_VALUE_MS:
+        return 0
+    index = int(math.log(value_ms / MIN_VALUE_MS) / _LOG_GROWTH) + 1
+    return min(index, BUCKET_COUNT - 1)
+
+
+def bucket_upper_bound(index: int) -> float:
+    return MIN_VALUE_MS * math.exp(index * _LOG_GROWTH)
+
+
+class _Slot:
+    __slots__ = ("epoch", "counts", "count", "max")
+
+    def __init__(self) -> None:
+        self.epoch = -1
+        self.counts = array("I", bytes(4 * BUCKET_COUNT))
+        self.count = 0
+        self.max = 0.0
+
+    def reset(self, epoch: int) -> None:
+        self.epoch = epoch
+        for i in range(BUCKET_COUNT):
+            self.counts[i] = 0
+        self.count = 0
+        self.max = 0.0
+
+
+class LatencyHistogram:
+    """
+    Sliding-window latency histogram for a single series.
+    """
+
+    def __init__(self, slot_seconds: float, num_slots: int) -> None:
+        self.slot_seconds = slot_seconds
+        self.num_slots = num_slots
+        self._slots: List[Optional[_Slot]] = [None] * num_slots
+        self.total_count = 0
+        self.total_sum_ms = 0.0
+
+    def _epoch(self, now: float) -> int:
+        return int(now // self.slot_seconds)
+
+    def record(self, value_ms: float, now: Optional[float] = None) -> None:
+        epoch = self._epoch(time.time() if now is None else now)
+        position = epoch % self.num_slots
+        slot = self._slots[position]
+        if slot is None:
+            slot = self._slots[position] = _Slot()
+        if slot.epoch != epoch:
+            slot.reset(epoch)
+
+        slot.counts[bucket_index(value_ms)] += 1
+        slot.count += 1
+        if value_ms > slot.max:
+            slot.max = value_ms
+        self.total_count += 1
+        self.total_sum_ms += value_ms
+
+    def snapshot(
+        self,
+        window_seconds: float,
+        quantiles: Tuple[float, ...] = (0.5, 0.95, 0.99),
+        now: Optional[float] = None,
+    ) -> Dict[str, float]:
+        """
+        Return count, requested quantiles and max over the last ``window_seconds``.
+
+        Quantiles are reported as the upper bound of the bucket they fall in.
+        """
+
+        current = self._epoch(time.time() if now is None else now)
+        span = max(1, min(self.num_slots, math.ceil(window_seconds / self.slot_seconds)))
+        counts = [0] * BUCKET_COUNT
+        total = 0
+        maximum = 0.0
+        for slot in self._slots:
+            if slot is None or not current - span < slot.epoch <= current:
+                continue
+            for i, value in enumerate(slot.counts):
+                if value:
+                    counts[i] += value
+            total += slot.count
+            maximum = max(maximum, slot.max)
+
+        result: Dict[str, float] = {"count": total, "max": maximum}
+        for q in quantiles:
+            result[_quantile_label(q)] = _quantile(counts, total, q, maximum)
+        return result
+
+
+def _quantile(counts: List[int], total: int, q: float, maximum: float) -> float:
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for i, value in enumerate(counts):
+        seen += value
+        if seen >= rank:
+            return min(bucket_upper_bound(i), maximum)
+    return maximum
+
+
+def _quantile_label(q: float) -> str:
+    return "p" + f"{q * 100:g}".replace(".", "_")
+
+
+class LatencyRegistry:
+    """
+    Per (route template, method) latency histograms with a cap on series count.
+    """
+
+    def __init__(self, slot_seconds: float = 15.0, num_slots: int = 60, max_series: int = 256) -> None:
+        self.slot_seconds = slot_seconds
+        self.num_slots = num_slots
+        self.max_series = max_series
+        self._series: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, route: Optional[str], method: str, value_ms: float) -> None:
+        key = (route or UNMATCHED_ROUTE, method)
+        histogram = self._series.get(key)
+        if histogram is None:
+            if len(self._series) >= self.max_series:
+                key = (OTHER_ROUTE, method)
+                histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = LatencyHistogram(self.slot_seconds, self.num_slots)
+        histogram.record(value_ms)
+
+    def snapshot(self, window_seconds: float) -> List[Dict[str, object]]:
+        rows: List[Dict[str, object]] = []
+        for (route, method), histogram in sorted(self._series.items()):
+            stats = histogram.snapshot(window_seconds)
+            rows.append({"route": route, "method": method, "window_seconds": window_seconds, **stats})
+        return rows
+
+    def render_prometheus(self, window_seconds: float = 60.0) -> List[str]:
+        """
+        Render the registry as Prometheus summary lines.
+
+        Quantiles cover the sliding window; ``_sum``/``_count`` are cumulative.
+        """
+
+        name = "kg_http_request_duration_ms"
+        lines = [
+            f"# HELP {name} Request latency in milliseconds per route template.",
+            f"# TYPE {name} summary",
+        ]
+        for (route, method), histogram in sorted(self._series.items()):
+            labels = f'route="{_escape(route)}",method="{method}"'
+            stats = histogram.snapshot(window_seconds)
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f'{name}{{{labels},quantile="{q:g}"}} {stats[_quantile_label(q)]:.3f}')
+            lines.append(f'{name}{{{labels},quantile="1"}} {stats["max"]:.3f}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total_sum_ms:.3f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.total_count}")
+        return lines
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_settings = get_settings()
+
+latency_registry = LatencyRegistry(
+    slot_seconds=_settings.latency_slot_seconds,
+    num_slots=_settings.latency_slots,
+    max_series=_settings.latency_max_series,
+)
@@ -7,7 +7,10 @@ from app.core.models.lesson import Lesson, LessonActivity, LessonResource  # noq
 from app.core.models.assessment import Assessment, Question, Option  # noqa: F401
 from app.core.models.enrollment import Enrollment  # noqa: F401
 from app.core.models.submission import Submission  # noqa: F401
-from app.core.models.audit_log import AuditLog  # noqa: F401
+from app.core.models.audit_log import AuditLog, AuditLogRollup  # noqa: F401
+from app.core.models.search import search_document  # noqa: F401
+from app.core.models.resource_version import resource_version  # noqa: F401
+from app.core.models.import_job import ImportJob, ImportJobError  # noqa: F401
 
 __all__ = [
     "Base",
@@ -23,6 +26,9 @@ __all__ = [
     "Enrollment",
     "Submission",
     "AuditLog",
+    "AuditLogRollup",
+    "ImportJob",
+    "ImportJobError",
 ]
 
 
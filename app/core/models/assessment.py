@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import Enum, Float, ForeignKey, Integer, String, Boolean
+from sqlalchemy import Enum, Float, ForeignKey, Index, Integer, String, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db.base import Base
@@ -12,6 +12,9 @@ class Assessment(Base):
     Assessment belonging to a course (exam or quiz).
     """
 
+    # Serves keyset pagination of a course's assessments
+    __table_args__ = (Index("ix_assessment_course_id_id", "course_id", "id"),)
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     course_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("course.id", ondelete="CASCADE"), nullable=False
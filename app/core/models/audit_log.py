@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, Index, Integer, SmallInteger, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db.base import Base
@@ -11,8 +11,16 @@ from app.core.models.enums import AuditEventType
 class AuditLog(Base):
     """
     Per-request audit log entry written by middleware.
+
+    ``endpoint`` is the raw request path while ``route`` is the matched route
+    template (e.g. ``/courses/{course_id}``).  Rows older than the retention
+    window are folded into ``AuditLogRollup`` by ``app.jobs.audit_retention``.
     """
 
+    __table_args__ = (
+        Index("ix_auditlog_timestamp_brin", "timestamp", postgresql_using="brin"),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[Optional[int]] = mapped_column(
         Integer,
@@ -21,9 +29,11 @@ class AuditLog(Base):
         index=True,
     )
     endpoint: Mapped[str] = mapped_column(String(500), nullable=False)
+    route: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     method: Mapped[str] = mapped_column(String(10), nullable=False)
     status_code: Mapped[int] = mapped_column(Integer, nullable=False)
     duration_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    ttfb_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     event_type: Mapped[AuditEventType] = mapped_column(
         Enum(AuditEventType, name="audit_event_type"),
         nullable=False,
@@ -37,4 +47,18 @@ class AuditLog(Base):
     user: Mapped[Optional["User"]] = relationship("User", back_populates="audit_logs")
 
 
+class AuditLogRollup(Base):
+    """
+    Per-minute aggregate of compacted audit log rows.
+    """
+
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    route: Mapped[str] = mapped_column(String(500), primary_key=True)
+    method: Mapped[str] = mapped_column(String(10), primary_key=True)
+    status_class: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    request_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    duration_sum_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    duration_max_ms: Mapped[float] = mapped_column(Float, nullable=False)
+
 
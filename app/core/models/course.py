@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import Column, Enum, Float, ForeignKey, Integer, String, Table
+from sqlalchemy import Column, Enum, Float, ForeignKey, Index, Integer, String, Table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db.base import Base
@@ -18,6 +18,18 @@ course_prerequisite = Table(
     ),
 )
 
+# Transitive prerequisites: one row per (prerequisite, course that needs it).
+# ``depth`` is the longest prerequisite chain between the two, so ordering
+# ancestors by depth descending is a valid study order.
+course_prerequisite_closure = Table(
+    "course_prerequisite_closure",
+    Base.metadata,
+    Column("ancestor_id", ForeignKey("course.id", ondelete="CASCADE"), primary_key=True),
+    Column("descendant_id", ForeignKey("course.id", ondelete="CASCADE"), primary_key=True),
+    Column("depth", Integer, nullable=False),
+    Index("ix_course_prerequisite_closure_descendant_id", "descendant_id", "ancestor_id"),
+)
+
 
 class Course(Base):
     """
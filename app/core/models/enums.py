@@ -24,3 +24,15 @@ class AuditEventType(str, Enum):
 
 
 
+
+
+class ImportKind(str, Enum):
+    ENROLLMENTS = "enrollments"
+    LESSONS = "lessons"
+
+
+class ImportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
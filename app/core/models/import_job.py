@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, BigInteger, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db.base import Base
+from app.core.models.enums import ImportJobStatus, ImportKind
+
+
+class ImportJob(Base):
+    """
+    A CSV import run in the background by ``app.services.imports.import_worker``.
+
+    The upload is spooled to ``file_path``.  ``bytes_processed`` and
+    ``next_row`` are the position after the last committed batch; they are
+    saved in the same transaction as the batch, so a job taken over after a
+    restart resumes exactly there.  ``heartbeat_at`` is refreshed with every
+    batch; a running job whose heartbeat is older than the lease can be
+    claimed by another worker.
+    """
+
+    __tablename__ = "import_job"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    kind: Mapped[ImportKind] = mapped_column(
+        Enum(ImportKind, name="import_kind"),
+        nullable=False,
+    )
+    status: Mapped[ImportJobStatus] = mapped_column(
+        Enum(ImportJobStatus, name="import_job_status"),
+        default=ImportJobStatus.QUEUED,
+        nullable=False,
+        index=True,
+    )
+    created_by: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("user.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    options: Mapped[Dict[str, Any]] = mapped_column(JSON, default=dict, nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    bytes_processed: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    next_row: Mapped[int] = mapped_column(Integer, default=2, nullable=False)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    success_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Rows and bytes already processed when the current attempt started
+    attempt_rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    attempt_bytes: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=datetime.utcnow,
+        nullable=False,
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class ImportJobError(Base):
+    """
+    One rejected row of an import job, for the downloadable error report.
+    """
+
+    __tablename__ = "import_job_error"
+
+    job_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("import_job.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    row_num: Mapped[int] = mapped_column(Integer, primary_key=True)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db.base import Base
@@ -13,6 +13,9 @@ class Lesson(Base):
     Individual lesson within a module.
     """
 
+    # Serves keyset pagination of a module's lessons
+    __table_args__ = (Index("ix_lesson_module_id_id", "module_id", "id"),)
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     module_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("module.id", ondelete="CASCADE"), nullable=False
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db.base import Base
@@ -11,6 +11,9 @@ class Module(Base):
     Course module which groups lessons.
     """
 
+    # Serves keyset pagination of a course's modules
+    __table_args__ = (Index("ix_module_course_id_id", "course_id", "id"),)
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     course_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("course.id", ondelete="CASCADE"), nullable=False
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Table
+
+from app.core.db.base import Base
+
+
+# Change counters behind the catalog ETags: ("catalog", 0) for the course
+# list and ("course", id) for a course and everything listed under it; and
+# ("progress", user id) for a learner's enrollments.  Rows are created on
+# first write; a missing row means version 0.
+resource_version = Table(
+    "resource_version",
+    Base.metadata,
+    Column("resource", String(16), primary_key=True),
+    Column("resource_id", Integer, primary_key=True),
+    Column("version", BigInteger, nullable=False, server_default="1"),
+)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Index, Integer, String, Table, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.core.db.base import Base
+
+
+# One row per searchable course, module and lesson.  On PostgreSQL the rows
+# (including the weighted ``vector``) are maintained by triggers on the
+# source tables; other backends leave the table empty and search in memory.
+search_document = Table(
+    "search_document",
+    Base.metadata,
+    Column("kind", String(16), primary_key=True),
+    Column("source_id", Integer, primary_key=True),
+    Column("course_id", Integer, nullable=False),
+    Column("title", String(255), nullable=False),
+    Column("body", Text, nullable=False, server_default=""),
+    Column("vector", TSVECTOR().with_variant(Text(), "sqlite"), nullable=True),
+    Index("ix_search_document_vector", "vector", postgresql_using="gin"),
+    Index("ix_search_document_course_id", "course_id"),
+)
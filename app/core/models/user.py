@@ -22,6 +22,10 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
+    # Bumped whenever previously issued tokens must stop being accepted
+    token_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     # Relationships
     courses_as_instructor: Mapped[List["Course"]] = relationship(
@@ -1,10 +1,17 @@
-from typing import Optional
+import time
+from typing import Any, Dict, Optional
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import decode_access_token
+from app.core.auth import Principal, decode_access_token
+from app.core.common.cache import (
+    invalidate_user,
+    principal_cache,
+    remember_principal,
+    token_claims_cache,
+)
 from app.core.db.session import get_db_session
 from app.core.models.user import User
 
@@ -12,46 +19,119 @@ from app.core.models.user import User
 security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
+async def get_current_principal(
+    request: Request,
     session: AsyncSession = Depends(get_db_session),
     x_user_id: Optional[int] = Header(default=None, alias="X-User-Id"),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-) -> User:
+) -> Principal:
     """
     Authentication dependency that supports both methods:
     1. X-User-Id header (backward compatible)
     2. Bearer token (JWT) from Authorization header
-    
+
     Priority: Token authentication takes precedence if both are provided.
+
+    Returns a lightweight ``Principal`` (id, role, token version).  Verified
+    token claims and DB-verified user snapshots are cached, so in the steady
+    state this dependency does not touch the database at all.  Tokens whose
+    ``ver`` claim no longer matches the user's ``token_version`` (e.g. after a
+    role change) are rejected.  The snapshots are per process: a change made
+    through another worker is seen here once the snapshot expires, after at
+    most ``AUTH_PRINCIPAL_CACHE_TTL`` seconds.
     """
 
+    principal: Optional[Principal] = None
+
     # Try token authentication first (if provided)
     if credentials:
-        token = credentials.credentials
-        payload = decode_access_token(token)
-        if payload:
-            user_id = payload.get("sub")
-            if user_id:
-                try:
-                    user_id_int = int(user_id)
-                    user = await session.get(User, user_id_int)
-                    if user:
-                        return user
-                except (ValueError, TypeError):
-                    pass
+        claims = _verified_claims(credentials.credentials)
+        if claims:
+            try:
+                user_id = int(claims.get("sub"))
+            except (ValueError, TypeError):
+                user_id = None
+            if user_id is not None:
+                principal = await _lookup_principal(request, session, user_id)
+                if principal is not None and claims.get("ver", 0) != principal.token_version:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Token has been revoked. Please log in again.",
+                        headers={"WWW-Authenticate": "Bearer"},
+                    )
 
     # Fall back to header-based authentication (backward compatible)
-    if x_user_id is not None:
-        user = await session.get(User, x_user_id)
-        if user:
-            return user
+    if principal is None and x_user_id is not None:
+        principal = await _lookup_principal(request, session, x_user_id)
 
     # If neither method works, raise error
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Authentication required. Provide either X-User-Id header or Bearer token.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required. Provide either X-User-Id header or Bearer token.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    request.state.principal = principal
+    return principal
+
+
+async def get_current_user(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> User:
+    """
+    Load the full ``User`` row for routes that need more than id and role.
+
+    The user is stored on ``request.state.current_user`` so that the audit
+    middleware can attribute the request without querying again.
+    """
+
+    user = getattr(request.state, "current_user", None)
+    if user is None or user.id != principal.id:
+        user = await session.get(User, principal.id)
+        if user is None:
+            invalidate_user(principal.id)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Authentication required. Provide either X-User-Id header or Bearer token.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        request.state.current_user = user
+    return user
+
+
+def _verified_claims(token: str) -> Optional[Dict[str, Any]]:
+    """Decode a JWT, reusing the result of earlier verifications of the same token."""
+
+    claims = token_claims_cache.get(token)
+    if claims is not None:
+        return claims
+
+    claims = decode_access_token(token)
+    if claims:
+        remaining = float(claims.get("exp", 0)) - time.time()
+        if remaining > 0:
+            token_claims_cache.set(token, claims, ttl=min(remaining, token_claims_cache.ttl))
+    return claims
+
 
+async def _lookup_principal(
+    request: Request,
+    session: AsyncSession,
+    user_id: int,
+) -> Optional[Principal]:
+    """Return the cached identity for ``user_id``, loading the user on a miss."""
 
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return cached
 
+    user = await session.get(User, user_id)
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    remember_principal(principal)
+    request.state.current_user = user
+    return principal
@@ -4,17 +4,18 @@ Includes CSV validation, payload preprocessing, and role-based access control.
 """
 from __future__ import annotations
 
-import csv
-import io
+import json
 from functools import wraps
-from typing import Any, Callable, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
 from fastapi import Depends, HTTPException, Request, UploadFile, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
+from app.core.auth import Principal
+from app.core.common.csv_stream import read_csv_header
+from app.core.config import get_settings
 from app.core.models.enums import UserRole
-from app.core.models.user import User
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_principal
 
 
 def validate_csv_headers(required_headers: List[str]):
@@ -30,44 +31,40 @@ def validate_csv_headers(required_headers: List[str]):
     """
     
     async def dependency(file: UploadFile) -> UploadFile:
-        # Read first line to validate headers
-        content = await file.read()
-        file.file.seek(0)  # Reset file pointer
-        
-        # Decode and parse CSV
+        # Only the header record is read; the importers stream the rest
         try:
-            text_content = content.decode("utf-8")
-            reader = csv.reader(io.StringIO(text_content))
-            headers = next(reader, None)
-            
-            if not headers:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="CSV file is empty or has no headers",
-                )
-            
-            # Normalize headers (strip whitespace, lowercase)
-            normalized_headers = [h.strip().lower() for h in headers]
-            normalized_required = [h.strip().lower() for h in required_headers]
-            
-            # Check if all required headers are present
-            missing_headers = set(normalized_required) - set(normalized_headers)
-            if missing_headers:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Missing required CSV headers: {', '.join(missing_headers)}",
-                )
+            headers = await read_csv_header(file)
         except UnicodeDecodeError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="CSV file must be UTF-8 encoded",
             )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Error reading CSV file: {str(e)}",
             )
-        
+
+        if not headers:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV file is empty or has no headers",
+            )
+
+        # Normalize headers (strip whitespace, lowercase)
+        normalized_headers = [h.strip().lower() for h in headers]
+        normalized_required = [h.strip().lower() for h in required_headers]
+
+        # Check if all required headers are present
+        missing_headers = set(normalized_required) - set(normalized_headers)
+        if missing_headers:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing required CSV headers: {', '.join(missing_headers)}",
+            )
+
         return file
     
     return dependency
@@ -104,6 +101,114 @@ def preprocess_payload(model_class: Type[BaseModel]):
     return dependency
 
 
+class BulkPayload:
+    """
+    Items of a ``/bulk`` request that passed validation, plus per-item errors.
+
+    ``items`` holds ``(index, data)`` pairs where ``index`` is the item's
+    position in the request body, so errors can be reported against it.
+    """
+
+    __slots__ = ("items", "errors")
+
+    def __init__(self, items: List[Tuple[int, Any]], errors: List[Dict[str, Any]]) -> None:
+        self.items = items
+        self.errors = errors
+
+
+def parse_bulk_payload(model_class: Optional[Type[BaseModel]] = None, require_id: bool = False):
+    """
+    Dependency factory that parses a JSON array or NDJSON body of items.
+
+    Each item is validated against ``model_class`` on its own; invalid items
+    are reported by index instead of rejecting the whole request.  With
+    ``require_id`` every item must also carry an integer ``id`` (bulk
+    updates).  Without a ``model_class`` the items are ids (bulk deletes),
+    given either as integers or as ``{"id": ...}`` objects.
+
+    Usage:
+        @router.post("/bulk")
+        async def bulk_create(
+            payload: BulkPayload = Depends(parse_bulk_payload(ItemCreate))
+        ):
+            ...
+    """
+
+    async def dependency(request: Request) -> BulkPayload:
+        raw_items = _decode_bulk_body(await request.body(), request.headers.get("content-type", ""))
+
+        max_items = get_settings().bulk_max_items
+        if len(raw_items) > max_items:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {max_items} items are accepted per request",
+            )
+
+        items: List[Tuple[int, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        for index, raw in enumerate(raw_items):
+            if model_class is None:
+                id_ = raw.get("id") if isinstance(raw, dict) else raw
+                if isinstance(id_, int) and not isinstance(id_, bool):
+                    items.append((index, id_))
+                else:
+                    errors.append({"index": index, "detail": "Item must be an integer id"})
+                continue
+
+            if not isinstance(raw, dict):
+                errors.append({"index": index, "detail": "Item must be a JSON object"})
+                continue
+
+            data = dict(raw)
+            id_ = data.pop("id", None)
+            if require_id and (not isinstance(id_, int) or isinstance(id_, bool)):
+                errors.append({"index": index, "detail": "Item must include an integer 'id'"})
+                continue
+
+            try:
+                parsed = model_class(**data)
+            except ValidationError as exc:
+                errors.append({"index": index, "detail": _validation_detail(exc)})
+                continue
+
+            values = parsed.dict(exclude_unset=require_id)
+            if require_id:
+                values["id"] = id_
+            items.append((index, values))
+
+        return BulkPayload(items, errors)
+
+    return dependency
+
+
+def _decode_bulk_body(body: bytes, content_type: str) -> List[Any]:
+    try:
+        text = body.decode("utf-8").strip()
+        if not text:
+            return []
+        if "ndjson" in content_type or "jsonl" in content_type or not text.startswith("["):
+            return [json.loads(line) for line in text.splitlines() if line.strip()]
+        items = json.loads(text)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Body must be a JSON array or NDJSON: {exc}",
+        )
+
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be a JSON array or NDJSON",
+        )
+    return items
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
 def role_required(allowed_roles: List[UserRole]):
     """
     Dependency factory for role-based access control.
@@ -112,12 +217,12 @@ def role_required(allowed_roles: List[UserRole]):
     Usage:
         @router.post("/")
         async def create_course(
-            current_user: User = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR]))
+            current_user: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR]))
         ):
             ...
     """
     
-    async def dependency(user: User = Depends(get_current_user)) -> User:
+    async def dependency(user: Principal = Depends(get_current_principal)) -> Principal:
         if user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -4,9 +4,9 @@ from typing import Callable, Iterable, Optional
 
 from fastapi import Depends, HTTPException, status
 
+from app.core.auth import Principal
 from app.core.models.enums import UserRole
-from app.core.models.user import User
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_principal
 
 
 def get_permission_checker(
@@ -14,7 +14,7 @@ def get_permission_checker(
     action: str,
     resource: str,
     allowed_roles: Optional[Iterable[UserRole]] = None,
-) -> Callable[[User], None]:
+) -> Callable[[Principal], None]:
     """
     Dependency factory used by routes to express permissions in a declarative way.
 
@@ -24,7 +24,7 @@ def get_permission_checker(
 
     allowed = set(allowed_roles or [])
 
-    async def checker(user: User = Depends(get_current_user)) -> None:
+    async def checker(user: Principal = Depends(get_current_principal)) -> None:
         if allowed and user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,3 @@
+"""
+Standalone maintenance jobs, runnable with ``python -m app.jobs.<name>``.
+"""
@@ -0,0 +1,168 @@
+"""
+Audit log retention job.
+
+Folds raw ``AuditLog`` rows older than the retention window into
+``AuditLogRollup`` (one row per minute, route template, method and status
+class) and deletes them, one bounded chunk per transaction.  Each chunk is a
+single ``DELETE ... RETURNING`` feeding an ``INSERT ... ON CONFLICT DO
+UPDATE``, so a crash never loses or double-counts rows.  PostgreSQL only.
+
+Usage:
+    python -m app.jobs.audit_retention [--days 30] [--chunk-size 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects.postgresql import Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.core.config import get_settings
+from app.core.db.session import AsyncSessionLocal
+from app.core.models.audit_log import AuditLog, AuditLogRollup
+from app.core.models.enums import AuditEventType
+
+logger = logging.getLogger(__name__)
+
+
+# The rollup's primary key: what ``rollup_select`` groups by and the upsert conflicts on
+ROLLUP_KEY = ("bucket", "route", "method", "status_class")
+
+
+def rollup_select(source: Any) -> Select:
+    """
+    Aggregate raw audit rows from ``source`` (any selectable with the
+    ``AuditLog`` columns) into rollup rows, in ``ROLLUP_KEY`` order followed
+    by the counters.
+    """
+
+    bucket = func.date_trunc("minute", source.c.timestamp)
+    route = func.coalesce(source.c.route, source.c.endpoint)
+    status_class = source.c.status_code // 100
+    return select(
+        bucket,
+        route,
+        source.c.method,
+        status_class,
+        func.count(),
+        func.sum(case((source.c.event_type == AuditEventType.ERROR, 1), else_=0)),
+        func.sum(source.c.duration_ms),
+        func.max(source.c.duration_ms),
+    ).group_by(bucket, route, source.c.method, status_class)
+
+
+def compact_statement(upper_id: int, cutoff: datetime) -> Insert:
+    """
+    ``DELETE`` the raw rows up to ``upper_id`` older than ``cutoff`` and
+    upsert their rollups, as one statement.
+    """
+
+    deleted = (
+        delete(AuditLog)
+        .where(AuditLog.id <= upper_id, AuditLog.timestamp < cutoff)
+        .returning(
+            AuditLog.timestamp,
+            AuditLog.route,
+            AuditLog.endpoint,
+            AuditLog.method,
+            AuditLog.status_code,
+            AuditLog.duration_ms,
+            AuditLog.event_type,
+        )
+        .cte("deleted")
+    )
+    columns = AuditLogRollup.__table__.c
+    stmt = pg_insert(AuditLogRollup).from_select(
+        [
+            *(columns[name] for name in ROLLUP_KEY),
+            columns.request_count,
+            columns.error_count,
+            columns.duration_sum_ms,
+            columns.duration_max_ms,
+        ],
+        rollup_select(deleted),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[columns[name] for name in ROLLUP_KEY],
+        set_={
+            "request_count": AuditLogRollup.request_count + stmt.excluded.request_count,
+            "error_count": AuditLogRollup.error_count + stmt.excluded.error_count,
+            "duration_sum_ms": AuditLogRollup.duration_sum_ms + stmt.excluded.duration_sum_ms,
+            "duration_max_ms": func.greatest(
+                AuditLogRollup.duration_max_ms, stmt.excluded.duration_max_ms
+            ),
+        },
+    )
+
+
+async def compact_chunk(session: AsyncSession, cutoff: datetime, chunk_size: int) -> int:
+    """
+    Roll up and delete the oldest ``chunk_size`` raw rows before ``cutoff``.
+
+    Returns the number of raw rows removed (0 once nothing is left).
+    """
+
+    oldest = (
+        select(AuditLog.id)
+        .where(AuditLog.timestamp < cutoff)
+        .order_by(AuditLog.id)
+        .limit(chunk_size)
+        .subquery()
+    )
+    upper_id, row_count = (
+        await session.execute(select(func.max(oldest.c.id), func.count()).select_from(oldest))
+    ).one()
+    if not row_count:
+        return 0
+
+    await session.execute(compact_statement(upper_id, cutoff))
+    await session.commit()
+    return int(row_count)
+
+
+async def compact_audit_logs(
+    retention_days: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+) -> int:
+    """
+    Compact every raw audit row older than the retention window.
+
+    Returns the total number of raw rows folded into rollups.
+    """
+
+    settings = get_settings()
+    retention_days = settings.audit_retention_days if retention_days is None else retention_days
+    chunk_size = chunk_size or settings.audit_retention_chunk_size
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    total = 0
+    chunks = 0
+    async with AsyncSessionLocal() as session:
+        while max_chunks is None or chunks < max_chunks:
+            removed = await compact_chunk(session, cutoff, chunk_size)
+            if not removed:
+                break
+            total += removed
+            chunks += 1
+            logger.info("Compacted %d audit rows (%d total)", removed, total)
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact old audit log rows into rollups.")
+    parser.add_argument("--days", type=int, default=None, help="Retention window in days")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows per transaction")
+    parser.add_argument("--max-chunks", type=int, default=None, help="Stop after N chunks")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    compacted = asyncio.run(compact_audit_logs(args.days, args.chunk_size, args.max_chunks))
+    print(f"✅ Compacted {compacted} audit rows")
@@ -0,0 +1,85 @@
+"""
+Prerequisite closure maintenance job.
+
+``backfill`` rebuilds ``course_prerequisite_closure`` from the raw
+``course_prerequisite`` edges in one transaction (run it once after the
+migration that adds the table).  ``check`` recomputes the closure in memory
+and reports rows that are missing, extra or carry the wrong depth; it exits
+non-zero when the table is inconsistent, and ``--repair`` backfills it.
+
+Usage:
+    python -m app.jobs.prerequisite_closure backfill [--chunk-size 1000]
+    python -m app.jobs.prerequisite_closure check [--repair] [--show 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from typing import Dict, List, Tuple
+
+from app.core.db.session import AsyncSessionLocal
+from app.services.courses.prerequisite_closure import (
+    CLOSURE_CHUNK_SIZE,
+    backfill_closure,
+    check_closure,
+    lock_prerequisites,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill(chunk_size: int = CLOSURE_CHUNK_SIZE) -> int:
+    """
+    Rebuild the closure table; returns the number of rows written.
+    """
+
+    async with AsyncSessionLocal() as session:
+        await lock_prerequisites(session)
+        return await backfill_closure(session, chunk_size)
+
+
+async def check() -> Dict[str, List[Tuple[int, int, int]]]:
+    """
+    Differences between the closure table and the raw edges.
+    """
+
+    async with AsyncSessionLocal() as session:
+        await lock_prerequisites(session)
+        return await check_closure(session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill or verify the prerequisite closure table.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = commands.add_parser("backfill", help="Rebuild the table from prerequisite edges")
+    backfill_parser.add_argument("--chunk-size", type=int, default=CLOSURE_CHUNK_SIZE, help="Rows per INSERT")
+    check_parser = commands.add_parser("check", help="Compare the table with prerequisite edges")
+    check_parser.add_argument("--repair", action="store_true", help="Backfill if inconsistent")
+    check_parser.add_argument("--show", type=int, default=20, help="Differences to print per kind")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "backfill":
+        written = asyncio.run(backfill(args.chunk_size))
+        print(f"✅ Wrote {written} closure rows")
+        sys.exit(0)
+
+    diff = asyncio.run(check())
+    problems = sum(len(rows) for rows in diff.values())
+    if not problems:
+        print("✅ Closure table is consistent")
+        sys.exit(0)
+
+    for kind, rows in diff.items():
+        if rows:
+            print(f"{kind}: {len(rows)} rows (ancestor, descendant, depth)")
+            for row in rows[: args.show]:
+                print(f"  {row}")
+    if args.repair:
+        written = asyncio.run(backfill())
+        print(f"✅ Repaired: wrote {written} closure rows")
+        sys.exit(0)
+    print(f"❌ Closure table has {problems} inconsistent rows")
+    sys.exit(1)
@@ -1,6 +1,15 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware 
+from app.core.auth import password_pool
+from app.core.common.parallel_csv import parse_pool
+from app.core.db.session import dispose_engine
 from app.middleware.audit import AuditMiddleware
+from app.middleware.audit_writer import audit_writer
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.services.admin.admin_routes import router as admin_router
 from app.services.auth.auth_routes import router as auth_router
 from app.services.users.user_routes import router as users_router
 from app.services.courses.course_routes import router as courses_router
@@ -8,7 +17,29 @@ from app.services.modules.module_routes import router as modules_router
 from app.services.lessons.lesson_routes import router as lessons_router
 from app.services.assessments.assessment_routes import router as assessments_router
 from app.services.enrollments.enrollment_routes import router as enrollments_router
+from app.services.learning_paths.learning_path_routes import router as learning_paths_router
 from app.services.submissions.submission_routes import router as submissions_router
+from app.services.search.search_routes import router as search_router
+from app.services.imports.import_routes import router as imports_router
+from app.services.imports.import_worker import import_worker
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start background workers on startup and flush them on shutdown.
+    """
+
+    audit_writer.start()
+    import_worker.start()
+    try:
+        yield
+    finally:
+        await import_worker.stop()
+        await audit_writer.stop()
+        password_pool.shutdown()
+        parse_pool.shutdown()
+        await dispose_engine()
 
 
 def create_app() -> FastAPI:
@@ -21,20 +52,26 @@ def create_app() -> FastAPI:
         description="Async FastAPI backend for a complex LMS with courses, modules, lessons, "
         "assessments, enrollments, and submissions.",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     
     # Routers
     app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
     app.include_router(users_router, prefix="/users", tags=["Users"])
+    app.include_router(learning_paths_router, prefix="/users", tags=["Learning Paths"])
     app.include_router(courses_router, prefix="/courses", tags=["Courses"])
     app.include_router(modules_router, prefix="/modules", tags=["Modules"])
     app.include_router(lessons_router, prefix="/lessons", tags=["Lessons"])
     app.include_router(assessments_router, prefix="/assessments", tags=["Assessments"])
     app.include_router(enrollments_router, prefix="/enrollments", tags=["Enrollments"])
     app.include_router(submissions_router, prefix="/submissions", tags=["Submissions"])
+    app.include_router(search_router, prefix="/search", tags=["Search"])
+    app.include_router(imports_router, prefix="/imports", tags=["Imports"])
+    app.include_router(admin_router, prefix="/admin", tags=["Admin"])
 
     # Middleware
+    app.add_middleware(ReadYourWritesMiddleware)
     app.add_middleware(AuditMiddleware)
 
     return app
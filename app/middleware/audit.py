@@ -1,73 +1,134 @@
 import logging
 import time
-from typing import Callable
+from typing import Any, MutableMapping, Optional, Tuple
 
-from fastapi import Request, Response
-from sqlalchemy import select
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.core.db.session import AsyncSessionLocal
-from app.core.models.audit_log import AuditLog
+from app.core.common.cache import user_exists_cache
+from app.core.metrics import latency_registry
 from app.core.models.enums import AuditEventType
-from app.core.models.user import User
+from app.middleware.audit_writer import MAX_USER_ID, AuditWriter, audit_writer
 
 logger = logging.getLogger(__name__)
 
 
-class AuditMiddleware(BaseHTTPMiddleware):
+class AuditMiddleware:
     """
     Middleware that records each request into the AuditLog table.
 
-    It is intentionally lightweight and uses a separate DB session so that
-    audit writes do not interfere with request-level transactions.
+    Implemented as plain ASGI: it wraps ``send`` to observe the
+    ``http.response.start``/``http.response.body`` messages as they pass and
+    never re-buffers the body, so streaming responses flow straight through.
+    Two timings are recorded: ``ttfb_ms`` (until the first non-empty body
+    chunk) and ``duration_ms`` (until the final chunk has been sent).  The
+    total duration also feeds the live per-route latency histograms.
+
+    Events are handed to the in-process ``AuditWriter`` which batches the
+    inserts in the background, so audit writes neither delay the response nor
+    hold a pooled connection on the request path.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable[[Request], Response]) -> Response:
+    def __init__(self, app: ASGIApp, writer: Optional[AuditWriter] = None) -> None:
+        self.app = app
+        self.writer = writer or audit_writer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})
         start = time.perf_counter()
-        response: Response
+        status_code = 500
+        first_byte_at: Optional[float] = None
+        event_type = AuditEventType.REQUEST
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, first_byte_at
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                if first_byte_at is None and (message.get("body") or not message.get("more_body")):
+                    first_byte_at = time.perf_counter()
+            await send(message)
 
         try:
-            response = await call_next(request)
-            event_type = AuditEventType.REQUEST
+            await self.app(scope, receive, send_wrapper)
         except Exception:  # pragma: no cover - re-raise after logging
-            response = Response(status_code=500)
             event_type = AuditEventType.ERROR
             raise
         finally:
-            duration_ms = (time.perf_counter() - start) * 1000.0
-            user_id_header = request.headers.get("X-User-Id")
-            user_id = None
-
-            # Validate user_id exists in database before logging
-            if user_id_header and user_id_header.isdigit():
-                try:
-                    user_id_int = int(user_id_header)
-                    async with AsyncSessionLocal() as session:
-                        result = await session.execute(
-                            select(User.id).where(User.id == user_id_int)
-                        )
-                        if result.scalar_one_or_none() is not None:
-                            user_id = user_id_int
-                except Exception:
-                    # If validation fails, user_id remains None
-                    pass
+            end = time.perf_counter()
+            duration_ms = (end - start) * 1000.0
+            ttfb_ms = (first_byte_at - start) * 1000.0 if first_byte_at is not None else None
+            route = route_template(scope)
+            latency_registry.record(route, scope["method"], duration_ms)
 
             try:
-                async with AsyncSessionLocal() as session:
-                    log = AuditLog(
-                        user_id=user_id,
-                        endpoint=request.url.path,
-                        method=request.method,
-                        status_code=response.status_code,
-                        duration_ms=duration_ms,
-                        event_type=event_type,
-                    )
-                    session.add(log)
-                    await session.commit()
+                user_id, verified = self._resolve_user_id(scope)
+                await self.writer.submit(
+                    {
+                        "user_id": user_id,
+                        "endpoint": scope["path"],
+                        "route": route,
+                        "method": scope["method"],
+                        "status_code": status_code,
+                        "duration_ms": duration_ms,
+                        "ttfb_ms": ttfb_ms,
+                        "event_type": event_type,
+                    },
+                    verify_user=not verified,
+                )
             except Exception as exc:  # Best-effort audit; never block response
-                logger.warning("Audit log write failed: %s", exc, exc_info=True)
+                logger.warning("Audit log enqueue failed: %s", exc, exc_info=True)
+
+    @staticmethod
+    def _resolve_user_id(scope: Scope) -> Tuple[Optional[int], bool]:
+        """
+        Work out which user a request should be attributed to without a DB query.
+
+        Returns ``(user_id, verified)``. A principal or user already resolved by
+        the auth dependencies wins; otherwise the ``X-User-Id`` header is checked
+        against the shared user cache.  Ids the cache has never seen are passed
+        on unverified and resolved by the audit writer in one query per batch.
+        """
+
+        state: MutableMapping[str, Any] = scope.get("state") or {}
+        current_user = state.get("current_user") or state.get("principal")
+        if current_user is not None:
+            return current_user.id, True
+
+        user_id = _parse_user_id(_header(scope, b"x-user-id"))
+        if user_id is None:
+            return None, True
+
+        exists = user_exists_cache.get(user_id)
+        if exists is None:
+            return user_id, False
+        return (user_id if exists else None), True
+
+
+def route_template(scope: Scope) -> Optional[str]:
+    """
+    Return the matched route template (e.g. ``/courses/{course_id}``), if any.
+
+    The router stores the matched route in the scope, which this middleware
+    shares, so it is available once the downstream app has run.
+    """
+
+    return getattr(scope.get("route"), "path", None)
 
-        return response
 
+def _parse_user_id(header: Optional[str]) -> Optional[int]:
+    # Headers are latin-1, where str.isdigit() also accepts e.g. "\xb2"
+    if not header or not header.isascii() or not header.isdigit():
+        return None
+    user_id = int(header)
+    return user_id if user_id <= MAX_USER_ID else None
 
 
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
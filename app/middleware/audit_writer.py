@@ -0,0 +1,299 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.common.cache import remember_user, user_exists_cache
+from app.core.config import get_settings
+from app.core.db.session import AsyncSessionLocal
+from app.core.models.audit_log import AuditLog
+from app.core.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_VERIFY_KEY = "_verify_user"
+
+# Largest id the ``Integer`` user id columns can hold
+MAX_USER_ID = 2**31 - 1
+
+
+class BackpressurePolicy(str, Enum):
+    DROP = "drop"
+    BLOCK = "block"
+    SAMPLE = "sample"
+
+
+class AuditWriter:
+    """
+    In-process audit pipeline.
+
+    Requests push events into a bounded queue and return immediately; a single
+    background task drains the queue and writes the events with multi-row
+    ``AuditLog`` inserts whenever ``batch_size`` events are buffered or
+    ``flush_interval`` seconds have passed, whichever comes first.
+
+    The queue belongs to the event loop the writer is started on: ``start()``
+    creates a new one, so a writer outlives the loop of a previous lifespan.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        policy: BackpressurePolicy = BackpressurePolicy.DROP,
+        block_timeout: float = 0.05,
+        sample_rate: float = 0.1,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> None:
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = BackpressurePolicy(policy)
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+        self._session_factory = session_factory
+        self._queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+        self._pending: List[Dict[str, Any]] = []
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+
+    # ---- Producer side ------------------------------------------------
+
+    async def submit(self, event: Dict[str, Any], verify_user: bool = False) -> bool:
+        """
+        Queue an audit event, applying the configured backpressure policy.
+
+        With ``verify_user`` the event's ``user_id`` has not been checked yet;
+        the flusher confirms it exists before writing.  Returns ``True`` if
+        the event was accepted.
+        """
+
+        queue = self._get_queue()
+        event.setdefault("timestamp", datetime.utcnow())
+        if verify_user and event.get("user_id") is not None:
+            event[_VERIFY_KEY] = True
+
+        if self.policy is BackpressurePolicy.SAMPLE:
+            if queue.qsize() >= self.max_queue_size // 2 and random.random() >= self.sample_rate:
+                self.sampled_out += 1
+                return False
+
+        if self.policy is BackpressurePolicy.BLOCK:
+            try:
+                await asyncio.wait_for(queue.put(event), timeout=self.block_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                return False
+        else:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return False
+
+        self.enqueued += 1
+        depth = queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return True
+
+    @property
+    def queue_depth(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy.value,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_capacity": self.max_queue_size,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    # ---- Lifecycle ----------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _get_queue(self) -> "asyncio.Queue[Dict[str, Any]]":
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        return self._queue
+
+    def start(self) -> None:
+        """
+        Start the flusher on the running loop, with a queue of its own.
+
+        Events still queued from before (submitted ahead of ``start()``, or
+        left on a stopped loop) are carried over.
+        """
+
+        if self.running:
+            return
+        leftover = self._drain(self.max_queue_size) if self._queue is not None else []
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        for event in leftover:
+            self._queue.put_nowait(event)
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self) -> None:
+        """
+        Stop the flusher and write whatever is still queued.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._inflight is not None and not self._inflight.done():
+            await self._inflight
+        self._inflight = None
+
+        pending, self._pending = self._pending, []
+        await self._write_batch(pending)
+        while self.queue_depth:
+            await self._write_batch(self._drain(self.batch_size))
+
+    # ---- Consumer side ------------------------------------------------
+
+    def _drain(self, limit: int) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._get_queue().get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._get_queue()
+        while True:
+            self._pending.append(await queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._pending) < self.batch_size:
+                self._pending.extend(self._drain(self.batch_size - len(self._pending)))
+                if len(self._pending) >= self.batch_size:
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    self._pending.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Shield the write so that shutdown never abandons a half-sent batch.
+            batch, self._pending = self._pending, []
+            self._inflight = asyncio.ensure_future(self._write_batch(batch))
+            await asyncio.shield(self._inflight)
+
+    def _new_session(self) -> AsyncSession:
+        factory = self._session_factory or AsyncSessionLocal
+        return factory()
+
+    async def _resolve_users(self, session: AsyncSession, batch: List[Dict[str, Any]]) -> None:
+        """
+        Check unverified user ids for a whole batch with a single query.
+
+        Ids outside the column's range are dropped without a query.  If the
+        lookup itself fails the unverified ids are dropped too, so the rows
+        are still written, just without a user.
+        """
+
+        unverified = [row for row in batch if row.pop(_VERIFY_KEY, False)]
+        for row in unverified:
+            if not 0 <= row["user_id"] <= MAX_USER_ID:
+                row["user_id"] = None
+        pending = {row["user_id"] for row in unverified if row["user_id"] is not None}
+        pending = {user_id for user_id in pending if user_exists_cache.get(user_id) is None}
+        if pending:
+            try:
+                result = await session.execute(select(User.id).where(User.id.in_(pending)))
+            except Exception as exc:
+                logger.warning("Audit user lookup failed, writing rows without a user: %s", exc)
+                await session.rollback()
+                for row in unverified:
+                    if row["user_id"] in pending:
+                        row["user_id"] = None
+            else:
+                found = set(result.scalars().all())
+                for user_id in pending:
+                    remember_user(user_id, user_id in found)
+
+        for row in batch:
+            user_id = row["user_id"]
+            if user_id is not None and user_exists_cache.get(user_id) is False:
+                row["user_id"] = None
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        try:
+            async with self._new_session() as session:
+                await self._resolve_users(session, batch)
+                await session.execute(insert(AuditLog), batch)
+                await session.commit()
+            self.written += len(batch)
+            self.batches += 1
+            logger.debug(
+                "Flushed %d audit rows in %.1f ms",
+                len(batch),
+                (time.perf_counter() - start) * 1000.0,
+            )
+            return
+        except Exception as exc:  # Best-effort audit; fall back to row-by-row
+            logger.warning("Audit batch write failed, retrying rows individually: %s", exc)
+
+        for row in batch:
+            try:
+                async with self._new_session() as session:
+                    await session.execute(insert(AuditLog), [row])
+                    await session.commit()
+                self.written += 1
+            except Exception as exc:
+                self.failed += 1
+                logger.warning("Audit log write failed: %s", exc, exc_info=True)
+
+
+def _build_writer() -> AuditWriter:
+    settings = get_settings()
+    return AuditWriter(
+        max_queue_size=settings.audit_queue_size,
+        batch_size=settings.audit_batch_size,
+        flush_interval=settings.audit_flush_interval,
+        policy=BackpressurePolicy(settings.audit_backpressure_policy),
+        block_timeout=settings.audit_block_timeout,
+        sample_rate=settings.audit_sample_rate,
+    )
+
+
+audit_writer = _build_writer()
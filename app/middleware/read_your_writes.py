@@ -0,0 +1,68 @@
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+PIN_COOKIE = "kg_read_primary_until"
+PIN_HEADER = b"x-read-primary"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin clients that just wrote to the primary database for a short while.
+
+    After a successful unsafe request (POST/PUT/PATCH/DELETE) the response
+    carries a short-lived cookie; while it is valid, or whenever the request
+    sends ``X-Read-Primary: true``, ``get_read_session`` uses the primary
+    instead of the replica, hiding replication lag from the writer.
+    """
+
+    def __init__(self, app: ASGIApp, pin_seconds: Optional[float] = None) -> None:
+        self.app = app
+        self.pin_seconds = get_settings().read_primary_pin_seconds if pin_seconds is None else pin_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        state["read_primary"] = self._is_pinned(scope)
+
+        if scope["method"] in SAFE_METHODS or self.pin_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = int(time.time() + self.pin_seconds)
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PIN_COOKIE}={until}; Max-Age={int(self.pin_seconds) or 1}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _is_pinned(scope: Scope) -> bool:
+        cookie_header = None
+        for key, value in scope.get("headers") or ():
+            if key == PIN_HEADER and value.lower() in (b"1", b"true", b"yes"):
+                return True
+            if key == b"cookie":
+                cookie_header = value
+        if cookie_header is None:
+            return False
+
+        until = cookie_parser(cookie_header.decode("latin-1")).get(PIN_COOKIE)
+        if not until or not until.isdigit():
+            return False
+        return int(until) >= time.time()
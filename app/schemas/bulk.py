@@ -0,0 +1,25 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    ids: List[int]
+    errors: List[BulkItemError]
+
+    @classmethod
+    def from_parts(cls, ids: List[int], *error_lists: List[dict]) -> "BulkResult":
+        errors = sorted((e for errors in error_lists for e in errors), key=lambda e: e["index"])
+        return cls(
+            succeeded=len(ids),
+            failed=len(errors),
+            ids=ids,
+            errors=[BulkItemError(**e) for e in errors],
+        )
@@ -2,6 +2,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
+from app.core.models.enums import LessonActivityType
+
 
 class CourseBase(BaseModel):
     title: str
@@ -33,4 +35,48 @@ class CourseSetPrerequisitesRequest(BaseModel):
     prerequisite_ids: List[int]
 
 
+class CourseClosureResponse(BaseModel):
+    course_id: int
+    course_ids: List[int]
+
+
+class LessonResourceOutline(BaseModel):
+    id: int
+    file_path: str
+    type: str
+
+    class Config:
+        orm_mode = True
+
+
+class LessonActivityOutline(BaseModel):
+    id: int
+    type: LessonActivityType
+
+    class Config:
+        orm_mode = True
+
+
+class LessonOutline(BaseModel):
+    id: int
+    name: str
+    content_type: str
+    resources: List[LessonResourceOutline] = []
+    activities: List[LessonActivityOutline] = []
+
+    class Config:
+        orm_mode = True
+
+
+class ModuleOutline(BaseModel):
+    id: int
+    name: str
+    weight: float
+    lessons: List[LessonOutline] = []
+
+    class Config:
+        orm_mode = True
+
 
+class CourseOutlineResponse(CourseResponse):
+    modules: List[ModuleOutline] = []
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.core.models.enums import ImportJobStatus, ImportKind
+
+
+class ImportJobAccepted(BaseModel):
+    job_id: int
+    status: ImportJobStatus
+    status_url: str
+
+
+class ImportJobResponse(BaseModel):
+    id: int
+    kind: ImportKind
+    status: ImportJobStatus
+    file_size: int
+    bytes_processed: int
+    rows_processed: int
+    success_count: int
+    error_count: int
+    rows_per_second: Optional[float]
+    eta_seconds: Optional[float]
+    attempts: int
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    errors_url: str
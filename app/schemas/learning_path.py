@@ -0,0 +1,20 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class LearningPathResponse(BaseModel):
+    user_id: int
+    course_id: int
+    course_ids: List[int]
+
+
+class LearningPathBatchRequest(BaseModel):
+    course_id: int
+    user_ids: List[int] = Field(..., min_items=1)
+
+
+class LearningPathBatchResponse(BaseModel):
+    course_id: int
+    paths: List[LearningPathResponse]
+    unknown_user_ids: List[int]
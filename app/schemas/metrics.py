@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+
+
+class LatencySnapshot(BaseModel):
+    route: str
+    method: str
+    window_seconds: float
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class AuditWriterStats(BaseModel):
+    policy: str
+    running: bool
+    queue_depth: int
+    max_queue_depth: int
+    queue_capacity: int
+    enqueued: int
+    written: int
+    dropped: int
+    sampled_out: int
+    failed: int
+    batches: int
+
+
+class PasswordHashingStats(BaseModel):
+    executor: str
+    max_workers: int
+    in_flight: int
+    waiting: int
+    completed: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    avg_run_ms: float
+
+
+class DatabasePoolStats(BaseModel):
+    pool_class: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeout_seconds: float
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
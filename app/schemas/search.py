@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: str
+    id: int
+    course_id: int
+    title: str
+    highlight: str
+    snippet: Optional[str]
+    rank: float
@@ -0,0 +1 @@
+# Admin service module
@@ -0,0 +1,120 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import Principal, password_pool
+from app.core.db.pool import pool_stats
+from app.core.db.session import get_engine
+from app.core.metrics import latency_registry
+from app.core.models.enums import UserRole
+from app.dependencies.decorators import role_required
+from app.middleware.audit_writer import audit_writer
+from app.schemas.metrics import (
+    AuditWriterStats,
+    DatabasePoolStats,
+    LatencySnapshot,
+    PasswordHashingStats,
+)
+
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics/latency",
+    response_model=List[LatencySnapshot],
+    summary="Per-route latency percentiles over a sliding window",
+)
+async def latency_percentiles(
+    window: float = Query(60.0, gt=0, description="Window length in seconds"),
+    _: Principal = Depends(role_required([UserRole.ADMIN])),
+) -> List[LatencySnapshot]:
+    return [LatencySnapshot(**row) for row in latency_registry.snapshot(window)]
+
+
+@router.get(
+    "/metrics/audit",
+    response_model=AuditWriterStats,
+    summary="Audit writer queue depth and drop counters",
+)
+async def audit_writer_stats(
+    _: Principal = Depends(role_required([UserRole.ADMIN])),
+) -> AuditWriterStats:
+    return AuditWriterStats(**audit_writer.stats())
+
+
+@router.get(
+    "/metrics/password-hashing",
+    response_model=PasswordHashingStats,
+    summary="bcrypt executor concurrency and queue wait",
+)
+async def password_hashing_stats(
+    _: Principal = Depends(role_required([UserRole.ADMIN])),
+) -> PasswordHashingStats:
+    return PasswordHashingStats(**password_pool.stats())
+
+
+@router.get(
+    "/db/pool",
+    response_model=DatabasePoolStats,
+    summary="Database connection pool usage and checkout wait",
+)
+async def database_pool_stats(
+    _: Principal = Depends(role_required([UserRole.ADMIN])),
+) -> DatabasePoolStats:
+    return DatabasePoolStats(**pool_stats(get_engine().pool))
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus scrape endpoint",
+)
+async def prometheus_metrics(
+    window: float = Query(60.0, gt=0, description="Quantile window in seconds"),
+    _: Principal = Depends(role_required([UserRole.ADMIN])),
+) -> PlainTextResponse:
+    lines = latency_registry.render_prometheus(window)
+
+    stats = audit_writer.stats()
+    lines += [
+        "# HELP kg_audit_queue_depth Audit events waiting to be written.",
+        "# TYPE kg_audit_queue_depth gauge",
+        f"kg_audit_queue_depth {stats['queue_depth']}",
+        "# HELP kg_audit_events_dropped_total Audit events dropped by backpressure.",
+        "# TYPE kg_audit_events_dropped_total counter",
+        f"kg_audit_events_dropped_total {stats['dropped'] + stats['sampled_out']}",
+        "# HELP kg_audit_events_written_total Audit events written to the database.",
+        "# TYPE kg_audit_events_written_total counter",
+        f"kg_audit_events_written_total {stats['written']}",
+    ]
+
+    hashing = password_pool.stats()
+    lines += [
+        "# HELP kg_password_hash_waiting bcrypt calls waiting for an executor slot.",
+        "# TYPE kg_password_hash_waiting gauge",
+        f"kg_password_hash_waiting {hashing['waiting']}",
+        "# HELP kg_password_hash_max_wait_ms Longest bcrypt queue wait in milliseconds.",
+        "# TYPE kg_password_hash_max_wait_ms gauge",
+        f"kg_password_hash_max_wait_ms {hashing['max_wait_ms']:.3f}",
+    ]
+
+    db_pool = pool_stats(get_engine().pool)
+    lines += [
+        "# HELP kg_db_pool_checked_out Connections currently checked out of the pool.",
+        "# TYPE kg_db_pool_checked_out gauge",
+        f"kg_db_pool_checked_out {db_pool['checked_out']}",
+        "# HELP kg_db_pool_overflow Connections open beyond the configured pool size.",
+        "# TYPE kg_db_pool_overflow gauge",
+        f"kg_db_pool_overflow {db_pool['overflow']}",
+        "# HELP kg_db_pool_timeouts_total Checkouts that timed out waiting for a connection.",
+        "# TYPE kg_db_pool_timeouts_total counter",
+        f"kg_db_pool_timeouts_total {db_pool['timeouts']}",
+        "# HELP kg_db_pool_max_wait_ms Longest connection checkout wait in milliseconds.",
+        "# TYPE kg_db_pool_max_wait_ms gauge",
+        f"kg_db_pool_max_wait_ms {db_pool['max_wait_ms']:.3f}",
+    ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
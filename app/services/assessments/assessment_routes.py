@@ -1,14 +1,20 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db.session import get_db_session
+from app.core.auth import Principal
+from app.core.common.catalog_version import not_modified
+from app.core.common.pagination import set_next_cursor
+from app.core.config import get_settings
+from app.core.db.session import get_db_session, get_read_session
 from app.core.models.enums import UserRole
 from app.core.models.user import User
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_principal, get_current_user
+from app.dependencies.decorators import BulkPayload, parse_bulk_payload, role_required
 from app.dependencies.roles import get_permission_checker
+from app.schemas.bulk import BulkResult
 from app.schemas.assessment import (
     AssessmentCreate,
     AssessmentResponse,
@@ -78,11 +84,21 @@ async def add_question(
 )
 async def list_assessments_for_course(
     course_id: int,
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[AssessmentResponse]:
+    unchanged = await not_modified(request, response, session, course_id=course_id)
+    if unchanged is not None:
+        return unchanged
     service = AssessmentService(session)
-    assessments = await service.list_assessments_for_course(course_id)
+    assessments, next_cursor = await service.list_assessments_for_course_page(
+        course_id, cursor=cursor, limit=limit
+    )
+    set_next_cursor(response, next_cursor)
     return [AssessmentResponse.from_orm(a) for a in assessments]
 
 
@@ -93,8 +109,8 @@ async def list_assessments_for_course(
 )
 async def stream_questions(
     course_id: int,
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ) -> StreamingResponse:
     """
     Stream all questions for a course as JSON lines (newline-delimited JSON).
@@ -117,4 +133,56 @@ async def stream_questions(
     return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    summary="Create assessments in bulk",
+)
+async def bulk_create_assessments(
+    payload: BulkPayload = Depends(parse_bulk_payload(AssessmentCreate)),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Create assessments from a JSON array or NDJSON body (up to BULK_MAX_ITEMS).
+    Invalid items are reported by index; the valid ones are still created.
+    """
+    service = AssessmentService(session)
+    ids, errors = await service.bulk_create(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResult,
+    summary="Update assessments in bulk",
+)
+async def bulk_update_assessments(
+    payload: BulkPayload = Depends(parse_bulk_payload(AssessmentUpdate, require_id=True)),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Partially update assessments; each item carries an id plus the fields to change.
+    """
+    service = AssessmentService(session)
+    ids, errors = await service.bulk_update(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
+
 
+@router.post(
+    "/bulk/delete",
+    response_model=BulkResult,
+    summary="Delete assessments in bulk",
+)
+async def bulk_delete_assessments(
+    payload: BulkPayload = Depends(parse_bulk_payload()),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Delete assessments by id; the body lists the ids to delete.
+    """
+    service = AssessmentService(session)
+    ids, errors = await service.bulk_delete(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
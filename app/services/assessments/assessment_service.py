@@ -1,10 +1,11 @@
-from typing import AsyncGenerator, List
+from typing import AsyncGenerator, Iterable, List, Optional, Set, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.common.base_service import BaseService
+from app.core.common.base_service import BULK_CHUNK_SIZE, BaseService, BulkErrors, BulkItems
+from app.core.common.catalog_version import touch_courses
 from app.core.models.assessment import Assessment, Option, Question
 from app.core.models.user import User
 from app.schemas.assessment import AssessmentCreate, AssessmentUpdate, QuestionCreate
@@ -16,11 +17,13 @@ class AssessmentService(BaseService[Assessment]):
     """
 
     model = Assessment
+    use_returning = True
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
     async def create_assessment(self, payload: AssessmentCreate, _current_user: User) -> Assessment:
+        touch_courses(self.session, [payload.course_id])
         return await self.create(payload.dict())
 
     async def get_assessment(self, assessment_id: int) -> Assessment:
@@ -33,8 +36,14 @@ class AssessmentService(BaseService[Assessment]):
         return assessment
 
     async def update_assessment(self, assessment_id: int, payload: AssessmentUpdate) -> Assessment:
-        assessment = await self.get_assessment(assessment_id)
-        return await self.update(assessment, payload.dict(exclude_unset=True))
+        touch_courses(self.session, await course_ids_of_assessments(self.session, [assessment_id]))
+        assessment = await self.update_by_id(assessment_id, payload.dict(exclude_unset=True))
+        if not assessment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Assessment not found",
+            )
+        return assessment
 
     async def add_question(
         self,
@@ -55,6 +64,7 @@ class AssessmentService(BaseService[Assessment]):
             )
             self.session.add(option)
 
+        touch_courses(self.session, [assessment.course_id])
         await self.session.commit()
         await self.session.refresh(question)
         return question
@@ -62,6 +72,11 @@ class AssessmentService(BaseService[Assessment]):
     async def list_assessments_for_course(self, course_id: int) -> List[Assessment]:
         return await self.list(filters={"course_id": course_id})
 
+    async def list_assessments_for_course_page(
+        self, course_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Assessment], Optional[str]]:
+        return await self.list_page(filters={"course_id": course_id}, cursor=cursor, limit=limit)
+
     async def question_stream(self, course_id: int) -> AsyncGenerator[Question, None]:
         """
         Async generator that streams questions for a course.
@@ -78,5 +93,36 @@ class AssessmentService(BaseService[Assessment]):
             async for question_row in questions_result.scalars():
                 yield question_row
 
+    # Bulk writes also bump the version of every course they touch
+
+    async def bulk_create(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        touch_courses(self.session, {data["course_id"] for _, data in items})
+        return await super().bulk_create(items, chunk_size)
+
+    async def bulk_update(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        course_ids = await course_ids_of_assessments(self.session, (data["id"] for _, data in items))
+        touch_courses(self.session, course_ids)
+        return await super().bulk_update(items, chunk_size)
+
+    async def bulk_delete(
+        self, items: List[Tuple[int, int]], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        course_ids = await course_ids_of_assessments(self.session, (id_ for _, id_ in items))
+        touch_courses(self.session, course_ids)
+        return await super().bulk_delete(items, chunk_size)
 
 
+async def course_ids_of_assessments(session: AsyncSession, assessment_ids: Iterable[int]) -> Set[int]:
+    """
+    Courses owning any of ``assessment_ids`` (unknown ids are ignored).
+    """
+
+    ids = set(assessment_ids)
+    if not ids:
+        return set()
+    stmt = select(Assessment.course_id).where(Assessment.id.in_(ids)).distinct()
+    return set((await session.execute(stmt)).scalars().all())
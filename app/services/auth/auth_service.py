@@ -4,7 +4,8 @@ Authentication service for user registration and login.
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.auth import create_access_token, get_password_hash, verify_password
+from app.core.auth import create_access_token, get_password_hash_async, verify_password_async
+from app.core.common.cache import remember_user
 from app.core.models.enums import UserRole
 from app.core.models.user import User
 from app.schemas.auth import UserLogin, UserRegister
@@ -42,7 +43,7 @@ class AuthService:
             )
 
         # Create new user
-        hashed_password = get_password_hash(payload.password)
+        hashed_password = await get_password_hash_async(payload.password)
         user_data = {
             "email": payload.email,
             "first_name": payload.first_name,
@@ -55,6 +56,7 @@ class AuthService:
         self.session.add(user)
         await self.session.commit()
         await self.session.refresh(user)
+        remember_user(user.id)
         
         return user
 
@@ -90,7 +92,7 @@ class AuthService:
             )
         
         # Verify password
-        if not verify_password(payload.password, user.hashed_password):
+        if not await verify_password_async(payload.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -108,7 +110,12 @@ class AuthService:
         Returns:
             Dictionary with token data
         """
-        token_data = {"sub": str(user.id), "email": user.email}
+        token_data = {
+            "sub": str(user.id),
+            "email": user.email,
+            "role": user.role.value,
+            "ver": user.token_version or 0,
+        }
         access_token = create_access_token(data=token_data)
         
         return {
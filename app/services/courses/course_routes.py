@@ -1,17 +1,22 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db.session import get_db_session
+from app.core.auth import Principal
+from app.core.common.catalog_version import conditional_headers, not_modified
+from app.core.common.pagination import set_next_cursor
+from app.core.db.session import get_db_session, get_read_session
 from app.core.models.course import Course, course_prerequisite
 from app.core.models.enums import UserRole
 from app.core.models.user import User
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_principal, get_current_user
 from app.dependencies.roles import get_permission_checker
 from app.schemas.course import (
+    CourseClosureResponse,
     CourseCreate,
+    CourseOutlineResponse,
     CourseResponse,
     CourseSetPrerequisitesRequest,
     CourseUpdate,
@@ -19,13 +24,55 @@ from app.schemas.course import (
 from app.services.courses.course_service import CourseService
 
 
+async def load_prerequisite_ids(
+    session: AsyncSession, course_ids: Iterable[int]
+) -> Dict[int, List[int]]:
+    """
+    Batch-load prerequisite ids for many courses with a single ``IN`` query.
+
+    Every requested course gets an entry, empty if it has no prerequisites.
+    """
+
+    ids = list(dict.fromkeys(course_ids))
+    prerequisites: Dict[int, List[int]] = {course_id: [] for course_id in ids}
+    if not ids:
+        return prerequisites
+
+    stmt = (
+        select(course_prerequisite.c.course_id, course_prerequisite.c.prereq_course_id)
+        .where(course_prerequisite.c.course_id.in_(ids))
+        .order_by(course_prerequisite.c.course_id, course_prerequisite.c.prereq_course_id)
+    )
+    for course_id, prereq_id in await session.execute(stmt):
+        prerequisites[course_id].append(prereq_id)
+    return prerequisites
+
+
 async def get_prerequisite_ids(session: AsyncSession, course_id: int) -> List[int]:
     """Helper to safely get prerequisite course IDs."""
-    stmt = select(course_prerequisite.c.prereq_course_id).where(
-        course_prerequisite.c.course_id == course_id
-    )
-    result = await session.execute(stmt)
-    return list(result.scalars().all())
+    return (await load_prerequisite_ids(session, [course_id]))[course_id]
+
+
+async def build_course_responses(
+    session: AsyncSession, courses: Iterable[Course]
+) -> List[CourseResponse]:
+    """
+    Build ``CourseResponse`` objects, loading all prerequisites in one query.
+    """
+
+    courses = list(courses)
+    prerequisites = await load_prerequisite_ids(session, (course.id for course in courses))
+    return [
+        CourseResponse(
+            id=course.id,
+            title=course.title,
+            description=course.description,
+            category=course.category,
+            instructor_id=course.instructor_id,
+            prerequisite_ids=prerequisites[course.id],
+        )
+        for course in courses
+    ]
 
 
 router = APIRouter()
@@ -52,15 +99,7 @@ async def create_course(
 ):
     service = CourseService(session)
     course = await service.create_course(payload, current_user)
-    prerequisite_ids = await get_prerequisite_ids(session, course.id)
-    return CourseResponse(
-        id=course.id,
-        title=course.title,
-        description=course.description,
-        category=course.category,
-        instructor_id=course.instructor_id,
-        prerequisite_ids=prerequisite_ids,
-    )
+    return (await build_course_responses(session, [course]))[0]
 
 
 @router.get(
@@ -69,27 +108,24 @@ async def create_course(
     summary="List courses",
 )
 async def list_courses(
-    offset: int = 0,
-    limit: int = 100,
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    offset: Optional[int] = Query(None, ge=0, description="Deprecated: use cursor"),
+    limit: int = Query(100, description="Page size, at most 1000 with cursor pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ):
+    unchanged = await not_modified(request, response, session)
+    if unchanged is not None:
+        return unchanged
     service = CourseService(session)
-    courses = await service.list_courses(offset=offset, limit=limit)
-    responses = []
-    for course in courses:
-        prerequisite_ids = await get_prerequisite_ids(session, course.id)
-        responses.append(
-            CourseResponse(
-                id=course.id,
-                title=course.title,
-                description=course.description,
-                category=course.category,
-                instructor_id=course.instructor_id,
-                prerequisite_ids=prerequisite_ids,
-            )
-        )
-    return responses
+    if offset is not None:
+        courses = await service.list_courses(offset=offset, limit=limit)
+    else:
+        courses, next_cursor = await service.list_courses_page(cursor=cursor, limit=limit)
+        set_next_cursor(response, next_cursor)
+    return await build_course_responses(session, courses)
 
 
 @router.get(
@@ -99,19 +135,42 @@ async def list_courses(
 )
 async def get_course(
     course_id: int,
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ):
+    unchanged = await not_modified(request, response, session, course_id=course_id)
+    if unchanged is not None:
+        return unchanged
     service = CourseService(session)
     course = await service.get_course(course_id)
-    prerequisite_ids = await get_prerequisite_ids(session, course.id)
-    return CourseResponse(
-        id=course.id,
-        title=course.title,
-        description=course.description,
-        category=course.category,
-        instructor_id=course.instructor_id,
-        prerequisite_ids=prerequisite_ids,
+    return (await build_course_responses(session, [course]))[0]
+
+
+@router.get(
+    "/{course_id}/outline",
+    response_model=CourseOutlineResponse,
+    summary="Course with its modules, lessons, resources and activities",
+)
+async def get_course_outline(
+    course_id: int,
+    request: Request,
+    response: Response,
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    """
+    The whole course tree in one response, modules and lessons ordered by id.
+    """
+    unchanged = await not_modified(request, response, session, course_id=course_id)
+    if unchanged is not None:
+        return unchanged
+    service = CourseService(session)
+    return Response(
+        content=await service.course_outline(course_id, request.state.resource_version),
+        media_type="application/json",
+        headers=conditional_headers(response),
     )
 
 
@@ -136,15 +195,7 @@ async def update_course(
 ):
     service = CourseService(session)
     course = await service.update_course(course_id, payload, current_user)
-    prerequisite_ids = await get_prerequisite_ids(session, course.id)
-    return CourseResponse(
-        id=course.id,
-        title=course.title,
-        description=course.description,
-        category=course.category,
-        instructor_id=course.instructor_id,
-        prerequisite_ids=prerequisite_ids,
-    )
+    return (await build_course_responses(session, [course]))[0]
 
 
 @router.delete(
@@ -190,15 +241,7 @@ async def assign_instructor(
 ):
     service = CourseService(session)
     course = await service.assign_instructor(course_id, instructor_id, current_user)
-    prerequisite_ids = await get_prerequisite_ids(session, course.id)
-    return CourseResponse(
-        id=course.id,
-        title=course.title,
-        description=course.description,
-        category=course.category,
-        instructor_id=course.instructor_id,
-        prerequisite_ids=prerequisite_ids,
-    )
+    return (await build_course_responses(session, [course]))[0]
 
 
 @router.post(
@@ -222,15 +265,38 @@ async def set_prerequisites(
 ):
     service = CourseService(session)
     course = await service.set_prerequisites(course_id, payload, current_user)
-    prerequisite_ids = await get_prerequisite_ids(session, course.id)
-    return CourseResponse(
-        id=course.id,
-        title=course.title,
-        description=course.description,
-        category=course.category,
-        instructor_id=course.instructor_id,
-        prerequisite_ids=prerequisite_ids,
-    )
+    return (await build_course_responses(session, [course]))[0]
+
 
+@router.get(
+    "/{course_id}/prerequisites/closure",
+    response_model=CourseClosureResponse,
+    summary="All transitive prerequisites of a course",
+)
+async def get_prerequisite_closure(
+    course_id: int,
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
+) -> CourseClosureResponse:
+    """
+    Returns every course that must be completed before this one, ordered so
+    each course comes after its own prerequisites.
+    """
+    service = CourseService(session)
+    course_ids = await service.prerequisite_closure(course_id)
+    return CourseClosureResponse(course_id=course_id, course_ids=course_ids)
 
 
+@router.get(
+    "/{course_id}/dependents/closure",
+    response_model=CourseClosureResponse,
+    summary="All courses that transitively require a course",
+)
+async def get_dependent_closure(
+    course_id: int,
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
+) -> CourseClosureResponse:
+    service = CourseService(session)
+    course_ids = await service.dependent_closure(course_id)
+    return CourseClosureResponse(course_id=course_id, course_ids=course_ids)
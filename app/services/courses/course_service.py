@@ -1,14 +1,39 @@
-from typing import List
+from operator import attrgetter
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import delete, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.common.base_service import BaseService
-from app.core.models.course import Course
+from app.core.common.cache import course_outline_cache
+from app.core.common.catalog_version import course_version, touch_courses
+from app.core.models.course import Course, course_prerequisite, course_prerequisite_closure
 from app.core.models.enums import UserRole
+from app.core.models.lesson import Lesson
+from app.core.models.module import Module
 from app.core.models.user import User
-from app.schemas.course import CourseCreate, CourseSetPrerequisitesRequest, CourseUpdate
+from app.schemas.course import (
+    CourseCreate,
+    CourseOutlineResponse,
+    CourseSetPrerequisitesRequest,
+    CourseUpdate,
+    LessonActivityOutline,
+    LessonOutline,
+    LessonResourceOutline,
+    ModuleOutline,
+)
+from app.services.courses.prerequisite_closure import (
+    CycleError,
+    ancestor_depths,
+    descendant_depths,
+    find_cycle,
+    lock_prerequisites,
+    refresh_closure,
+)
+
+_by_id = attrgetter("id")
 
 
 class CourseService(BaseService[Course]):
@@ -17,6 +42,7 @@ class CourseService(BaseService[Course]):
     """
 
     model = Course
+    use_returning = True
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
@@ -27,6 +53,7 @@ class CourseService(BaseService[Course]):
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only admins or instructors can create courses",
             )
+        touch_courses(self.session, [], catalog=True)
         return await self.create(payload.dict())
 
     async def update_course(self, course_id: int, payload: CourseUpdate, current_user: User) -> Course:
@@ -36,6 +63,7 @@ class CourseService(BaseService[Course]):
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions",
             )
+        touch_courses(self.session, [course_id], catalog=True)
         return await self.update(course, payload.dict(exclude_unset=True))
 
     async def delete_course(self, course_id: int, current_user: User) -> None:
@@ -45,11 +73,40 @@ class CourseService(BaseService[Course]):
                 detail="Only admins can delete courses",
             )
         course = await self.get_course(course_id)
+
+        # Paths through this course disappear with it; fix its dependents' closure rows
+        await lock_prerequisites(self.session)
+        dependents = await descendant_depths(self.session, course_id)
+        await self.session.execute(
+            delete(course_prerequisite).where(
+                or_(
+                    course_prerequisite.c.course_id == course_id,
+                    course_prerequisite.c.prereq_course_id == course_id,
+                )
+            )
+        )
+        await self.session.execute(
+            delete(course_prerequisite_closure).where(
+                or_(
+                    course_prerequisite_closure.c.ancestor_id == course_id,
+                    course_prerequisite_closure.c.descendant_id == course_id,
+                )
+            )
+        )
+        if dependents:
+            await refresh_closure(self.session, dependents)
+        # Dependents list this course among their prerequisite ids
+        touch_courses(self.session, [course_id, *dependents], catalog=True)
         await self.delete(course)
 
     async def list_courses(self, offset: int = 0, limit: int = 100) -> List[Course]:
         return await self.list(offset=offset, limit=limit)
 
+    async def list_courses_page(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Course], Optional[str]]:
+        return await self.list_page(cursor=cursor, limit=limit)
+
     async def get_course(self, course_id: int) -> Course:
         course = await self.get_by_id(course_id)
         if not course:
@@ -71,6 +128,7 @@ class CourseService(BaseService[Course]):
                 detail="Instructor not found or not an instructor",
             )
         course.instructor_id = instructor_id
+        touch_courses(self.session, [course_id], catalog=True)
         await self.session.commit()
         await self.session.refresh(course)
         return course
@@ -87,27 +145,135 @@ class CourseService(BaseService[Course]):
                 detail="Insufficient permissions",
             )
         course = await self.get_course(course_id)
+        wanted = set(payload.prerequisite_ids)
 
-        if not payload.prerequisite_ids:
-            course.prerequisites.clear()
-            await self.session.commit()
-            await self.session.refresh(course)
-            return course
+        if wanted:
+            stmt = select(Course.id).where(Course.id.in_(wanted))
+            found = set((await self.session.execute(stmt)).scalars().all())
+            if found != wanted:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="One or more prerequisite courses not found",
+                )
 
-        stmt = select(Course).where(Course.id.in_(payload.prerequisite_ids))
-        result = await self.session.execute(stmt)
-        prereqs = result.scalars().all()
+        # The closure table answers "does the course already lead to a new prereq?"
+        await lock_prerequisites(self.session)
+        dependents = await descendant_depths(self.session, course_id)
+        cycle = await find_cycle(self.session, course_id, wanted, dependents)
+        if cycle is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(CycleError(cycle)))
 
-        if len(prereqs) != len(set(payload.prerequisite_ids)):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="One or more prerequisite courses not found",
+        # Write only the edges that change
+        stmt = select(course_prerequisite.c.prereq_course_id).where(
+            course_prerequisite.c.course_id == course_id
+        )
+        current = set((await self.session.execute(stmt)).scalars().all())
+        removed, added = current - wanted, wanted - current
+        if removed:
+            await self.session.execute(
+                delete(course_prerequisite).where(
+                    course_prerequisite.c.course_id == course_id,
+                    course_prerequisite.c.prereq_course_id.in_(removed),
+                )
             )
-
-        course.prerequisites = list(prereqs)
+        if added:
+            await self.session.execute(
+                insert(course_prerequisite),
+                [{"course_id": course_id, "prereq_course_id": prereq_id} for prereq_id in sorted(added)],
+            )
+        if removed or added:
+            await refresh_closure(self.session, {course_id, *dependents})
+            touch_courses(self.session, [course_id], catalog=True)
         await self.session.commit()
-        await self.session.refresh(course)
         return course
 
+    async def course_outline(self, course_id: int, version: Optional[int] = None) -> bytes:
+        """
+        The course with its modules, lessons, resources and activities, as
+        serialized ``CourseOutlineResponse`` JSON.
+
+        The tree is loaded with one ``selectinload`` query per level.  The
+        JSON is cached under the course's ``resource_version`` counter
+        (``version``, if the caller already read it), so a write to the
+        course or one of its modules or lessons in any process makes the
+        next read load it again (see ``touch_courses``).
+        """
+
+        if version is None:
+            version = await course_version(self.session, course_id)
+        cached = course_outline_cache.get((course_id, version))
+        if cached is not None:
+            return cached
+
+        lessons = selectinload(Course.modules).selectinload(Module.lessons)
+        stmt = (
+            select(Course)
+            .where(Course.id == course_id)
+            .options(
+                selectinload(Course.prerequisites).load_only(Course.id),
+                lessons.selectinload(Lesson.resources),
+                lessons.selectinload(Lesson.activities),
+            )
+            .execution_options(populate_existing=True)
+        )
+        course = (await self.session.execute(stmt)).scalar_one_or_none()
+        if course is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+
+        outline = CourseOutlineResponse(
+            id=course.id,
+            title=course.title,
+            description=course.description,
+            category=course.category,
+            instructor_id=course.instructor_id,
+            prerequisite_ids=sorted(prereq.id for prereq in course.prerequisites),
+            modules=[
+                ModuleOutline(
+                    id=module.id,
+                    name=module.name,
+                    weight=module.weight,
+                    lessons=[
+                        LessonOutline(
+                            id=lesson.id,
+                            name=lesson.name,
+                            content_type=lesson.content_type,
+                            resources=[
+                                LessonResourceOutline.from_orm(resource)
+                                for resource in sorted(lesson.resources, key=_by_id)
+                            ],
+                            activities=[
+                                LessonActivityOutline.from_orm(activity)
+                                for activity in sorted(lesson.activities, key=_by_id)
+                            ],
+                        )
+                        for lesson in sorted(module.lessons, key=_by_id)
+                    ],
+                )
+                for module in sorted(course.modules, key=_by_id)
+            ],
+        )
+        body = outline.json().encode()
+        # Cache it only if no write committed since ``version`` was read, so
+        # the entry is exactly that version even from a lagging replica
+        if await course_version(self.session, course_id) == version:
+            course_outline_cache.set((course_id, version), body)
+        return body
+
+    async def prerequisite_closure(self, course_id: int) -> List[int]:
+        """
+        Every transitive prerequisite of a course, in an order they can be taken.
+        """
+
+        await self.get_course(course_id)
+        depths = await ancestor_depths(self.session, course_id)
+        # Longest chain first: each course comes after all of its own prerequisites
+        return sorted(depths, key=lambda id_: (-depths[id_], id_))
 
+    async def dependent_closure(self, course_id: int) -> List[int]:
+        """
+        Every course that transitively requires this one, prerequisites first.
+        """
 
+        await self.get_course(course_id)
+        depths = await descendant_depths(self.session, course_id)
+        return sorted(depths, key=lambda id_: (depths[id_], id_))
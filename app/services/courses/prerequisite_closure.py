@@ -0,0 +1,350 @@
+"""
+Materialized transitive closure of course prerequisites.
+
+``course_prerequisite_closure`` holds one ``(ancestor, descendant, depth)``
+row for every course and each of its transitive prerequisites, so "does X
+(transitively) require Y" and "everything X depends on" are single indexed
+lookups.  ``depth`` is the longest chain between the two courses.
+
+Only the closure rows of a changed course and of the courses depending on it
+can change, so writes recompute exactly that set in Python from a handful of
+queries and apply the difference inside the caller's transaction.  The same
+dependents answer the cycle check: a new edge ``course -> prereq`` closes a
+loop exactly when ``prereq`` already depends on the course.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.course import course_prerequisite, course_prerequisite_closure
+
+# Ancestor id -> depth, per descendant
+Closure = Dict[int, Dict[int, int]]
+
+CLOSURE_CHUNK_SIZE = 1000
+
+# Arbitrary key for the transaction-scoped advisory lock serializing edge writes
+_ADVISORY_LOCK_KEY = 0x6B67_7072
+
+_edges = course_prerequisite.c
+_closure = course_prerequisite_closure.c
+
+
+class CycleError(ValueError):
+    """
+    Raised when new prerequisites would make the graph cyclic.
+
+    ``cycle`` lists the course ids along the cycle, starting and ending with
+    the same course.
+    """
+
+    def __init__(self, cycle: List[int]) -> None:
+        self.cycle = cycle
+        super().__init__("Prerequisites would create a cycle: " + " -> ".join(map(str, cycle)))
+
+
+def compute_closure(
+    edges: Iterable[Tuple[int, int]],
+    nodes: Optional[Iterable[int]] = None,
+    known: Optional[Mapping[int, Mapping[int, int]]] = None,
+) -> Closure:
+    """
+    Closure rows for ``nodes`` from ``(course_id, prereq_course_id)`` edges.
+
+    ``nodes`` defaults to every course in ``edges``.  Prerequisites outside
+    ``nodes`` take their own ancestors from ``known``, which lets a caller
+    recompute part of the graph.  Raises ``ValueError`` on a cycle.
+    """
+
+    prereqs: Dict[int, List[int]] = {}
+    for course_id, prereq_id in edges:
+        prereqs.setdefault(course_id, []).append(prereq_id)
+    if nodes is None:
+        subset = set(prereqs)
+        for ids in prereqs.values():
+            subset.update(ids)
+    else:
+        subset = set(nodes)
+    known = known or {}
+
+    # Kahn's algorithm over the edges inside the subset
+    indegree = {node: 0 for node in subset}
+    dependents: Dict[int, List[int]] = {}
+    for node in subset:
+        for prereq in prereqs.get(node, ()):
+            if prereq in subset:
+                indegree[node] += 1
+                dependents.setdefault(prereq, []).append(node)
+    ready = [node for node, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+
+    result: Closure = {}
+    while ready:
+        node = heapq.heappop(ready)
+        ancestors: Dict[int, int] = {}
+        for prereq in prereqs.get(node, ()):
+            if ancestors.get(prereq, 0) < 1:
+                ancestors[prereq] = 1
+            upstream = result[prereq] if prereq in subset else known.get(prereq, {})
+            for ancestor, depth in upstream.items():
+                if ancestors.get(ancestor, 0) <= depth:
+                    ancestors[ancestor] = depth + 1
+        result[node] = ancestors
+        for dependent in dependents.get(node, ()):
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    if len(result) != len(subset):
+        raise ValueError("Prerequisite edges contain a cycle")
+    return result
+
+
+def topological_order(edges: Iterable[Tuple[int, int]], nodes: Iterable[int]) -> List[int]:
+    """
+    Order ``nodes`` prerequisites first along ``(course_id, prereq_course_id)`` edges.
+
+    Only edges between the given nodes are considered; ties are broken by
+    course id so the order is stable.
+    """
+
+    subset = set(nodes)
+    indegree = {node: 0 for node in subset}
+    dependents: Dict[int, List[int]] = {}
+    for course_id, prereq_id in edges:
+        if course_id in subset and prereq_id in subset:
+            indegree[course_id] += 1
+            dependents.setdefault(prereq_id, []).append(course_id)
+
+    ready = [node for node, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    order: List[int] = []
+    while ready:
+        node = heapq.heappop(ready)
+        order.append(node)
+        for dependent in dependents.get(node, ()):
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, dependent)
+    return order
+
+
+def diff_closure(expected: Closure, actual: Closure) -> Dict[str, List[Tuple[int, int, int]]]:
+    """
+    Compare two closures as ``(ancestor, descendant, depth)`` rows.
+
+    ``changed`` rows carry the expected depth.
+    """
+
+    missing, extra, changed = [], [], []
+    for descendant in expected.keys() | actual.keys():
+        want = expected.get(descendant, {})
+        have = actual.get(descendant, {})
+        for ancestor, depth in want.items():
+            if ancestor not in have:
+                missing.append((ancestor, descendant, depth))
+            elif have[ancestor] != depth:
+                changed.append((ancestor, descendant, depth))
+        for ancestor, depth in have.items():
+            if ancestor not in want:
+                extra.append((ancestor, descendant, depth))
+    return {"missing": sorted(missing), "extra": sorted(extra), "changed": sorted(changed)}
+
+
+async def lock_prerequisites(session: AsyncSession) -> None:
+    """
+    Serialize prerequisite writes until the current transaction ends.
+
+    Two concurrent writers could each pass the cycle check and together close
+    a loop, so PostgreSQL takes an advisory lock; other backends already
+    serialize writers.
+    """
+
+    if session.get_bind().dialect.name == "postgresql":
+        await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+
+async def ancestor_depths(session: AsyncSession, course_id: int) -> Dict[int, int]:
+    """
+    Every transitive prerequisite of ``course_id`` with its depth.
+    """
+
+    stmt = select(_closure.ancestor_id, _closure.depth).where(_closure.descendant_id == course_id)
+    return dict((await session.execute(stmt)).all())
+
+
+async def descendant_depths(session: AsyncSession, course_id: int) -> Dict[int, int]:
+    """
+    Every course that transitively requires ``course_id`` with its depth.
+    """
+
+    stmt = select(_closure.descendant_id, _closure.depth).where(_closure.ancestor_id == course_id)
+    return dict((await session.execute(stmt)).all())
+
+
+async def find_cycle(
+    session: AsyncSession, course_id: int, prereq_ids: Iterable[int], dependents: Iterable[int]
+) -> Optional[List[int]]:
+    """
+    The loop that giving ``course_id`` the prerequisites ``prereq_ids`` would close, if any.
+
+    ``dependents`` are the course's ``descendant_depths``.  Only their own
+    prerequisite edges are read (as ``refresh_closure`` would on a write) to
+    find the shortest path from the course to a new prerequisite.
+    """
+
+    targets = set(prereq_ids)
+    if course_id in targets:
+        return [course_id, course_id]
+    members = sorted(set(dependents))
+    if targets.isdisjoint(members):
+        return None
+
+    required_by: Dict[int, List[int]] = {}
+    for chunk in _chunks(members):
+        stmt = select(_edges.course_id, _edges.prereq_course_id).where(_edges.course_id.in_(chunk))
+        for dependent, prereq in (await session.execute(stmt)).all():
+            required_by.setdefault(prereq, []).append(dependent)
+
+    parents: Dict[int, int] = {course_id: course_id}
+    queue = deque([course_id])
+    while queue:
+        node = queue.popleft()
+        for dependent in sorted(required_by.get(node, ())):
+            if dependent in parents:
+                continue
+            parents[dependent] = node
+            if dependent in targets:
+                path = [dependent]
+                while path[-1] != course_id:
+                    path.append(parents[path[-1]])
+                # course_id -> ... -> prereq, then prereq -> course_id via the new edge
+                return list(reversed(path)) + [course_id]
+            queue.append(dependent)
+    return None
+
+
+async def refresh_closure(session: AsyncSession, nodes: Iterable[int]) -> Dict[str, int]:
+    """
+    Recompute the closure rows of ``nodes`` from the current edges.
+
+    ``nodes`` must include every course depending on any of them (e.g. a
+    changed course plus its ``descendant_depths``).  Only rows that differ
+    are written; the caller commits.  Returns the written row counts.
+    """
+
+    subset = sorted(set(nodes))
+    edges: List[Tuple[int, int]] = []
+    for chunk in _chunks(subset):
+        stmt = select(_edges.course_id, _edges.prereq_course_id).where(_edges.course_id.in_(chunk))
+        edges.extend((await session.execute(stmt)).all())
+
+    members = set(subset)
+    outside = sorted({prereq for _, prereq in edges if prereq not in members})
+    known = await _load_closure(session, outside)
+    expected = compute_closure(edges, subset, known)
+    actual = await _load_closure(session, subset)
+    diff = diff_closure(expected, actual)
+    await _apply_diff(session, diff)
+    return {name: len(rows) for name, rows in diff.items()}
+
+
+async def backfill_closure(session: AsyncSession, chunk_size: int = CLOSURE_CHUNK_SIZE) -> int:
+    """
+    Rebuild the whole closure table from ``course_prerequisite`` and commit.
+
+    Returns the number of closure rows written.
+    """
+
+    edges = (await session.execute(select(_edges.course_id, _edges.prereq_course_id))).all()
+    closure = compute_closure(edges)
+    await session.execute(delete(course_prerequisite_closure))
+    rows = _rows(closure)
+    for chunk in _chunks(rows, chunk_size):
+        await session.execute(insert(course_prerequisite_closure), chunk)
+    await session.commit()
+    return len(rows)
+
+
+async def check_closure(session: AsyncSession) -> Dict[str, List[Tuple[int, int, int]]]:
+    """
+    Compare the closure table with the closure of the raw edges.
+
+    Returns ``missing``, ``extra`` and ``changed`` rows; all empty means the
+    table is consistent.
+    """
+
+    edges = (await session.execute(select(_edges.course_id, _edges.prereq_course_id))).all()
+    expected = compute_closure(edges)
+    actual: Closure = {}
+    stmt = select(_closure.descendant_id, _closure.ancestor_id, _closure.depth)
+    for descendant, ancestor, depth in (await session.execute(stmt)).all():
+        actual.setdefault(descendant, {})[ancestor] = depth
+    return diff_closure(expected, actual)
+
+
+async def closure_row_count(session: AsyncSession) -> int:
+    stmt = select(func.count()).select_from(course_prerequisite_closure)
+    return int((await session.execute(stmt)).scalar_one())
+
+
+async def _load_closure(session: AsyncSession, descendants: Sequence[int]) -> Closure:
+    closure: Closure = {node: {} for node in descendants}
+    for chunk in _chunks(list(descendants)):
+        stmt = select(_closure.descendant_id, _closure.ancestor_id, _closure.depth).where(
+            _closure.descendant_id.in_(chunk)
+        )
+        for descendant, ancestor, depth in (await session.execute(stmt)).all():
+            closure[descendant][ancestor] = depth
+    return closure
+
+
+async def _apply_diff(session: AsyncSession, diff: Dict[str, List[Tuple[int, int, int]]]) -> None:
+    for chunk in _chunks(diff["extra"]):
+        pairs = [(ancestor, descendant) for ancestor, descendant, _ in chunk]
+        await session.execute(
+            delete(course_prerequisite_closure).where(
+                tuple_(_closure.ancestor_id, _closure.descendant_id).in_(pairs)
+            )
+        )
+    for chunk in _chunks(diff["changed"]):
+        await session.execute(
+            update(course_prerequisite_closure)
+            .where(
+                _closure.ancestor_id == bindparam("b_ancestor"),
+                _closure.descendant_id == bindparam("b_descendant"),
+            )
+            .values(depth=bindparam("b_depth"))
+            .execution_options(synchronize_session=False),
+            [
+                {"b_ancestor": ancestor, "b_descendant": descendant, "b_depth": depth}
+                for ancestor, descendant, depth in chunk
+            ],
+        )
+    for chunk in _chunks(diff["missing"]):
+        await session.execute(
+            insert(course_prerequisite_closure),
+            [
+                {"ancestor_id": ancestor, "descendant_id": descendant, "depth": depth}
+                for ancestor, descendant, depth in chunk
+            ],
+        )
+
+
+def _rows(closure: Closure) -> List[Dict[str, int]]:
+    return [
+        {"ancestor_id": ancestor, "descendant_id": descendant, "depth": depth}
+        for descendant, ancestors in sorted(closure.items())
+        for ancestor, depth in sorted(ancestors.items())
+    ]
+
+
+def _chunks(items: Sequence, size: int = CLOSURE_CHUNK_SIZE) -> Iterator[Sequence]:
+    size = max(size, 1)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
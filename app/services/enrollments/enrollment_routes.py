@@ -1,16 +1,35 @@
-from typing import List
-
-from fastapi import APIRouter, BackgroundTasks, Depends, File, UploadFile, status
+from typing import List, Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db.session import get_db_session
-from app.core.models.enums import UserRole
+from app.core.auth import Principal
+from app.core.common.copy_import import ImportEngine
+from app.core.common.pagination import set_next_cursor
+from app.core.db.session import get_db_session, get_read_session
+from app.core.models.enums import ImportKind, UserRole
 from app.core.models.user import User
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_principal, get_current_user
 from app.dependencies.decorators import role_required, validate_csv_headers
 from app.schemas.enrollment import EnrollmentCreate, EnrollmentResponse, EnrollmentUpdate
 from app.services.enrollments.enrollment_service import EnrollmentService
+from app.services.imports.import_service import (
+    ImportJobService,
+    job_accepted,
+    require_background_for_parallel,
+)
+from app.services.imports.import_worker import import_worker
 from app.services.email import (
     EmailService,
     ENROLLMENT_NOTIFICATION_TEMPLATE,
@@ -20,6 +39,15 @@ from app.services.email import (
 router = APIRouter()
 
 
+def require_override_permission(override_prerequisites: bool, role: UserRole) -> None:
+    """Only admins may bypass prerequisite gating."""
+    if override_prerequisites and role is not UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can override prerequisites",
+        )
+
+
 async def send_enrollment_email_async(user_email: str, user_name: str, course_title: str):
     """Background task to send enrollment notification email."""
     email_service = EmailService()
@@ -42,11 +70,15 @@ async def send_enrollment_email_async(user_email: str, user_name: str, course_ti
 async def enroll_user(
     payload: EnrollmentCreate,
     background_tasks: BackgroundTasks,
+    override_prerequisites: bool = Query(
+        False, description="Admins only: enroll even if prerequisites are not completed"
+    ),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_session),
 ) -> EnrollmentResponse:
+    require_override_permission(override_prerequisites, current_user.role)
     service = EnrollmentService(session)
-    enrollment = await service.enroll_user(payload, current_user)
+    enrollment = await service.enroll_user(payload, current_user, override_prerequisites)
     
     # Send email notification in background
     from app.core.models.course import Course
@@ -70,11 +102,19 @@ async def enroll_user(
     summary="List enrollments",
 )
 async def list_enrollments(
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    response: Response,
+    offset: Optional[int] = Query(None, ge=0, description="Deprecated: use cursor"),
+    limit: int = Query(100, description="Page size, at most 1000 with cursor pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[EnrollmentResponse]:
     service = EnrollmentService(session)
-    enrollments = await service.list_enrollments()
+    if offset is not None:
+        enrollments = await service.list_enrollments(offset=offset, limit=limit)
+    else:
+        enrollments, next_cursor = await service.list_enrollments_page(cursor=cursor, limit=limit)
+        set_next_cursor(response, next_cursor)
     return [EnrollmentResponse.from_orm(e) for e in enrollments]
 
 
@@ -83,8 +123,8 @@ async def list_enrollments(
     summary="Export enrollments as streaming CSV",
 )
 async def export_enrollments_csv(
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ) -> StreamingResponse:
     service = EnrollmentService(session)
     generator = service.stream_enrollments_csv()
@@ -100,17 +140,47 @@ async def import_enrollments_csv(
     file: UploadFile = Depends(
         validate_csv_headers(["user_id", "course_id", "progress", "completion_percentage"])
     ),
-    current_user: User = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    current_user: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
     session: AsyncSession = Depends(get_db_session),
     batch_size: int = 1000,
+    override_prerequisites: bool = Query(
+        False, description="Admins only: skip the prerequisite check for every row"
+    ),
+    engine: ImportEngine = Query(
+        ImportEngine.ORM, description="copy: stage each batch with COPY (PostgreSQL only)"
+    ),
+    background: bool = Query(
+        False, description="Queue the import and return 202 with a job to poll at /imports/{id}"
+    ),
+    parallel: bool = Query(
+        False, description="With background: parse the file in worker processes"
+    ),
 ) -> JSONResponse:
     """
     Import enrollments from CSV file.
     CSV format: user_id,course_id,progress,completion_percentage
     """
+    require_override_permission(override_prerequisites, current_user.role)
+    require_background_for_parallel(parallel, background)
+    if background:
+        options = {
+            "batch_size": batch_size,
+            "override_prerequisites": override_prerequisites,
+            "engine": engine.value,
+            "parallel": parallel,
+        }
+        job = await ImportJobService(session).submit(
+            ImportKind.ENROLLMENTS, file, options, current_user
+        )
+        import_worker.notify()
+        return job_accepted(job)
+
     service = EnrollmentService(session)
     success_count, error_count, error_messages = await service.import_enrollments_csv(
-        file, batch_size=batch_size
+        file,
+        batch_size=batch_size,
+        override_prerequisites=override_prerequisites,
+        engine=engine,
     )
 
     return JSONResponse(
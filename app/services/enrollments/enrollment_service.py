@@ -1,16 +1,91 @@
-import csv
-import io
-from typing import AsyncGenerator, List, Tuple
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple, Union
 
 from fastapi import HTTPException, UploadFile, status
-from sqlalchemy import select
+from sqlalchemy import Column, Float, Integer, MetaData, Table, exists, insert, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Insert, Select
 
 from app.core.common.base_service import BaseService
+from app.core.common.catalog_version import touch_progress
+from app.core.common.copy_import import ImportEngine, copy_supported, copy_to_staging, discard_staged
+from app.core.common.csv_stream import CsvPosition, ImportCheckpoint
+from app.core.common.parallel_csv import ParseColumns, parsed_batches
+from app.core.config import get_settings
 from app.core.models.course import Course
 from app.core.models.enrollment import Enrollment
 from app.core.models.user import User
 from app.schemas.enrollment import EnrollmentCreate, EnrollmentUpdate
+from app.services.enrollments.prerequisite_gate import PrerequisiteGate, describe_missing
+
+# Keys per IN (...) query when validating an import chunk
+_IMPORT_QUERY_CHUNK_SIZE = 1000
+
+# Typed columns of a parsed import row, as packed by parallel parsing
+_IMPORT_COLUMNS: ParseColumns = {
+    "user_id": "q",
+    "course_id": "q",
+    "progress": "d",
+    "completion_percentage": "d",
+}
+
+# Per-transaction staging table of ImportEngine.COPY imports
+_enrollment_staging = Table(
+    "enrollment_import_staging",
+    MetaData(),
+    Column("row_num", Integer, primary_key=True),
+    Column("user_id", Integer, nullable=False),
+    Column("course_id", Integer, nullable=False),
+    Column("progress", Float, nullable=False),
+    Column("completion_percentage", Float, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def _staged_enrollment_rejects() -> Select:
+    """
+    Staged rows with an unknown user or course or an existing enrollment.
+    """
+
+    staged = _enrollment_staging.c
+    enrolled = exists().where(
+        Enrollment.user_id == staged.user_id, Enrollment.course_id == staged.course_id
+    )
+    return (
+        select(staged.row_num, User.id.is_not(None), Course.id.is_not(None))
+        .select_from(_enrollment_staging)
+        .outerjoin(User, User.id == staged.user_id)
+        .outerjoin(Course, Course.id == staged.course_id)
+        .where(or_(User.id.is_(None), Course.id.is_(None), enrolled))
+    )
+
+
+def _staged_enrollment_insert() -> Insert:
+    """
+    Insert the staged rows whose user and course exist and that are not
+    enrolled yet; the joins and ``NOT EXISTS`` guard against anything that
+    changed since ``_staged_enrollment_rejects`` ran.  Returns the inserted
+    (user, course) pairs, so rows filtered out by the guard can be reported.
+    """
+
+    staged = _enrollment_staging.c
+    rows = (
+        select(staged.user_id, staged.course_id, staged.progress, staged.completion_percentage)
+        .select_from(_enrollment_staging)
+        .join(User, User.id == staged.user_id)
+        .join(Course, Course.id == staged.course_id)
+        .where(
+            ~exists().where(
+                Enrollment.user_id == staged.user_id, Enrollment.course_id == staged.course_id
+            )
+        )
+        .order_by(staged.row_num)
+    )
+    return (
+        insert(Enrollment)
+        .from_select(["user_id", "course_id", "progress", "completion_percentage"], rows)
+        .returning(Enrollment.user_id, Enrollment.course_id)
+    )
 
 
 class EnrollmentService(BaseService[Enrollment]):
@@ -19,11 +94,20 @@ class EnrollmentService(BaseService[Enrollment]):
     """
 
     model = Enrollment
+    use_returning = True
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
-    async def enroll_user(self, payload: EnrollmentCreate, _current_user: User) -> Enrollment:
+    def gating_enabled(self, override_prerequisites: bool = False) -> bool:
+        return get_settings().enrollment_prerequisite_gating and not override_prerequisites
+
+    async def enroll_user(
+        self,
+        payload: EnrollmentCreate,
+        _current_user: User,
+        override_prerequisites: bool = False,
+    ) -> Enrollment:
         # Ensure user and course exist
         user = await self.session.get(User, payload.user_id)
         if not user:
@@ -44,19 +128,41 @@ class EnrollmentService(BaseService[Enrollment]):
                 detail="User already enrolled",
             )
 
+        if self.gating_enabled(override_prerequisites):
+            gate = await PrerequisiteGate.load(self.session, [(payload.user_id, payload.course_id)])
+            missing = gate.missing(payload.user_id, payload.course_id)
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=describe_missing(payload.user_id, payload.course_id, missing),
+                )
+
+        touch_progress(self.session, [payload.user_id])
         return await self.create(payload.dict())
 
     async def list_enrollments(self, offset: int = 0, limit: int = 100) -> List[Enrollment]:
         return await self.list(offset=offset, limit=limit)
 
+    async def list_enrollments_page(
+        self, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Enrollment], Optional[str]]:
+        return await self.list_page(cursor=cursor, limit=limit)
+
     async def update_enrollment(self, enrollment_id: int, payload: EnrollmentUpdate) -> Enrollment:
-        enrollment = await self.get_by_id(enrollment_id)
+        data = payload.dict(exclude_unset=True)
+        if "completion_percentage" in data:
+            # Completed courses shape the learner's learning paths
+            stmt = select(Enrollment.user_id).where(Enrollment.id == enrollment_id)
+            user_id = (await self.session.execute(stmt)).scalar_one_or_none()
+            if user_id is not None:
+                touch_progress(self.session, [user_id])
+        enrollment = await self.update_by_id(enrollment_id, data)
         if not enrollment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Enrollment not found",
             )
-        return await self.update(enrollment, payload.dict(exclude_unset=True))
+        return enrollment
 
     async def stream_enrollments_csv(self) -> AsyncGenerator[str, None]:
         """
@@ -76,83 +182,245 @@ class EnrollmentService(BaseService[Enrollment]):
             yield line
 
     async def import_enrollments_csv(
-        self, file: UploadFile, batch_size: int = 1000
+        self,
+        file: UploadFile,
+        batch_size: int = 1000,
+        override_prerequisites: bool = False,
+        engine: ImportEngine = ImportEngine.ORM,
+        start: Optional[CsvPosition] = None,
+        checkpoint: Optional[ImportCheckpoint] = None,
+        parallel: bool = False,
     ) -> Tuple[int, int, List[str]]:
         """
-        Import enrollments from CSV file using async file reading and batch inserts.
-        
+        Import enrollments from CSV file, streamed in chunks, using batch inserts.
+
+        Rows are handled ``batch_size`` at a time: each batch is parsed first so
+        its users, courses, existing enrollments and prerequisite gate can be
+        loaded with a handful of set-based queries, then validated row by row
+        in file order.  A repeated (user, course) pair in the file is reported
+        like an existing enrollment.  ``ImportEngine.COPY`` stages each batch
+        with COPY on PostgreSQL (see ``_import_chunk_copy``).
+
+        Each batch commits on its own.  ``checkpoint`` is awaited just before
+        every commit so progress can be saved in the same transaction; its
+        row errors are then not collected here.  ``start`` resumes at a
+        position passed to a checkpoint.  With ``parallel``, a file on disk is
+        parsed in worker processes (see ``app.core.common.parallel_csv``).
+
         Returns:
             Tuple of (success_count, error_count, error_messages)
         """
         success_count = 0
         error_count = 0
         error_messages = []
-        batch = []
+        gated = self.gating_enabled(override_prerequisites)
+
+        use_copy = engine is ImportEngine.COPY and copy_supported(self.session)
+        # The upload is streamed; only one chunk of rows is held at a time.  Each
+        # chunk is parsed whole first, failures kept in place to preserve row order
+        batches = parsed_batches(
+            file, batch_size, self._parse_import_row, _IMPORT_COLUMNS, start, parallel
+        )
+        async for parsed, position in batches:
+            if use_copy:
+                inserted, errors, user_ids = await self._import_chunk_copy(parsed, gated)
+            else:
+                inserted, errors, user_ids = await self._import_chunk(parsed, gated)
+            touch_progress(self.session, user_ids)
+            if checkpoint is not None:
+                await checkpoint(self.session, position, inserted, errors)
+            await self.session.commit()
 
-        # Read file asynchronously
-        content = await file.read()
-        text_content = content.decode("utf-8")
-        reader = csv.DictReader(io.StringIO(text_content))
+            success_count += inserted
+            error_count += len(errors)
+            if checkpoint is None:
+                error_messages.extend(f"Row {row_num}: {message}" for row_num, message in errors)
 
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
+        return success_count, error_count, error_messages
+
+    async def _import_chunk(
+        self, parsed: List[Tuple[int, Any]], gated: bool
+    ) -> Tuple[int, List[Tuple[int, str]], Set[int]]:
+        """
+        Validate a parsed chunk in Python and insert the accepted rows,
+        without committing.
+
+        Returns the number of rows inserted, ``(row_num, message)`` errors and
+        the users who were enrolled.
+        """
+
+        gate = None
+        if gated:
+            pairs = [
+                (data["user_id"], data["course_id"])
+                for _, data in parsed
+                if not isinstance(data, Exception)
+            ]
+            gate = await PrerequisiteGate.load(self.session, pairs)
+
+        # Users, courses and existing enrollments of the whole chunk, in three queries
+        valid = [data for _, data in parsed if not isinstance(data, Exception)]
+        users = await self._existing_keys({data["user_id"] for data in valid}, User.id)
+        courses = await self._existing_keys({data["course_id"] for data in valid}, Course.id)
+        enrolled = await self._existing_keys(
+            {
+                (data["user_id"], data["course_id"])
+                for data in valid
+                if data["user_id"] in users and data["course_id"] in courses
+            },
+            Enrollment.user_id,
+            Enrollment.course_id,
+        )
+
+        batch = []
+        errors = []
+        for row_num, data in parsed:
             try:
-                # Clean and validate data
-                user_id = int(row.get("user_id", "").strip())
-                course_id = int(row.get("course_id", "").strip())
-                progress = float(row.get("progress", "0.0").strip() or "0.0")
-                completion_percentage = float(
-                    row.get("completion_percentage", "0.0").strip() or "0.0"
-                )
+                if isinstance(data, Exception):
+                    raise data
+                user_id, course_id = data["user_id"], data["course_id"]
 
                 # Validate user and course exist
-                user = await self.session.get(User, user_id)
-                if not user:
+                if user_id not in users:
                     raise ValueError(f"User {user_id} not found")
 
-                course = await self.session.get(Course, course_id)
-                if not course:
+                if course_id not in courses:
                     raise ValueError(f"Course {course_id} not found")
 
-                # Check for duplicate enrollment
-                stmt = select(Enrollment).where(
-                    Enrollment.user_id == user_id, Enrollment.course_id == course_id
-                )
-                existing = await self.session.execute(stmt)
-                if existing.scalar_one_or_none():
+                # Check for duplicate enrollment, including earlier rows of this chunk
+                if (user_id, course_id) in enrolled:
                     raise ValueError(f"User {user_id} already enrolled in course {course_id}")
 
-                # Add to batch
-                enrollment_data = {
-                    "user_id": user_id,
-                    "course_id": course_id,
-                    "progress": progress,
-                    "completion_percentage": completion_percentage,
-                }
-                batch.append(enrollment_data)
-
-                # Insert batch when it reaches batch_size
-                if len(batch) >= batch_size:
-                    await self._bulk_insert_enrollments(batch)
-                    success_count += len(batch)
-                    batch = []
+                if gate is not None:
+                    missing = gate.missing(user_id, course_id)
+                    if missing:
+                        raise ValueError(describe_missing(user_id, course_id, missing))
+                    gate.record(user_id, course_id, data["completion_percentage"])
+
+                batch.append(data)
+                enrolled.add((user_id, course_id))
 
             except Exception as e:
-                error_count += 1
-                error_msg = f"Row {row_num}: {str(e)}"
-                error_messages.append(error_msg)
+                errors.append((row_num, str(e)))
 
-        # Insert remaining batch
         if batch:
             await self._bulk_insert_enrollments(batch)
-            success_count += len(batch)
+        return len(batch), errors, {data["user_id"] for data in batch}
 
-        return success_count, error_count, error_messages
+    async def _import_chunk_copy(
+        self, parsed: List[Tuple[int, Any]], gated: bool
+    ) -> Tuple[int, List[Tuple[int, str]], Set[int]]:
+        """
+        ``_import_chunk`` for PostgreSQL: COPY the chunk into a staging table,
+        find unknown users and courses and existing enrollments in one query,
+        and insert the rest with one ``INSERT ... SELECT``.
+
+        Repeats within the file and prerequisites are still checked in Python,
+        in row order, so the errors match the default engine's.  A row the
+        final insert skips because its user, course or enrollment changed in
+        the meantime is reported too: every row is either inserted or an error.
+        """
+
+        errors = {row_num: str(data) for row_num, data in parsed if isinstance(data, Exception)}
+        valid = {row_num: data for row_num, data in parsed if not isinstance(data, Exception)}
+        records = [
+            (row_num, data["user_id"], data["course_id"], data["progress"], data["completion_percentage"])
+            for row_num, data in valid.items()
+        ]
+        await copy_to_staging(self.session, _enrollment_staging, records)
+
+        rejects = await self.session.execute(_staged_enrollment_rejects())
+        for row_num, user_found, course_found in rejects.all():
+            data = valid.pop(row_num)
+            user_id, course_id = data["user_id"], data["course_id"]
+            if not user_found:
+                errors[row_num] = f"User {user_id} not found"
+            elif not course_found:
+                errors[row_num] = f"Course {course_id} not found"
+            else:
+                errors[row_num] = f"User {user_id} already enrolled in course {course_id}"
+
+        gate = None
+        if gated:
+            pairs = [(data["user_id"], data["course_id"]) for data in valid.values()]
+            gate = await PrerequisiteGate.load(self.session, pairs)
+        seen: Set[Tuple[int, int]] = set()
+        discarded = []
+        for row_num in sorted(valid):
+            data = valid[row_num]
+            user_id, course_id = data["user_id"], data["course_id"]
+            missing = gate.missing(user_id, course_id) if gate is not None else []
+            if (user_id, course_id) in seen:
+                errors[row_num] = f"User {user_id} already enrolled in course {course_id}"
+            elif missing:
+                errors[row_num] = describe_missing(user_id, course_id, missing)
+            else:
+                seen.add((user_id, course_id))
+                if gate is not None:
+                    gate.record(user_id, course_id, data["completion_percentage"])
+                continue
+            discarded.append(row_num)
+        await discard_staged(self.session, _enrollment_staging, discarded)
+
+        result = await self.session.execute(_staged_enrollment_insert())
+        inserted = {(user_id, course_id) for user_id, course_id in result.all()}
+        # Pairs are unique among the staged rows, so each maps back to its row
+        skipped = {
+            (data["user_id"], data["course_id"]): row_num
+            for row_num, data in valid.items()
+            if row_num not in errors and (data["user_id"], data["course_id"]) not in inserted
+        }
+        if skipped:
+            errors.update(await self._skipped_row_errors(skipped))
+        return len(inserted), sorted(errors.items()), {user_id for user_id, _ in inserted}
+
+    async def _skipped_row_errors(self, skipped: Dict[Tuple[int, int], int]) -> Dict[int, str]:
+        """
+        Why staged rows were left out of the guarded insert, by row number.
+        """
+
+        users = await self._existing_keys({user_id for user_id, _ in skipped}, User.id)
+        courses = await self._existing_keys({course_id for _, course_id in skipped}, Course.id)
+        errors = {}
+        for (user_id, course_id), row_num in skipped.items():
+            if user_id not in users:
+                errors[row_num] = f"User {user_id} not found"
+            elif course_id not in courses:
+                errors[row_num] = f"Course {course_id} not found"
+            else:
+                errors[row_num] = f"User {user_id} already enrolled in course {course_id}"
+        return errors
+
+    @staticmethod
+    def _parse_import_row(row: Union[dict, Exception]) -> dict:
+        if isinstance(row, Exception):
+            raise row
+        # Clean and validate data
+        return {
+            "user_id": int(row.get("user_id", "").strip()),
+            "course_id": int(row.get("course_id", "").strip()),
+            "progress": float(row.get("progress", "0.0").strip() or "0.0"),
+            "completion_percentage": float(row.get("completion_percentage", "0.0").strip() or "0.0"),
+        }
+
+    async def _existing_keys(self, keys: Set[Any], *columns: Any) -> Set[Any]:
+        """
+        The subset of ``keys`` present in ``columns`` (one column, or several
+        matched as tuples), checked ``_IMPORT_QUERY_CHUNK_SIZE`` keys per query.
+        """
+
+        target = columns[0] if len(columns) == 1 else tuple_(*columns)
+        found: Set[Any] = set()
+        ordered = sorted(keys)
+        for start in range(0, len(ordered), _IMPORT_QUERY_CHUNK_SIZE):
+            stmt = select(*columns).where(target.in_(ordered[start : start + _IMPORT_QUERY_CHUNK_SIZE]))
+            rows = (await self.session.execute(stmt)).all()
+            found.update(row[0] if len(columns) == 1 else tuple(row) for row in rows)
+        return found
 
     async def _bulk_insert_enrollments(self, batch: List[dict]) -> None:
         """Helper method to bulk insert enrollments."""
-        enrollments = [Enrollment(**data) for data in batch]
-        self.session.add_all(enrollments)
-        await self.session.commit()
+        await self.session.execute(insert(Enrollment), batch)
 
 
 
@@ -0,0 +1,99 @@
+"""
+Set-based prerequisite checks for enrollments.
+
+A ``PrerequisiteGate`` is loaded once for a whole request or import batch:
+one query for the direct prerequisites of every course involved and one for
+the learners' completed courses among them.  Each row is then checked in
+memory, and rows accepted earlier in the same batch count as completions for
+later ones.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.models.course import course_prerequisite
+from app.core.models.enrollment import Enrollment
+
+# IN-list size per query
+_QUERY_CHUNK_SIZE = 1000
+
+
+class PrerequisiteGate:
+    """
+    Prerequisite sets and completed-course sets for a batch of enrollments.
+    """
+
+    __slots__ = ("requirements", "completed", "threshold")
+
+    def __init__(
+        self,
+        requirements: Dict[int, Set[int]],
+        completed: Dict[int, Set[int]],
+        threshold: float,
+    ) -> None:
+        self.requirements = requirements
+        self.completed = completed
+        self.threshold = threshold
+
+    @classmethod
+    async def load(cls, session: AsyncSession, pairs: Iterable[Tuple[int, int]]) -> "PrerequisiteGate":
+        """
+        Load everything needed to check ``(user_id, course_id)`` pairs.
+        """
+
+        threshold = get_settings().course_completion_threshold
+        pairs = list(pairs)
+        course_ids = sorted({course_id for _, course_id in pairs})
+        requirements: Dict[int, Set[int]] = {}
+        edges = course_prerequisite.c
+        for chunk in _chunks(course_ids):
+            stmt = select(edges.course_id, edges.prereq_course_id).where(edges.course_id.in_(chunk))
+            for course_id, prereq_id in (await session.execute(stmt)).all():
+                requirements.setdefault(course_id, set()).add(prereq_id)
+
+        completed: Dict[int, Set[int]] = {}
+        needed = sorted(set().union(*requirements.values())) if requirements else []
+        # Only learners enrolling in a gated course need their history
+        user_ids = sorted({user_id for user_id, course_id in pairs if course_id in requirements})
+        if needed:
+            for chunk in _chunks(user_ids):
+                stmt = select(Enrollment.user_id, Enrollment.course_id).where(
+                    Enrollment.user_id.in_(chunk),
+                    Enrollment.course_id.in_(needed),
+                    Enrollment.completion_percentage >= threshold,
+                )
+                for user_id, course_id in (await session.execute(stmt)).all():
+                    completed.setdefault(user_id, set()).add(course_id)
+        return cls(requirements, completed, threshold)
+
+    def missing(self, user_id: int, course_id: int) -> List[int]:
+        """
+        Prerequisites of ``course_id`` that ``user_id`` has not completed.
+        """
+
+        required = self.requirements.get(course_id)
+        if not required:
+            return []
+        return sorted(required - self.completed.get(user_id, set()))
+
+    def record(self, user_id: int, course_id: int, completion_percentage: float) -> None:
+        """
+        Count an accepted enrollment as a completion for later rows.
+        """
+
+        if completion_percentage >= self.threshold:
+            self.completed.setdefault(user_id, set()).add(course_id)
+
+
+def describe_missing(user_id: int, course_id: int, missing: List[int]) -> str:
+    courses = ", ".join(map(str, missing))
+    return f"User {user_id} has not completed prerequisites of course {course_id}: {courses}"
+
+
+def _chunks(items: List[int]) -> Iterable[List[int]]:
+    for start in range(0, len(items), _QUERY_CHUNK_SIZE):
+        yield items[start : start + _QUERY_CHUNK_SIZE]
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import Principal
+from app.core.db.session import get_db_session
+from app.dependencies.auth import get_current_principal
+from app.schemas.import_job import ImportJobResponse
+from app.services.imports.import_service import ImportJobService, job_progress
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/{job_id}",
+    response_model=ImportJobResponse,
+    summary="Progress of a background import",
+)
+async def get_import_job(
+    job_id: int,
+    principal: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> ImportJobResponse:
+    job = await ImportJobService(session).get_job(job_id, principal)
+    return job_progress(job)
+
+
+@router.get(
+    "/{job_id}/errors",
+    summary="Download every rejected row of an import as CSV",
+)
+async def export_import_errors(
+    job_id: int,
+    principal: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> StreamingResponse:
+    service = ImportJobService(session)
+    await service.get_job(job_id, principal)
+    return StreamingResponse(
+        service.stream_errors_csv(job_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="import-{job_id}-errors.csv"'},
+    )
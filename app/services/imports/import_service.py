@@ -0,0 +1,220 @@
+import csv
+import io
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Any, AsyncGenerator, BinaryIO, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import Principal
+from app.core.common.base_service import BaseService
+from app.core.common.csv_stream import CsvPosition
+from app.core.config import get_settings
+from app.core.models.enums import ImportJobStatus, ImportKind, UserRole
+from app.core.models.import_job import ImportJob, ImportJobError
+from app.schemas.import_job import ImportJobAccepted, ImportJobResponse
+
+# Error report rows per streamed chunk
+_ERROR_REPORT_CHUNK = 1000
+
+
+class LeaseLost(Exception):
+    """
+    The job was taken over by another worker; the current batch must not commit.
+    """
+
+
+class ImportJobService(BaseService[ImportJob]):
+    """
+    Background CSV import jobs: queueing, progress and error reports.
+
+    The jobs themselves are run by ``app.services.imports.import_worker``.
+    """
+
+    model = ImportJob
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    async def submit(
+        self, kind: ImportKind, file: UploadFile, options: Dict[str, Any], principal: Principal
+    ) -> ImportJob:
+        """
+        Spool ``file`` to ``IMPORT_SPOOL_DIR`` and queue a job importing it.
+        """
+
+        spool_dir = get_settings().import_spool_dir
+        if not spool_dir:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Background imports are disabled: IMPORT_SPOOL_DIR is not set",
+            )
+        path, size = await run_in_threadpool(_spool, file.file, spool_dir)
+        try:
+            job = await self.create(
+                {
+                    "kind": kind,
+                    "status": ImportJobStatus.QUEUED,
+                    "created_by": principal.id,
+                    "options": options,
+                    "file_path": path,
+                    "file_size": size,
+                }
+            )
+        except BaseException:
+            os.remove(path)
+            raise
+        return job
+
+    async def get_job(self, job_id: int, principal: Principal) -> ImportJob:
+        job = await self.get_by_id(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found"
+            )
+        if principal.role is not UserRole.ADMIN and job.created_by != principal.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only admins and the job's creator can view an import job",
+            )
+        return job
+
+    async def stream_errors_csv(self, job_id: int) -> AsyncGenerator[str, None]:
+        """
+        Stream every rejected row of a job as ``row,message`` CSV, in row order.
+        """
+
+        yield "row,message\n"
+        stmt = (
+            select(ImportJobError.row_num, ImportJobError.message)
+            .where(ImportJobError.job_id == job_id)
+            .order_by(ImportJobError.row_num)
+            .execution_options(yield_per=_ERROR_REPORT_CHUNK)
+        )
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerows(rows)
+            yield buffer.getvalue()
+
+
+def _spool(source: BinaryIO, spool_dir: str) -> Tuple[str, int]:
+    os.makedirs(spool_dir, exist_ok=True)
+    path = os.path.join(spool_dir, f"{uuid.uuid4().hex}.csv")
+    source.seek(0)
+    with open(path, "wb") as target:
+        shutil.copyfileobj(source, target, get_settings().csv_read_chunk_size)
+        size = target.tell()
+    return path, size
+
+
+def require_background_for_parallel(parallel: bool, background: bool) -> None:
+    """Parallel parsing works on the spooled file of a background import."""
+    if parallel and not background:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="parallel=true requires background=true",
+        )
+
+
+def job_accepted(job: ImportJob) -> JSONResponse:
+    """
+    ``202 Accepted`` for a queued job, pointing at its status URL.
+    """
+
+    status_url = f"/imports/{job.id}"
+    body = ImportJobAccepted(job_id=job.id, status=job.status, status_url=status_url)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=body.dict(),
+        headers={"Location": status_url},
+    )
+
+
+def job_progress(job: ImportJob) -> ImportJobResponse:
+    """
+    Status of ``job`` with the throughput and ETA of its current attempt.
+
+    Rates are measured up to the last committed batch, so they do not decay
+    while a batch is in flight.
+    """
+
+    rows_per_second = eta_seconds = None
+    last = job.finished_at or job.heartbeat_at
+    if job.started_at is not None and last is not None:
+        elapsed = (last - job.started_at).total_seconds()
+        if elapsed > 0:
+            rows_per_second = (job.rows_processed - job.attempt_rows) / elapsed
+            bytes_per_second = (job.bytes_processed - job.attempt_bytes) / elapsed
+            if job.status is ImportJobStatus.RUNNING and bytes_per_second > 0:
+                eta_seconds = max(job.file_size - job.bytes_processed, 0) / bytes_per_second
+    if job.status is ImportJobStatus.SUCCEEDED:
+        eta_seconds = 0.0
+
+    return ImportJobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        file_size=job.file_size,
+        bytes_processed=job.bytes_processed,
+        rows_processed=job.rows_processed,
+        success_count=job.success_count,
+        error_count=job.error_count,
+        rows_per_second=rows_per_second,
+        eta_seconds=eta_seconds,
+        attempts=job.attempts,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        errors_url=f"/imports/{job.id}/errors",
+    )
+
+
+async def record_batch(
+    job_id: int,
+    attempt: int,
+    session: AsyncSession,
+    position: CsvPosition,
+    inserted: int,
+    errors: List[Tuple[int, str]],
+) -> None:
+    """
+    Save a batch's progress and errors in the batch's own transaction; with
+    the job bound, an ``ImportCheckpoint`` for the importers.
+
+    Raises ``LeaseLost`` if another worker has claimed the job since
+    ``attempt`` started, so the batch is rolled back instead of imported twice.
+    """
+
+    stmt = (
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.attempts == attempt)
+        .values(
+            bytes_processed=position.offset,
+            next_row=position.row_num,
+            rows_processed=ImportJob.rows_processed + inserted + len(errors),
+            success_count=ImportJob.success_count + inserted,
+            error_count=ImportJob.error_count + len(errors),
+            heartbeat_at=datetime.utcnow(),
+        )
+    )
+    if (await session.execute(stmt)).rowcount != 1:
+        raise LeaseLost(f"Import job {job_id} was taken over by another worker")
+    if errors:
+        rows = [
+            {"job_id": job_id, "row_num": row_num, "message": message} for row_num, message in errors
+        ]
+        await session.execute(insert(ImportJobError), rows)
+
+
+def resume_position(job: ImportJob) -> Optional[CsvPosition]:
+    if not job.bytes_processed:
+        return None
+    return CsvPosition(job.bytes_processed, job.next_row)
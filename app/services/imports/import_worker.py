@@ -0,0 +1,259 @@
+"""
+In-process worker for background CSV imports.
+
+Polls ``import_job`` for queued jobs (and running jobs whose heartbeat is
+older than ``IMPORT_JOB_LEASE``, left behind by a crashed worker), claims one
+with a conditional ``UPDATE`` so that several processes can share the queue,
+and runs it through the regular importers, saving progress with every batch.
+A job interrupted by shutdown is put back in the queue and resumes at its
+last committed batch, in whichever process claims it next: the spooled file
+must be on storage they all share.  A job whose file is missing is failed
+instead of claimed.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import ColumnElement, and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.common.copy_import import ImportEngine
+from app.core.config import get_settings
+from app.core.db.session import AsyncSessionLocal
+from app.core.models.enums import ImportJobStatus, ImportKind
+from app.core.models.import_job import ImportJob
+from app.services.enrollments.enrollment_service import EnrollmentService
+from app.services.imports.import_service import LeaseLost, record_batch, resume_position
+from app.services.lessons.lesson_service import LessonService
+
+logger = logging.getLogger(__name__)
+
+
+class ImportWorker:
+    """
+    Runs queued import jobs one at a time in a background task.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = 2.0,
+        lease: float = 300.0,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> None:
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+        self.completed = 0
+        self.failed = 0
+
+    # ---- Lifecycle ----------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="import-worker")
+
+    async def stop(self) -> None:
+        """
+        Stop the worker; a job in progress goes back to the queue.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """
+        Wake the worker now instead of at its next poll.
+        """
+
+        self._wake.set()
+
+    # ---- Jobs ---------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.claim()
+            except Exception as exc:
+                logger.warning("Import worker could not poll for jobs: %s", exc)
+                claimed = None
+            if claimed is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run_job(*claimed)
+
+    def _new_session(self) -> AsyncSession:
+        factory = self._session_factory or AsyncSessionLocal
+        return factory()
+
+    async def claim(self) -> Optional[Tuple[int, int]]:
+        """
+        Take the oldest claimable job.  Returns its id and attempt number.
+        """
+
+        now = datetime.utcnow()
+        claimable = or_(
+            ImportJob.status == ImportJobStatus.QUEUED,
+            and_(
+                ImportJob.status == ImportJobStatus.RUNNING,
+                ImportJob.heartbeat_at < now - timedelta(seconds=self.lease),
+            ),
+        )
+        async with self._new_session() as session:
+            while True:
+                stmt = (
+                    select(ImportJob.id, ImportJob.file_path)
+                    .where(claimable)
+                    .order_by(ImportJob.id)
+                    .limit(1)
+                )
+                row = (await session.execute(stmt)).first()
+                if row is None:
+                    return None
+                job_id, file_path = row
+                if await run_in_threadpool(os.path.isfile, file_path):
+                    break
+                await self._fail_missing_file(session, job_id, file_path, claimable)
+
+            # Re-checked in the UPDATE: of two workers racing, one gets no row
+            stmt = (
+                update(ImportJob)
+                .where(ImportJob.id == job_id, claimable)
+                .values(
+                    status=ImportJobStatus.RUNNING,
+                    attempts=ImportJob.attempts + 1,
+                    attempt_rows=ImportJob.rows_processed,
+                    attempt_bytes=ImportJob.bytes_processed,
+                    started_at=now,
+                    heartbeat_at=now,
+                )
+                .returning(ImportJob.attempts)
+            )
+            attempt = (await session.execute(stmt)).scalar_one_or_none()
+            await session.commit()
+        return None if attempt is None else (job_id, attempt)
+
+    async def _fail_missing_file(
+        self, session: AsyncSession, job_id: int, file_path: str, claimable: ColumnElement[bool]
+    ) -> None:
+        # Another attempt cannot bring the upload back: fail the job for good
+        error = f"Spooled upload {file_path} is missing; IMPORT_SPOOL_DIR must be shared by every app host"
+        stmt = (
+            update(ImportJob)
+            .where(ImportJob.id == job_id, claimable)
+            .values(status=ImportJobStatus.FAILED, error=error, finished_at=datetime.utcnow())
+        )
+        failed = (await session.execute(stmt)).rowcount == 1
+        await session.commit()
+        if failed:
+            logger.error("Import job %s failed: %s", job_id, error)
+            self.failed += 1
+
+    async def run_job(self, job_id: int, attempt: int) -> None:
+        """
+        Import a claimed job from where it stopped, then record the outcome.
+        """
+
+        outcome, error = ImportJobStatus.SUCCEEDED, None
+        async with self._new_session() as session:
+            job = await session.get(ImportJob, job_id)
+            if job is None:
+                return
+            options = dict(job.options)
+            importer_args = dict(
+                batch_size=options.get("batch_size", 1000),
+                engine=ImportEngine(options.get("engine", ImportEngine.ORM)),
+                start=resume_position(job),
+                checkpoint=partial(record_batch, job_id, attempt),
+                parallel=options.get("parallel", False),
+            )
+            upload = None
+            try:
+                spooled = open(job.file_path, "rb")
+                upload = UploadFile(file=spooled, filename=os.path.basename(job.file_path))
+                if job.kind is ImportKind.ENROLLMENTS:
+                    await EnrollmentService(session).import_enrollments_csv(
+                        upload,
+                        override_prerequisites=options.get("override_prerequisites", False),
+                        **importer_args,
+                    )
+                else:
+                    await LessonService(session).import_lessons_csv(upload, **importer_args)
+            except asyncio.CancelledError:
+                await session.rollback()
+                await self._finish(job_id, attempt, ImportJobStatus.QUEUED)
+                raise
+            except LeaseLost as exc:
+                await session.rollback()
+                logger.warning("%s; abandoning attempt %d", exc, attempt)
+                return
+            except Exception as exc:
+                await session.rollback()
+                logger.exception("Import job %s failed", job_id)
+                # HTTPException (e.g. an oversized CSV record) carries its message in detail
+                error = getattr(exc, "detail", None) or str(exc) or type(exc).__name__
+                outcome = ImportJobStatus.FAILED
+            finally:
+                if upload is not None:
+                    await upload.close()
+
+        if await self._finish(job_id, attempt, outcome, error):
+            if outcome is ImportJobStatus.SUCCEEDED:
+                self.completed += 1
+            else:
+                self.failed += 1
+            try:
+                os.remove(job.file_path)
+            except OSError:
+                pass
+
+    async def _finish(
+        self, job_id: int, attempt: int, status: ImportJobStatus, error: Optional[str] = None
+    ) -> bool:
+        values = {"status": status, "error": error}
+        if status is not ImportJobStatus.QUEUED:
+            values["finished_at"] = datetime.utcnow()
+        async with self._new_session() as session:
+            stmt = (
+                update(ImportJob)
+                .where(ImportJob.id == job_id, ImportJob.attempts == attempt)
+                .values(**values)
+            )
+            finished = (await session.execute(stmt)).rowcount == 1
+            await session.commit()
+        return finished
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self.running, "completed": self.completed, "failed": self.failed}
+
+
+def _build_worker() -> ImportWorker:
+    settings = get_settings()
+    return ImportWorker(
+        poll_interval=settings.import_poll_interval,
+        lease=settings.import_job_lease,
+    )
+
+
+import_worker = _build_worker()
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import Principal
+from app.core.config import get_settings
+from app.core.db.session import get_db_session
+from app.core.models.enums import UserRole
+from app.dependencies.auth import get_current_principal
+from app.dependencies.decorators import role_required
+from app.schemas.learning_path import (
+    LearningPathBatchRequest,
+    LearningPathBatchResponse,
+    LearningPathResponse,
+)
+from app.services.learning_paths.learning_path_service import LearningPathService
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/{user_id}/learning-path/{course_id}",
+    response_model=LearningPathResponse,
+    summary="Courses a learner still has to take to reach a course",
+)
+async def get_learning_path(
+    user_id: int,
+    course_id: int,
+    principal: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_db_session),
+) -> LearningPathResponse:
+    """
+    Returns the remaining prerequisites of the course plus the course itself,
+    prerequisites first.  Courses the learner has completed, and anything only
+    needed through them, are left out; an empty list means the course is done.
+    Learners may only see their own path.
+    """
+    if principal.id != user_id and principal.role not in (UserRole.ADMIN, UserRole.INSTRUCTOR):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+    service = LearningPathService(session)
+    course_ids = await service.learning_path(user_id, course_id)
+    return LearningPathResponse(user_id=user_id, course_id=course_id, course_ids=course_ids)
+
+
+@router.post(
+    "/learning-paths",
+    response_model=LearningPathBatchResponse,
+    summary="Learning paths to one course for many learners",
+)
+async def get_learning_paths(
+    payload: LearningPathBatchRequest,
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> LearningPathBatchResponse:
+    max_users = get_settings().learning_path_batch_max_users
+    if len(payload.user_ids) > max_users:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {max_users} users are accepted per request",
+        )
+    service = LearningPathService(session)
+    paths, unknown = await service.learning_paths(payload.user_ids, payload.course_id)
+    return LearningPathBatchResponse(
+        course_id=payload.course_id,
+        paths=[
+            LearningPathResponse(user_id=user_id, course_id=payload.course_id, course_ids=course_ids)
+            for user_id, course_ids in paths.items()
+        ],
+        unknown_user_ids=unknown,
+    )
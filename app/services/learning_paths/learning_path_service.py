@@ -0,0 +1,163 @@
+"""
+Learning-path planning over the course prerequisite graph.
+
+A learning path is the smallest set of courses a learner still has to take
+before (and including) a target course, in an order that respects
+prerequisites.  Completed courses are skipped together with everything that
+is only needed through them.  The prerequisite subgraph of the targets is
+loaded in one query via the closure table and shared by every learner in a
+request.
+
+Paths are cached per user and target under the catalog counter and the
+learner's progress counter (see ``learning_path_versions``), which writes
+bump in their own transaction, so no worker serves a path from before a
+committed change.  The counters are read before the progress, so an entry is
+never older than its key.  Both are read with the session given, which must
+be on the primary: a lagging replica could pair a new counter with old
+progress.
+"""
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Sequence, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.common.cache import learning_path_cache
+from app.core.common.catalog_version import learning_path_versions
+from app.core.config import get_settings
+from app.core.models.course import Course, course_prerequisite, course_prerequisite_closure
+from app.core.models.enrollment import Enrollment
+from app.core.models.user import User
+from app.services.courses.prerequisite_closure import topological_order
+
+# IN-list size for per-user queries in batch requests
+_QUERY_CHUNK_SIZE = 1000
+
+
+def plan_path(prereqs: Mapping[int, Sequence[int]], target: int, completed: Iterable[int]) -> List[int]:
+    """
+    Courses to take for ``target`` given ``completed`` ones, prerequisites first.
+
+    ``prereqs`` maps each course to its direct prerequisites.  Ordered by
+    ``topological_order``, so ties are broken by course id and the target
+    comes last.
+    """
+
+    done = set(completed)
+    if target in done:
+        return []
+
+    needed = {target}
+    stack = [target]
+    while stack:
+        for prereq in prereqs.get(stack.pop(), ()):
+            if prereq not in done and prereq not in needed:
+                needed.add(prereq)
+                stack.append(prereq)
+    return topological_order(((node, prereq) for node in needed for prereq in prereqs.get(node, ())), needed)
+
+
+class LearningPathService:
+    """
+    Computes and caches learning paths for one or many learners.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.threshold = get_settings().course_completion_threshold
+
+    async def learning_path(self, user_id: int, course_id: int) -> List[int]:
+        if await self.session.get(User, user_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        paths, _ = await self.learning_paths([user_id], course_id)
+        return paths[user_id]
+
+    async def learning_paths(
+        self, user_ids: Sequence[int], course_id: int
+    ) -> Tuple[Dict[int, List[int]], List[int]]:
+        """
+        Paths to ``course_id`` for many users at once.
+
+        Returns the path per known user and the ids that do not exist.  Costs
+        one counter query per 1000 users, plus one subgraph query and two
+        queries per 1000 uncached users.
+        """
+
+        if await self.session.get(Course, course_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
+
+        requested = list(dict.fromkeys(user_ids))
+        versions: Dict[int, Tuple[int, int]] = {}
+        for start in range(0, len(requested), _QUERY_CHUNK_SIZE):
+            chunk = requested[start : start + _QUERY_CHUNK_SIZE]
+            versions.update(await learning_path_versions(self.session, chunk))
+
+        paths: Dict[int, List[int]] = {}
+        pending: List[int] = []
+        for user_id in requested:
+            cached = learning_path_cache.get((user_id, *versions[user_id]), {}).get(course_id)
+            if cached is None:
+                pending.append(user_id)
+            else:
+                paths[user_id] = list(cached)
+        if not pending:
+            return paths, []
+
+        prereqs, nodes = await self._load_subgraph([course_id])
+
+        existing, completed = await self._load_progress(pending)
+        # Learners with the same completed courses inside the subgraph share a path
+        planned: Dict[FrozenSet[int], Tuple[int, ...]] = {}
+        for user_id in pending:
+            if user_id not in existing:
+                continue
+            key = frozenset(completed.get(user_id, set()) & nodes)
+            path = planned.get(key)
+            if path is None:
+                path = planned[key] = tuple(plan_path(prereqs, course_id, key))
+            self._remember((user_id, *versions[user_id]), course_id, path)
+            paths[user_id] = list(path)
+
+        unknown = [user_id for user_id in pending if user_id not in existing]
+        ordered = {user_id: paths[user_id] for user_id in requested if user_id in paths}
+        return ordered, unknown
+
+    async def _load_subgraph(self, targets: Sequence[int]) -> Tuple[Dict[int, List[int]], Set[int]]:
+        # The prerequisite edges above ``targets`` and every course they touch
+        edges = course_prerequisite.c
+        closure = course_prerequisite_closure.c
+        ancestors = select(closure.ancestor_id).where(closure.descendant_id.in_(targets))
+        stmt = select(edges.course_id, edges.prereq_course_id).where(
+            or_(edges.course_id.in_(targets), edges.course_id.in_(ancestors))
+        )
+        prereqs: Dict[int, List[int]] = {}
+        nodes = set(targets)
+        for course_id, prereq_id in (await self.session.execute(stmt)).all():
+            prereqs.setdefault(course_id, []).append(prereq_id)
+            nodes.update((course_id, prereq_id))
+        return prereqs, nodes
+
+    async def _load_progress(self, user_ids: List[int]) -> Tuple[Set[int], Dict[int, Set[int]]]:
+        existing: Set[int] = set()
+        completed: Dict[int, Set[int]] = {}
+        for start in range(0, len(user_ids), _QUERY_CHUNK_SIZE):
+            chunk = user_ids[start : start + _QUERY_CHUNK_SIZE]
+            found = await self.session.execute(select(User.id).where(User.id.in_(chunk)))
+            existing.update(found.scalars())
+            stmt = select(Enrollment.user_id, Enrollment.course_id).where(
+                Enrollment.user_id.in_(chunk),
+                Enrollment.completion_percentage >= self.threshold,
+            )
+            for user_id, course_id in (await self.session.execute(stmt)).all():
+                completed.setdefault(user_id, set()).add(course_id)
+        return existing, completed
+
+    @staticmethod
+    def _remember(key: Tuple[int, int, int], course_id: int, path: Tuple[int, ...]) -> None:
+        entry = learning_path_cache.get(key)
+        if entry is None:
+            learning_path_cache.set(key, {course_id: path})
+        else:
+            entry[course_id] = path
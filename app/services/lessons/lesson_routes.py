@@ -1,15 +1,32 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, File, UploadFile, status
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db.session import get_db_session
-from app.core.models.enums import UserRole
+from app.core.auth import Principal
+from app.core.common.catalog_version import not_modified
+from app.core.common.copy_import import ImportEngine
+from app.core.common.pagination import set_next_cursor
+from app.core.config import get_settings
+from app.core.db.session import get_db_session, get_read_session
+from app.core.models.enums import ImportKind, UserRole
 from app.core.models.user import User
-from app.dependencies.auth import get_current_user
-from app.dependencies.decorators import role_required, validate_csv_headers
+from app.dependencies.auth import get_current_principal, get_current_user
+from app.dependencies.decorators import (
+    BulkPayload,
+    parse_bulk_payload,
+    role_required,
+    validate_csv_headers,
+)
+from app.schemas.bulk import BulkResult
 from app.schemas.lesson import LessonCreate, LessonResponse, LessonUpdate
+from app.services.imports.import_service import (
+    ImportJobService,
+    job_accepted,
+    require_background_for_parallel,
+)
+from app.services.imports.import_worker import import_worker
 from app.services.lessons.lesson_service import LessonService
 
 
@@ -39,11 +56,19 @@ async def create_lesson(
 )
 async def list_lessons_by_module(
     module_id: int,
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[LessonResponse]:
+    unchanged = await not_modified(request, response, session, module_id=module_id)
+    if unchanged is not None:
+        return unchanged
     service = LessonService(session)
-    lessons = await service.list_by_module(module_id)
+    lessons, next_cursor = await service.list_by_module_page(module_id, cursor=cursor, limit=limit)
+    set_next_cursor(response, next_cursor)
     return [LessonResponse.from_orm(l) for l in lessons]
 
 
@@ -54,17 +79,33 @@ async def list_lessons_by_module(
 )
 async def import_lessons_csv(
     file: UploadFile = Depends(validate_csv_headers(["module_id", "name", "content_type"])),
-    current_user: User = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    current_user: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
     session: AsyncSession = Depends(get_db_session),
     batch_size: int = 1000,
+    engine: ImportEngine = Query(
+        ImportEngine.ORM, description="copy: stage each batch with COPY (PostgreSQL only)"
+    ),
+    background: bool = Query(
+        False, description="Queue the import and return 202 with a job to poll at /imports/{id}"
+    ),
+    parallel: bool = Query(
+        False, description="With background: parse the file in worker processes"
+    ),
 ) -> JSONResponse:
     """
     Import lessons from CSV file.
     CSV format: module_id,name,content_type
     """
+    require_background_for_parallel(parallel, background)
+    if background:
+        options = {"batch_size": batch_size, "engine": engine.value, "parallel": parallel}
+        job = await ImportJobService(session).submit(ImportKind.LESSONS, file, options, current_user)
+        import_worker.notify()
+        return job_accepted(job)
+
     service = LessonService(session)
     success_count, error_count, error_messages = await service.import_lessons_csv(
-        file, batch_size=batch_size
+        file, batch_size=batch_size, engine=engine
     )
 
     return JSONResponse(
@@ -78,4 +119,56 @@ async def import_lessons_csv(
     )
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    summary="Create lessons in bulk",
+)
+async def bulk_create_lessons(
+    payload: BulkPayload = Depends(parse_bulk_payload(LessonCreate)),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Create lessons from a JSON array or NDJSON body (up to BULK_MAX_ITEMS).
+    Invalid items are reported by index; the valid ones are still created.
+    """
+    service = LessonService(session)
+    ids, errors = await service.bulk_create(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResult,
+    summary="Update lessons in bulk",
+)
+async def bulk_update_lessons(
+    payload: BulkPayload = Depends(parse_bulk_payload(LessonUpdate, require_id=True)),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Partially update lessons; each item carries an id plus the fields to change.
+    """
+    service = LessonService(session)
+    ids, errors = await service.bulk_update(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
+
 
+@router.post(
+    "/bulk/delete",
+    response_model=BulkResult,
+    summary="Delete lessons in bulk",
+)
+async def bulk_delete_lessons(
+    payload: BulkPayload = Depends(parse_bulk_payload()),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Delete lessons by id; the body lists the ids to delete.
+    """
+    service = LessonService(session)
+    ids, errors = await service.bulk_delete(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
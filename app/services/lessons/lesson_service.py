@@ -1,15 +1,60 @@
-import csv
-import io
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Set, Tuple, Union
 
 from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import Column, Integer, MetaData, String, Table, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Insert, Select
 
-from app.core.common.base_service import BaseService
+from app.core.common.base_service import BULK_CHUNK_SIZE, BaseService, BulkErrors, BulkItems
+from app.core.common.catalog_version import touch_courses
+from app.core.common.copy_import import ImportEngine, copy_supported, copy_to_staging
+from app.core.common.csv_stream import CsvPosition, ImportCheckpoint, ParsedRows
+from app.core.common.parallel_csv import ParseColumns, parsed_batches
 from app.core.models.lesson import Lesson
 from app.core.models.module import Module
 from app.core.models.user import User
 from app.schemas.lesson import LessonCreate, LessonUpdate
+from app.services.modules.module_service import course_ids_of_modules
+
+# Typed columns of a parsed import row, as packed by parallel parsing
+_IMPORT_COLUMNS: ParseColumns = {"module_id": "q", "name": None, "content_type": None}
+
+# Per-transaction staging table of ImportEngine.COPY imports
+_lesson_staging = Table(
+    "lesson_import_staging",
+    MetaData(),
+    Column("row_num", Integer, primary_key=True),
+    Column("module_id", Integer, nullable=False),
+    Column("name", String(255), nullable=False),
+    Column("content_type", String(50), nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def _staged_lesson_rejects() -> Select:
+    """
+    Staged rows whose module does not exist.
+    """
+
+    staged = _lesson_staging.c
+    return (
+        select(staged.row_num, staged.module_id)
+        .select_from(_lesson_staging)
+        .outerjoin(Module, Module.id == staged.module_id)
+        .where(Module.id.is_(None))
+    )
+
+
+def _staged_lesson_insert() -> Insert:
+    staged = _lesson_staging.c
+    rows = (
+        select(staged.module_id, staged.name, staged.content_type)
+        .select_from(_lesson_staging)
+        .join(Module, Module.id == staged.module_id)
+        .order_by(staged.row_num)
+    )
+    return insert(Lesson).from_select(["module_id", "name", "content_type"], rows)
 
 
 class LessonService(BaseService[Lesson]):
@@ -18,16 +63,23 @@ class LessonService(BaseService[Lesson]):
     """
 
     model = Lesson
+    use_returning = True
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
     async def create_lesson(self, payload: LessonCreate, _current_user: User) -> Lesson:
+        touch_courses(self.session, await course_ids_of_modules(self.session, [payload.module_id]))
         return await self.create(payload.dict())
 
     async def list_by_module(self, module_id: int) -> List[Lesson]:
         return await self.list(filters={"module_id": module_id})
 
+    async def list_by_module_page(
+        self, module_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Lesson], Optional[str]]:
+        return await self.list_page(filters={"module_id": module_id}, cursor=cursor, limit=limit)
+
     async def get_lesson(self, lesson_id: int) -> Lesson:
         lesson = await self.get_by_id(lesson_id)
         if not lesson:
@@ -36,17 +88,31 @@ class LessonService(BaseService[Lesson]):
 
 
     async def update_lesson(self, lesson_id: int, payload: LessonUpdate) -> Lesson:
-        lesson = await self.get_lesson(lesson_id)
-        return await self.update(lesson, payload.dict(exclude_unset=True))
+        touch_courses(self.session, await course_ids_of_lessons(self.session, [lesson_id]))
+        lesson = await self.update_by_id(lesson_id, payload.dict(exclude_unset=True))
+        if not lesson:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+        return lesson
 
     async def import_lessons_csv(
-        self, file: UploadFile, batch_size: int = 1000
+        self,
+        file: UploadFile,
+        batch_size: int = 1000,
+        engine: ImportEngine = ImportEngine.ORM,
+        start: Optional[CsvPosition] = None,
+        checkpoint: Optional[ImportCheckpoint] = None,
+        parallel: bool = False,
     ) -> Tuple[int, int, List[str]]:
         """
-        Import lessons from CSV file using async file reading and batch inserts.
+        Import lessons from CSV file, streamed in chunks, using batch inserts.
         
         Expected CSV format:
         module_id,name,content_type
+
+        ``ImportEngine.COPY`` stages each batch with COPY on PostgreSQL (see
+        ``_import_chunk_copy``).  Batches commit one at a time; ``start``,
+        ``checkpoint`` and ``parallel`` work as for
+        ``EnrollmentService.import_enrollments_csv``.
         
         Returns:
             Tuple of (success_count, error_count, error_messages)
@@ -54,61 +120,145 @@ class LessonService(BaseService[Lesson]):
         success_count = 0
         error_count = 0
         error_messages = []
-        batch = []
 
-        # Read file asynchronously
-        content = await file.read()
-        text_content = content.decode("utf-8")
-        reader = csv.DictReader(io.StringIO(text_content))
+        use_copy = engine is ImportEngine.COPY and copy_supported(self.session)
+        # The upload is streamed; only one chunk of rows is held at a time
+        batches = parsed_batches(
+            file, batch_size, self._parse_import_row, _IMPORT_COLUMNS, start, parallel
+        )
+        async for parsed, position in batches:
+            if use_copy:
+                inserted, errors = await self._import_chunk_copy(parsed)
+            else:
+                inserted, errors = await self._import_chunk(parsed)
+            if checkpoint is not None:
+                await checkpoint(self.session, position, inserted, errors)
+            await self.session.commit()
 
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
-            try:
-                # Clean and validate data
-                module_id = int(row.get("module_id", "").strip())
-                name = row.get("name", "").strip()
-                content_type = row.get("content_type", "").strip()
+            success_count += inserted
+            error_count += len(errors)
+            if checkpoint is None:
+                error_messages.extend(f"Row {row_num}: {message}" for row_num, message in errors)
 
-                if not name:
-                    raise ValueError("Lesson name is required")
-                if not content_type:
-                    raise ValueError("Content type is required")
+        return success_count, error_count, error_messages
+
+    async def _import_chunk(self, parsed: ParsedRows) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Validate a parsed chunk row by row and insert the valid lessons,
+        without committing.  Returns the number inserted and
+        ``(row_num, message)`` errors.
+        """
+
+        batch = []
+        errors = []
+        for row_num, lesson_data in parsed:
+            try:
+                if isinstance(lesson_data, Exception):
+                    raise lesson_data
 
                 # Validate module exists
+                module_id = lesson_data["module_id"]
                 module = await self.session.get(Module, module_id)
                 if not module:
                     raise ValueError(f"Module {module_id} not found")
 
                 # Add to batch
-                lesson_data = {
-                    "module_id": module_id,
-                    "name": name,
-                    "content_type": content_type,
-                }
                 batch.append(lesson_data)
-
-                # Insert batch when it reaches batch_size
-                if len(batch) >= batch_size:
-                    await self._bulk_insert_lessons(batch)
-                    success_count += len(batch)
-                    batch = []
+                touch_courses(self.session, [module.course_id])
 
             except Exception as e:
-                error_count += 1
-                error_msg = f"Row {row_num}: {str(e)}"
-                error_messages.append(error_msg)
+                errors.append((row_num, str(e)))
 
-        # Insert remaining batch
         if batch:
             await self._bulk_insert_lessons(batch)
-            success_count += len(batch)
+        return len(batch), errors
 
-        return success_count, error_count, error_messages
+    async def _import_chunk_copy(self, parsed: ParsedRows) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        ``_import_chunk`` for PostgreSQL: the chunk is COPYed into a staging
+        table, rows with an unknown module are found with one query and the
+        rest are written with one ``INSERT ... SELECT``.  If a module is
+        deleted in between, the rows the insert skipped are reported too.
+        """
+
+        errors = {}
+        records = []
+        for row_num, data in parsed:
+            if isinstance(data, Exception):
+                errors[row_num] = str(data)
+            else:
+                records.append((row_num, data["module_id"], data["name"], data["content_type"]))
+        invalid = set(errors)
+        await copy_to_staging(self.session, _lesson_staging, records)
+
+        rejects = await self.session.execute(_staged_lesson_rejects())
+        for row_num, module_id in rejects.all():
+            errors[row_num] = f"Module {module_id} not found"
+        module_ids = {module_id for _, module_id, _, _ in records}
+        touch_courses(self.session, await course_ids_of_modules(self.session, module_ids))
+        inserted = (await self.session.execute(_staged_lesson_insert())).rowcount
+        if inserted < len(records) - len(errors.keys() - invalid):
+            # The insert's join dropped rows whose module went away since the check
+            rejects = await self.session.execute(_staged_lesson_rejects())
+            for row_num, module_id in rejects.all():
+                errors.setdefault(row_num, f"Module {module_id} not found")
+        return inserted, sorted(errors.items())
+
+    @staticmethod
+    def _parse_import_row(row: Union[dict, Exception]) -> dict:
+        if isinstance(row, Exception):
+            raise row
+        # Clean and validate data
+        module_id = int(row.get("module_id", "").strip())
+        name = row.get("name", "").strip()
+        content_type = row.get("content_type", "").strip()
+
+        if not name:
+            raise ValueError("Lesson name is required")
+        if not content_type:
+            raise ValueError("Content type is required")
+        return {"module_id": module_id, "name": name, "content_type": content_type}
 
     async def _bulk_insert_lessons(self, batch: List[dict]) -> None:
         """Helper method to bulk insert lessons."""
-        lessons = [Lesson(**data) for data in batch]
-        self.session.add_all(lessons)
-        await self.session.commit()
+        await self.session.execute(insert(Lesson), batch)
+
+    # Bulk writes also bump the version of every course they touch
+
+    async def bulk_create(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        module_ids = {data["module_id"] for _, data in items}
+        touch_courses(self.session, await course_ids_of_modules(self.session, module_ids))
+        return await super().bulk_create(items, chunk_size)
 
+    async def bulk_update(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        course_ids = await course_ids_of_lessons(self.session, (data["id"] for _, data in items))
+        touch_courses(self.session, course_ids)
+        return await super().bulk_update(items, chunk_size)
 
+    async def bulk_delete(
+        self, items: List[Tuple[int, int]], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        course_ids = await course_ids_of_lessons(self.session, (id_ for _, id_ in items))
+        touch_courses(self.session, course_ids)
+        return await super().bulk_delete(items, chunk_size)
+
+
+async def course_ids_of_lessons(session: AsyncSession, lesson_ids: Iterable[int]) -> Set[int]:
+    """
+    Courses owning any of ``lesson_ids`` (unknown ids are ignored).
+    """
 
+    ids = set(lesson_ids)
+    if not ids:
+        return set()
+    stmt = (
+        select(Module.course_id)
+        .join(Lesson, Lesson.module_id == Module.id)
+        .where(Lesson.id.in_(ids))
+        .distinct()
+    )
+    return set((await session.execute(stmt)).scalars().all())
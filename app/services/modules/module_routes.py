@@ -1,11 +1,18 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db.session import get_db_session
+from app.core.auth import Principal
+from app.core.common.catalog_version import not_modified
+from app.core.common.pagination import set_next_cursor
+from app.core.config import get_settings
+from app.core.db.session import get_db_session, get_read_session
+from app.core.models.enums import UserRole
 from app.core.models.user import User
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_principal, get_current_user
+from app.dependencies.decorators import BulkPayload, parse_bulk_payload, role_required
+from app.schemas.bulk import BulkResult
 from app.schemas.module import ModuleCreate, ModuleResponse, ModuleUpdate
 from app.services.modules.module_service import ModuleService
 
@@ -36,12 +43,72 @@ async def create_module(
 )
 async def list_modules_by_course(
     course_id: int,
-    _: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db_session),
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
 ) -> List[ModuleResponse]:
+    unchanged = await not_modified(request, response, session, course_id=course_id)
+    if unchanged is not None:
+        return unchanged
     service = ModuleService(session)
-    modules = await service.list_by_course(course_id)
+    modules, next_cursor = await service.list_by_course_page(course_id, cursor=cursor, limit=limit)
+    set_next_cursor(response, next_cursor)
     return [ModuleResponse.from_orm(m) for m in modules]
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkResult,
+    summary="Create modules in bulk",
+)
+async def bulk_create_modules(
+    payload: BulkPayload = Depends(parse_bulk_payload(ModuleCreate)),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Create modules from a JSON array or NDJSON body (up to BULK_MAX_ITEMS).
+    Invalid items are reported by index; the valid ones are still created.
+    """
+    service = ModuleService(session)
+    ids, errors = await service.bulk_create(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
+
 
+@router.patch(
+    "/bulk",
+    response_model=BulkResult,
+    summary="Update modules in bulk",
+)
+async def bulk_update_modules(
+    payload: BulkPayload = Depends(parse_bulk_payload(ModuleUpdate, require_id=True)),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Partially update modules; each item carries an id plus the fields to change.
+    """
+    service = ModuleService(session)
+    ids, errors = await service.bulk_update(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
+
+
+@router.post(
+    "/bulk/delete",
+    response_model=BulkResult,
+    summary="Delete modules in bulk",
+)
+async def bulk_delete_modules(
+    payload: BulkPayload = Depends(parse_bulk_payload()),
+    _: Principal = Depends(role_required([UserRole.ADMIN, UserRole.INSTRUCTOR])),
+    session: AsyncSession = Depends(get_db_session),
+) -> BulkResult:
+    """
+    Delete modules by id; the body lists the ids to delete.
+    """
+    service = ModuleService(session)
+    ids, errors = await service.bulk_delete(payload.items, chunk_size=get_settings().bulk_chunk_size)
+    return BulkResult.from_parts(ids, payload.errors, errors)
@@ -1,9 +1,11 @@
-from typing import List
+from typing import Iterable, List, Optional, Set, Tuple
 
 from fastapi import HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.common.base_service import BaseService
+from app.core.common.base_service import BULK_CHUNK_SIZE, BaseService, BulkErrors, BulkItems
+from app.core.common.catalog_version import touch_courses
 from app.core.models.module import Module
 from app.core.models.user import User
 from app.schemas.module import ModuleCreate, ModuleUpdate
@@ -15,16 +17,23 @@ class ModuleService(BaseService[Module]):
     """
 
     model = Module
+    use_returning = True
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
     async def create_module(self, payload: ModuleCreate, _current_user: User) -> Module:
+        touch_courses(self.session, [payload.course_id])
         return await self.create(payload.dict())
 
     async def list_by_course(self, course_id: int) -> List[Module]:
         return await self.list(filters={"course_id": course_id})
 
+    async def list_by_course_page(
+        self, course_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Module], Optional[str]]:
+        return await self.list_page(filters={"course_id": course_id}, cursor=cursor, limit=limit)
+
     async def get_module(self, module_id: int) -> Module:
         module = await self.get_by_id(module_id)
         if not module:
@@ -32,8 +41,42 @@ class ModuleService(BaseService[Module]):
         return module
 
     async def update_module(self, module_id: int, payload: ModuleUpdate) -> Module:
-        module = await self.get_module(module_id)
-        return await self.update(module, payload.dict(exclude_unset=True))
+        touch_courses(self.session, await course_ids_of_modules(self.session, [module_id]))
+        module = await self.update_by_id(module_id, payload.dict(exclude_unset=True))
+        if not module:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found")
+        return module
+
+    # Bulk writes also bump the version of every course they touch
 
+    async def bulk_create(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        touch_courses(self.session, {data["course_id"] for _, data in items})
+        return await super().bulk_create(items, chunk_size)
 
+    async def bulk_update(
+        self, items: BulkItems, chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        course_ids = await course_ids_of_modules(self.session, (data["id"] for _, data in items))
+        touch_courses(self.session, course_ids)
+        return await super().bulk_update(items, chunk_size)
+
+    async def bulk_delete(
+        self, items: List[Tuple[int, int]], chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Tuple[List[int], BulkErrors]:
+        course_ids = await course_ids_of_modules(self.session, (id_ for _, id_ in items))
+        touch_courses(self.session, course_ids)
+        return await super().bulk_delete(items, chunk_size)
+
+
+async def course_ids_of_modules(session: AsyncSession, module_ids: Iterable[int]) -> Set[int]:
+    """
+    Courses owning any of ``module_ids`` (unknown ids are ignored).
+    """
 
+    ids = set(module_ids)
+    if not ids:
+        return set()
+    stmt = select(Module.course_id).where(Module.id.in_(ids)).distinct()
+    return set((await session.execute(stmt)).scalars().all())
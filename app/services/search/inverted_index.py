@@ -0,0 +1,224 @@
+"""
+In-process inverted index for catalog search on non-PostgreSQL backends.
+
+Mirrors the PostgreSQL search closely enough for SQLite and tests: text is
+split into lowercase word tokens (English stop words and plural ``s``
+dropped), each field carries the same A/B/C weights as the ``tsvector``
+triggers, a query matches documents containing every term, and rank is the
+sum of the matched weights.  The index is rebuilt from the source tables when
+older than its TTL or after any ORM write to a course, module or lesson.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import heapq
+import re
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Field weights, matching PostgreSQL's default ts_rank weights for A, B and C
+WEIGHT_A = 1.0
+WEIGHT_B = 0.4
+WEIGHT_C = 0.2
+
+_TOKEN = re.compile(r"[^\W_]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or that the "
+    "their this to was were will with".split()
+)
+
+# (kind, source_id, course_id, title, body, [(text, weight), ...])
+IndexDocument = Tuple[str, int, int, str, str, Sequence[Tuple[str, float]]]
+# (rank, kind, source_id, course_id, title, body)
+IndexHit = Tuple[float, str, int, int, str, str]
+# (rank, kind, source_id) of the last hit on the previous page
+IndexPosition = Tuple[float, str, int]
+
+
+def normalize(token: str) -> str:
+    token = token.lower()
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Normalized search terms of ``text``, in order, stop words removed.
+    """
+
+    terms = []
+    for match in _TOKEN.finditer(text or ""):
+        word = match.group().lower()
+        if len(word) > 1 and word not in _STOPWORDS:
+            terms.append(normalize(word))
+    return terms
+
+
+def highlight(text: str, terms: Iterable[str], start: str = "<mark>", stop: str = "</mark>") -> str:
+    """
+    Wrap every word of ``text`` whose normalized form is in ``terms``.
+    """
+
+    wanted = set(terms)
+    return _TOKEN.sub(
+        lambda m: f"{start}{m.group()}{stop}" if normalize(m.group()) in wanted else m.group(),
+        text or "",
+    )
+
+
+def snippet(text: str, terms: Iterable[str], words: int = 30) -> Optional[str]:
+    """
+    Up to ``words`` words of ``text`` around the first match, highlighted.
+    """
+
+    if not text:
+        return None
+    wanted = set(terms)
+    tokens = text.split()
+    matches = (
+        i
+        for i, token in enumerate(tokens)
+        if any(normalize(word) in wanted for word in _TOKEN.findall(token))
+    )
+    first = next(matches, 0)
+    start = max(0, first - words // 3)
+    return highlight(" ".join(tokens[start : start + words]), wanted)
+
+
+class InvertedIndex:
+    """
+    Term -> {document: weight} postings over courses, modules and lessons.
+
+    Not thread-safe; use it from the event loop only.
+    """
+
+    def __init__(self, ttl: float = 60.0) -> None:
+        self.ttl = ttl
+        self.loaded_at: Optional[float] = None
+        self._docs: List[Tuple[str, int, int, str, str]] = []
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # term -> (sort keys, docs) in result order, built on first single-term query
+        self._ranked: Dict[str, Tuple[List[Tuple[float, str, int]], List[int]]] = {}
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    # ---- Loading ------------------------------------------------------
+
+    def load(self, documents: Iterable[IndexDocument]) -> None:
+        docs: List[Tuple[str, int, int, str, str]] = []
+        postings: Dict[str, Dict[int, float]] = {}
+        for kind, source_id, course_id, title, body, fields in documents:
+            doc = len(docs)
+            docs.append((kind, source_id, course_id, title, body))
+            for text, weight in fields:
+                for term in tokenize(text):
+                    entry = postings.setdefault(term, {})
+                    entry[doc] = entry.get(doc, 0.0) + weight
+        self._docs = docs
+        self._postings = postings
+        self._ranked = {}
+        self.loaded_at = time.monotonic()
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    def invalidate(self) -> None:
+        self.loaded_at = None
+        self._generation += 1
+
+    async def ensure_loaded(
+        self, loader: Callable[[], Awaitable[Iterable[IndexDocument]]]
+    ) -> "InvertedIndex":
+        """
+        Rebuild from ``loader()`` if never loaded, stale or invalidated.
+        """
+
+        if not self.is_stale():
+            return self
+
+        async with self._lock:
+            if not self.is_stale():
+                return self
+            generation = self._generation
+            self.load(await loader())
+            # A write landed while we were reading; serve this copy but rebuild next time
+            if generation != self._generation:
+                self.loaded_at = None
+        return self
+
+    # ---- Queries ------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        after: Optional[IndexPosition] = None,
+        limit: int = 20,
+    ) -> List[IndexHit]:
+        """
+        Documents containing every query term, best rank first.
+
+        Ties are ordered by ``(kind, source_id)``; ``after`` resumes behind the
+        given position for keyset paging.
+        """
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        postings = [self._postings.get(term) for term in terms]
+        if any(entry is None for entry in postings):
+            return []
+        bound = None if after is None else (-after[0], after[1], after[2])
+        if len(terms) == 1 and kind is None:
+            # Common single-word queries page through a cached ranking
+            keys, docs = self._ranking(terms[0])
+            start = 0 if bound is None else bisect.bisect_right(keys, bound)
+            stop = min(start + limit, len(keys))
+            return [self._hit(-keys[i][0], docs[i]) for i in range(start, stop)]
+
+        postings.sort(key=len)  # type: ignore[arg-type]
+        rarest, others = postings[0], postings[1:]
+
+        candidates = []
+        for doc, weight in rarest.items():  # type: ignore[union-attr]
+            rank = weight
+            for entry in others:
+                extra = entry.get(doc)  # type: ignore[union-attr]
+                if extra is None:
+                    break
+                rank += extra
+            else:
+                doc_kind, source_id = self._docs[doc][0], self._docs[doc][1]
+                if kind is not None and doc_kind != kind:
+                    continue
+                key = (-rank, doc_kind, source_id)
+                if bound is not None and key <= bound:
+                    continue
+                candidates.append((key, doc))
+
+        return [self._hit(-key[0], doc) for key, doc in heapq.nsmallest(limit, candidates)]
+
+    def _ranking(self, term: str) -> Tuple[List[Tuple[float, str, int]], List[int]]:
+        ranking = self._ranked.get(term)
+        if ranking is None:
+            ordered = sorted(
+                ((-weight, self._docs[doc][0], self._docs[doc][1]), doc)
+                for doc, weight in self._postings[term].items()
+            )
+            ranking = self._ranked[term] = ([key for key, _ in ordered], [doc for _, doc in ordered])
+        return ranking
+
+    def _hit(self, rank: float, doc: int) -> IndexHit:
+        kind, source_id, course_id, title, body = self._docs[doc]
+        return (rank, kind, source_id, course_id, title, body)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "documents": len(self._docs),
+            "terms": len(self._postings),
+            "age_seconds": 0.0 if self.loaded_at is None else time.monotonic() - self.loaded_at,
+        }
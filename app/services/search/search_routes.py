@@ -0,0 +1,48 @@
+from enum import Enum
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import Principal
+from app.core.common.pagination import set_next_cursor
+from app.core.db.session import get_read_session
+from app.dependencies.auth import get_current_principal
+from app.schemas.search import SearchHit
+from app.services.search.search_service import SearchService
+
+
+router = APIRouter()
+
+
+class SearchKind(str, Enum):
+    COURSE = "course"
+    MODULE = "module"
+    LESSON = "lesson"
+
+
+@router.get(
+    "",
+    response_model=List[SearchHit],
+    summary="Search courses, modules and lessons",
+)
+async def search_catalog(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    kind: Optional[SearchKind] = Query(None, description="Only return this kind of result"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    _: Principal = Depends(get_current_principal),
+    session: AsyncSession = Depends(get_read_session),
+) -> List[dict]:
+    """
+    Matches course titles, descriptions and categories, module names and
+    lesson names.  Results are ranked (title matches weigh most) and matched
+    words are wrapped in ``<mark>`` tags in ``highlight`` and ``snippet``.
+    """
+    service = SearchService(session)
+    hits, next_cursor = await service.search(
+        q, kind.value if kind else None, cursor=cursor, limit=limit
+    )
+    set_next_cursor(response, next_cursor)
+    return hits
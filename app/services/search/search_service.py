@@ -0,0 +1,230 @@
+"""
+Catalog search over courses, modules and lessons.
+
+PostgreSQL searches ``search_document`` (trigger-maintained, GIN-indexed
+``tsvector``) with ``websearch_to_tsquery``, ranks with ``ts_rank`` and
+highlights only the rows of the returned page with ``ts_headline``.  Other
+backends use the in-process ``InvertedIndex``.  Both page with a keyset
+cursor on ``(rank, kind, id)``.
+"""
+from __future__ import annotations
+
+from itertools import chain
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, event, func, literal, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.common.pagination import decode_cursor, encode_cursor
+from app.core.config import get_settings
+from app.core.models.course import Course
+from app.core.models.lesson import Lesson
+from app.core.models.module import Module
+from app.core.models.search import search_document
+from app.services.search.inverted_index import (
+    WEIGHT_A,
+    WEIGHT_B,
+    WEIGHT_C,
+    IndexDocument,
+    InvertedIndex,
+    highlight,
+    snippet,
+    tokenize,
+)
+
+SEARCH_KINDS = ("course", "module", "lesson")
+TEXT_SEARCH_CONFIG = "english"
+_CURSOR_SORT = "rank"
+_TITLE_HEADLINE = "StartSel=<mark>, StopSel=</mark>, HighlightAll=true"
+_BODY_HEADLINE = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10"
+
+search_index = InvertedIndex(ttl=get_settings().search_index_ttl)
+
+
+class SearchService:
+    """
+    Ranked, highlighted, keyset-paged catalog search.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    def backend(self) -> str:
+        configured = get_settings().search_backend
+        if configured != "auto":
+            return configured
+        return "postgres" if self.session.get_bind().dialect.name == "postgresql" else "memory"
+
+    async def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of hits for ``query`` and the cursor of the next page.
+        """
+
+        after = self._decode(cursor) if cursor else None
+        if self.backend() == "postgres":
+            hits = await self._search_postgres(query, kind, after, limit + 1)
+        else:
+            hits = await self._search_memory(query, kind, after, limit + 1)
+
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            last = hits[-1]
+            next_cursor = encode_cursor(_CURSOR_SORT, last["rank"], [last["kind"], last["id"]])
+        return hits, next_cursor
+
+    # ---- PostgreSQL ---------------------------------------------------
+
+    async def _search_postgres(
+        self, query: str, kind: Optional[str], after: Optional[Tuple[float, str, int]], limit: int
+    ) -> List[Dict[str, Any]]:
+        stmt = self.postgres_statement(query, kind, after, limit)
+        hits = []
+        for kind_, source_id, course_id, title, rank, title_headline, body_headline in (
+            await self.session.execute(stmt)
+        ).all():
+            hits.append(
+                {
+                    "kind": kind_,
+                    "id": source_id,
+                    "course_id": course_id,
+                    "title": title,
+                    "highlight": title_headline,
+                    "snippet": body_headline or None,
+                    "rank": rank,
+                }
+            )
+        return hits
+
+    @staticmethod
+    def postgres_statement(
+        query: str, kind: Optional[str], after: Optional[Tuple[float, str, int]], limit: int
+    ) -> Select:
+        doc = search_document.c
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+        rank = func.ts_rank(doc.vector, tsquery).label("rank")
+        matches = select(doc.kind, doc.source_id, doc.course_id, doc.title, doc.body, rank).where(
+            doc.vector.op("@@")(tsquery)
+        )
+        if kind is not None:
+            matches = matches.where(doc.kind == kind)
+        ranked = matches.subquery("ranked")
+
+        page = select(ranked)
+        if after is not None:
+            after_rank, after_kind, after_id = after
+            position = tuple_(ranked.c.kind, ranked.c.source_id)
+            page = page.where(
+                or_(
+                    ranked.c.rank < after_rank,
+                    and_(
+                        ranked.c.rank == after_rank,
+                        position > tuple_(literal(after_kind), literal(after_id)),
+                    ),
+                )
+            )
+        page = (
+            page.order_by(ranked.c.rank.desc(), ranked.c.kind, ranked.c.source_id)
+            .limit(limit)
+            .subquery("page")
+        )
+
+        # Headlines are costly, so they are computed for this page only
+        stmt = select(
+            page.c.kind,
+            page.c.source_id,
+            page.c.course_id,
+            page.c.title,
+            page.c.rank,
+            func.ts_headline(TEXT_SEARCH_CONFIG, page.c.title, tsquery, _TITLE_HEADLINE),
+            func.ts_headline(TEXT_SEARCH_CONFIG, page.c.body, tsquery, _BODY_HEADLINE),
+        ).order_by(page.c.rank.desc(), page.c.kind, page.c.source_id)
+        return stmt
+
+    # ---- In-process index ---------------------------------------------
+
+    async def _search_memory(
+        self, query: str, kind: Optional[str], after: Optional[Tuple[float, str, int]], limit: int
+    ) -> List[Dict[str, Any]]:
+        index = await search_index.ensure_loaded(self._load_documents)
+        terms = tokenize(query)
+        return [
+            {
+                "kind": kind_,
+                "id": source_id,
+                "course_id": course_id,
+                "title": title,
+                "highlight": highlight(title, terms),
+                "snippet": snippet(body, terms),
+                "rank": rank,
+            }
+            for rank, kind_, source_id, course_id, title, body in index.search(
+                query, kind, after, limit
+            )
+        ]
+
+    async def _load_documents(self) -> List[IndexDocument]:
+        documents: List[IndexDocument] = []
+        courses = await self.session.execute(
+            select(Course.id, Course.title, Course.description, Course.category)
+        )
+        for id_, title, description, category in courses.all():
+            fields = ((title, WEIGHT_A), (category, WEIGHT_B), (description, WEIGHT_C))
+            documents.append(("course", id_, id_, title, description or "", fields))
+
+        modules = await self.session.execute(select(Module.id, Module.course_id, Module.name))
+        for id_, course_id, name in modules.all():
+            documents.append(("module", id_, course_id, name, "", ((name, WEIGHT_A),)))
+
+        lessons = await self.session.execute(
+            select(Lesson.id, Module.course_id, Lesson.name).join(
+                Module, Module.id == Lesson.module_id
+            )
+        )
+        for id_, course_id, name in lessons.all():
+            documents.append(("lesson", id_, course_id, name, "", ((name, WEIGHT_A),)))
+        return documents
+
+    @staticmethod
+    def _decode(cursor: str) -> Tuple[float, str, int]:
+        data = decode_cursor(cursor, _CURSOR_SORT)
+        position = data["id"]
+        if (
+            not isinstance(data["value"], (int, float))
+            or not isinstance(position, list)
+            or len(position) != 2
+            or position[0] not in SEARCH_KINDS
+            or not isinstance(position[1], int)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+        return float(data["value"]), position[0], position[1]
+
+
+# Any ORM write to a searchable model makes the in-process index stale
+
+_SEARCHABLE = (Course, Module, Lesson)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_flush(session: Session, _flush_context: Any) -> None:
+    if any(isinstance(obj, _SEARCHABLE) for obj in chain(session.new, session.dirty, session.deleted)):
+        search_index.invalidate()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_statement(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        mapper = state.bind_mapper
+        if mapper is not None and mapper.class_ in _SEARCHABLE:
+            search_index.invalidate()
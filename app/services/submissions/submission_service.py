@@ -15,6 +15,7 @@ class SubmissionService(BaseService[Submission]):
     """
 
     model = Submission
+    use_returning = True
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
@@ -52,16 +53,12 @@ class SubmissionService(BaseService[Submission]):
         payload: GradeSubmissionRequest,
         _current_user: User,
     ) -> Submission:
-        submission = await self.get_by_id(submission_id)
+        submission = await self.update_by_id(submission_id, {"score": payload.score})
         if not submission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Submission not found",
             )
-        submission.score = payload.score
-        self.session.add(submission)
-        await self.session.commit()
-        await self.session.refresh(submission)
         return submission
 
 
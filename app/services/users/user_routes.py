@@ -1,12 +1,14 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth import Principal
+from app.core.common.pagination import set_next_cursor
 from app.core.db.session import get_db_session
 from app.core.models.enums import UserRole
 from app.core.models.user import User
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_principal, get_current_user
 from app.dependencies.roles import get_permission_checker
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 from app.services.users.user_service import UserService
@@ -45,13 +47,21 @@ async def create_user(
     summary="List users",
 )
 async def list_users(
-    offset: int = 0,
-    limit: int = 100,
-    _: User = Depends(get_current_user),
+    response: Response,
+    offset: Optional[int] = Query(None, ge=0, description="Deprecated: use cursor"),
+    limit: int = Query(100, description="Page size, at most 1000 with cursor pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    sort: str = Query("id", description="Sort key: id or email"),
+    _: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db_session),
 ) -> List[User]:
     service = UserService(session)
-    return await service.list_users(offset=offset, limit=limit)
+    if offset is not None:
+        return await service.list_users(offset=offset, limit=limit)
+
+    users, next_cursor = await service.list_users_page(cursor=cursor, limit=limit, sort=sort)
+    set_next_cursor(response, next_cursor)
+    return users
 
 
 @router.get(
@@ -61,7 +71,7 @@ async def list_users(
 )
 async def get_user(
     user_id: int,
-    _: User = Depends(get_current_user),
+    _: Principal = Depends(get_current_principal),
     session: AsyncSession = Depends(get_db_session),
 ) -> User:
     service = UserService(session)
@@ -1,10 +1,12 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.common.base_service import BaseService
+from app.core.common.cache import invalidate_user, remember_user
+from app.core.common.catalog_version import touch_progress
 from app.core.models.enums import UserRole
 from app.core.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -16,6 +18,7 @@ class UserService(BaseService[User]):
     """
 
     model = User
+    cursor_sort_keys = ("id", "email")
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
@@ -34,11 +37,18 @@ class UserService(BaseService[User]):
                 detail="Email already in use",
             )
 
-        return await self.create(payload.dict())
+        user = await self.create(payload.dict())
+        remember_user(user.id)
+        return user
 
     async def list_users(self, offset: int = 0, limit: int = 100) -> List[User]:
         return await self.list(offset=offset, limit=limit)
 
+    async def list_users_page(
+        self, cursor: Optional[str] = None, limit: int = 100, sort: str = "id"
+    ) -> Tuple[List[User], Optional[str]]:
+        return await self.list_page(cursor=cursor, limit=limit, sort=sort)
+
     async def get_user(self, user_id: int) -> User:
         user = await self.get_by_id(user_id)
         if not user:
@@ -53,7 +63,13 @@ class UserService(BaseService[User]):
             )
 
         user = await self.get_user(user_id)
-        return await self.update(user, payload.dict(exclude_unset=True))
+        data = payload.dict(exclude_unset=True)
+        if "role" in data and data["role"] != user.role:
+            # Tokens carry the role they were issued with; revoke them
+            data["token_version"] = (user.token_version or 0) + 1
+        updated = await self.update(user, data)
+        invalidate_user(user_id)
+        return updated
 
     async def delete_user(self, user_id: int, current_user: User) -> None:
         if current_user.role is not UserRole.ADMIN:
@@ -63,7 +79,10 @@ class UserService(BaseService[User]):
             )
 
         user = await self.get_user(user_id)
+        # Its enrollments go with it
+        touch_progress(self.session, [user_id])
         await self.delete(user)
+        invalidate_user(user_id)
 
 
 
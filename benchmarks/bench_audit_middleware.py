@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Compare the BaseHTTPMiddleware-based audit layer with the pure-ASGI one on
+large streaming responses (NDJSON and CSV).
+
+The app is driven directly through its ASGI callable, so no server or HTTP
+client is involved and the numbers isolate middleware overhead.  Audit events
+go to an AuditWriter that is never started, so no database is needed.
+
+Usage:
+    python benchmarks/bench_audit_middleware.py [--rows 200000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.models.enums import AuditEventType
+from app.middleware.audit import AuditMiddleware
+from app.middleware.audit_writer import AuditWriter
+
+
+class LegacyAuditMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, minus the DB lookups."""
+
+    def __init__(self, app, writer: AuditWriter) -> None:
+        super().__init__(app)
+        self.writer = writer
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        start = time.perf_counter()
+        response = await call_next(request)
+        await self.writer.submit(
+            {
+                "user_id": None,
+                "endpoint": request.url.path,
+                "method": request.method,
+                "status_code": response.status_code,
+                "duration_ms": (time.perf_counter() - start) * 1000.0,
+                "event_type": AuditEventType.REQUEST,
+            }
+        )
+        return response
+
+
+def build_app(middleware, rows: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ndjson")
+    async def ndjson() -> StreamingResponse:
+        async def generate():
+            for i in range(rows):
+                yield json.dumps({"id": i, "assessment_id": i // 10, "content": "What is %d?" % i}) + "\n"
+
+        return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+    @app.get("/csv")
+    async def csv() -> StreamingResponse:
+        async def generate():
+            yield "user_id,course_id,progress,completion_percentage\n"
+            for i in range(rows):
+                yield f"{i},{i % 97},0.5,50.0\n"
+
+        return StreamingResponse(generate(), media_type="text/csv")
+
+    writer = AuditWriter(max_queue_size=1_000_000)
+    app.add_middleware(middleware, writer=writer)
+    return app
+
+
+async def drive(app: FastAPI, path: str) -> Tuple[float, float, int]:
+    """Run one request; return (ttfb seconds, total seconds, body bytes)."""
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+        "state": {},
+    }
+    received = False
+    size = 0
+    first: List[float] = []
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body" and message.get("body"):
+            if not first:
+                first.append(time.perf_counter())
+            size += len(message["body"])
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    end = time.perf_counter()
+    return (first[0] - start) if first else 0.0, end - start, size
+
+
+async def main(rows: int, repeat: int) -> None:
+    print(f"rows={rows} repeat={repeat}")
+    print(f"{'middleware':<16}{'stream':<8}{'ttfb ms':>10}{'total ms':>12}{'MB/s':>10}")
+    for name, middleware in (("BaseHTTP", LegacyAuditMiddleware), ("pure ASGI", AuditMiddleware)):
+        app = build_app(middleware, rows)
+        for path in ("/ndjson", "/csv"):
+            await drive(app, path)  # warm-up
+            runs = [await drive(app, path) for _ in range(repeat)]
+            ttfb = median(r[0] for r in runs) * 1000.0
+            total = median(r[1] for r in runs)
+            mbps = runs[0][2] / total / 1e6
+            print(f"{name:<16}{path[1:]:<8}{ttfb:>10.2f}{total * 1000.0:>12.1f}{mbps:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
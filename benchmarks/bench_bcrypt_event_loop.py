@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Measure event-loop lag during a login storm, with bcrypt run inline versus
+through the bounded password hashing executor.
+
+A ticker task sleeps for 5 ms in a loop and records how late it wakes up;
+meanwhile N concurrent "logins" each verify a bcrypt hash.  Inline
+verification blocks the loop for the whole storm, the executor keeps the
+ticker close to on time.
+
+Usage:
+    python benchmarks/bench_bcrypt_event_loop.py [--logins 32] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.auth import PasswordHashingPool, get_password_hash, verify_password
+
+TICK = 0.005
+
+
+async def ticker(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        before = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - before - TICK)
+
+
+async def storm(logins: int, hashed: str, pool: Optional[PasswordHashingPool] = None) -> None:
+    async def login() -> bool:
+        if pool is None:
+            return verify_password("correct horse battery", hashed)
+        return await pool.run(verify_password, "correct horse battery", hashed)
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+
+
+async def measure(label: str, logins: int, hashed: str, pool: Optional[PasswordHashingPool] = None) -> None:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(TICK * 4)
+
+    start = time.perf_counter()
+    await storm(logins, hashed, pool)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await tick_task
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    print(
+        f"{label:<22}{elapsed * 1000:>12.0f}{len(lags):>8}"
+        f"{p99 * 1000:>12.1f}{(lags[-1] if lags else 0) * 1000:>12.1f}"
+    )
+    if pool is not None:
+        stats = pool.stats()
+        print(f"{'':<22}queue wait avg {stats['avg_wait_ms']:.1f} ms, max {stats['max_wait_ms']:.1f} ms")
+
+
+async def main(logins: int, workers: int) -> None:
+    hashed = get_password_hash("correct horse battery")
+    print(f"logins={logins} workers={workers}")
+    print(f"{'mode':<22}{'storm ms':>12}{'ticks':>8}{'p99 lag ms':>12}{'max lag ms':>12}")
+    await measure("inline bcrypt", logins, hashed)
+    for kind in ("thread", "process"):
+        pool = PasswordHashingPool(max_workers=workers, kind=kind)
+        await pool.run(verify_password, "warm up", hashed)
+        await measure(f"{kind} executor", logins, hashed, pool)
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.workers))
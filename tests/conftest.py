@@ -0,0 +1,146 @@
+"""
+Shared fixtures.
+
+Database tests are ``async def`` tests run by anyio's pytest plugin on
+asyncio, against a throwaway SQLite file through aiosqlite; they are skipped
+when aiosqlite is not installed.
+"""
+import inspect
+from typing import AsyncIterator, Iterator, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.auth import Principal
+from app.core.common.cache import (
+    course_outline_cache,
+    learning_path_cache,
+    principal_cache,
+    token_claims_cache,
+    user_exists_cache,
+)
+from app.core.db.base import Base
+from app.core.models.course import Course, course_prerequisite
+from app.core.models.enrollment import Enrollment
+from app.core.models.enums import UserRole
+from app.core.models.user import User
+from app.services.search.search_service import search_index
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line("markers", "foreign_keys: enforce foreign keys in the test database")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pycollect_makeitem(collector, name: str, obj: object) -> None:
+    # Mark async tests before anyio's own hook looks for the marker
+    if collector.istestfunction(obj, name) and inspect.iscoroutinefunction(obj):
+        pytest.mark.anyio(obj)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_caches() -> Iterator[None]:
+    # Module-level caches would otherwise carry rows of one test's database
+    # into the next
+    caches = (course_outline_cache, learning_path_cache, principal_cache, token_claims_cache, user_exists_cache)
+    for cache in caches:
+        cache.clear()
+    search_index.invalidate()
+    yield
+    for cache in caches:
+        cache.clear()
+    search_index.invalidate()
+
+
+@pytest.fixture
+async def engine(tmp_path, request) -> AsyncIterator[AsyncEngine]:
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    if request.node.get_closest_marker("foreign_keys"):
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _enable_foreign_keys(dbapi_connection, _record) -> None:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+async def session(session_factory: async_sessionmaker) -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def statements(engine: AsyncEngine) -> List[str]:
+    """
+    The SQL of every statement the engine runs from here on.
+    """
+
+    executed: List[str] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, sql, *_: executed.append(sql),
+    )
+    return executed
+
+
+@pytest.fixture
+def admin() -> Principal:
+    return Principal(1, UserRole.ADMIN, None, 0)
+
+
+@pytest.fixture
+async def gated_catalog(engine: AsyncEngine) -> None:
+    """
+    Courses 1-3, where 3 requires 1 and 2; learners 10-12; user 10 has
+    completed 1 and 2, user 11 only 1.
+    """
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            Course.__table__.insert(),
+            [{"id": i, "title": f"c{i}", "description": "d", "category": "x"} for i in (1, 2, 3)],
+        )
+        await conn.execute(
+            course_prerequisite.insert(),
+            [{"course_id": 3, "prereq_course_id": 1}, {"course_id": 3, "prereq_course_id": 2}],
+        )
+        await conn.execute(
+            User.__table__.insert(),
+            [
+                {
+                    "id": i,
+                    "email": f"u{i}@x.io",
+                    "first_name": "U",
+                    "last_name": str(i),
+                    "role": UserRole.LEARNER,
+                }
+                for i in (10, 11, 12)
+            ],
+        )
+        await conn.execute(
+            Enrollment.__table__.insert(),
+            [
+                {"user_id": 10, "course_id": 1, "progress": 1.0, "completion_percentage": 100.0},
+                {"user_id": 10, "course_id": 2, "progress": 1.0, "completion_percentage": 100.0},
+                {"user_id": 11, "course_id": 1, "progress": 1.0, "completion_percentage": 100.0},
+            ],
+        )
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from app.core.models.audit_log import AuditLog, AuditLogRollup
+from app.core.models.enums import AuditEventType
+from app.jobs.audit_retention import ROLLUP_KEY, compact_statement, rollup_select
+
+
+def test_rollup_key_is_the_rollup_primary_key() -> None:
+    table = AuditLogRollup.__table__
+    assert ROLLUP_KEY == tuple(column.name for column in table.primary_key)
+    # The key columns followed by one counter per remaining column
+    assert len(rollup_select(AuditLog.__table__).selected_columns) == len(table.columns)
+
+
+def test_compact_statement_compiles_for_postgres() -> None:
+    sql = str(compact_statement(100, datetime(2024, 1, 1)).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH deleted AS \n(DELETE FROM auditlog WHERE auditlog.id <= ")
+    assert "AND auditlog.timestamp < " in sql and " RETURNING auditlog.timestamp, " in sql
+    assert (
+        "INSERT INTO auditlogrollup (bucket, route, method, status_class, request_count, error_count, "
+        "duration_sum_ms, duration_max_ms) SELECT date_trunc(" in sql
+    )
+    assert "\nFROM deleted GROUP BY date_trunc(" in sql
+    assert "ON CONFLICT (bucket, route, method, status_class) DO UPDATE SET " in sql
+    assert "request_count = (auditlogrollup.request_count + excluded.request_count)" in sql
+    assert "duration_max_ms = greatest(auditlogrollup.duration_max_ms, excluded.duration_max_ms)" in sql
+
+
+@pytest.fixture
+async def minute_engine(engine):
+    # SQLite has no date_trunc; new connections get a minute-only stand-in
+    @event.listens_for(engine.sync_engine, "connect")
+    def _date_trunc(dbapi_connection, _record) -> None:
+        dbapi_connection.create_function("date_trunc", 2, lambda _unit, value: value[:16] + ":00")
+
+    await engine.dispose()
+    return engine
+
+
+async def test_rollup_groups_by_minute_route_method_and_status_class(minute_engine, session) -> None:
+    def log(second: int, endpoint: str, route, status_code: int, duration_ms: float, error: bool = False):
+        return AuditLog(
+            endpoint=endpoint,
+            route=route,
+            method="GET",
+            status_code=status_code,
+            duration_ms=duration_ms,
+            event_type=AuditEventType.ERROR if error else AuditEventType.REQUEST,
+            timestamp=datetime(2024, 1, 1, 12) + timedelta(seconds=second),
+        )
+
+    session.add_all(
+        [
+            # Same minute, template and status class: one rollup row
+            log(1, "/courses/1", "/courses/{id}", 200, 10.0),
+            log(2, "/courses/2", "/courses/{id}", 204, 30.0),
+            # Another status class
+            log(3, "/courses/3", "/courses/{id}", 500, 5.0, error=True),
+            # No template: grouped by the raw endpoint
+            log(4, "/health", None, 200, 1.0),
+            # The next minute
+            log(61, "/courses/1", "/courses/{id}", 200, 7.0),
+        ]
+    )
+    await session.commit()
+
+    rows = (await session.execute(rollup_select(AuditLog.__table__))).all()
+    rollups = {tuple(row[:4]): tuple(row[4:]) for row in rows}
+    assert rollups == {
+        ("2024-01-01 12:00:00", "/courses/{id}", "GET", 2): (2, 0, 40.0, 30.0),
+        ("2024-01-01 12:00:00", "/courses/{id}", "GET", 5): (1, 1, 5.0, 5.0),
+        ("2024-01-01 12:00:00", "/health", "GET", 2): (1, 0, 1.0, 1.0),
+        ("2024-01-01 12:01:00", "/courses/{id}", "GET", 2): (1, 0, 7.0, 7.0),
+    }
@@ -0,0 +1,165 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import event, select
+
+from app.core.common.cache import user_exists_cache
+from app.core.models.audit_log import AuditLog
+from app.core.models.enums import AuditEventType
+from app.middleware.audit import AuditMiddleware
+from app.middleware.audit_writer import MAX_USER_ID, AuditWriter, BackpressurePolicy
+
+
+def _event() -> dict:
+    return {
+        "user_id": None,
+        "endpoint": "/courses/",
+        "method": "GET",
+        "status_code": 200,
+        "duration_ms": 1.5,
+        "event_type": AuditEventType.REQUEST,
+    }
+
+
+def test_drop_policy_counts_overflow() -> None:
+    async def scenario() -> AuditWriter:
+        writer = AuditWriter(max_queue_size=3, policy=BackpressurePolicy.DROP)
+        for _ in range(5):
+            await writer.submit(_event())
+        return writer
+
+    writer = asyncio.run(scenario())
+    stats = writer.stats()
+    assert stats["queue_depth"] == 3
+    assert stats["enqueued"] == 3
+    assert stats["dropped"] == 2
+
+
+def test_block_policy_gives_up_after_timeout() -> None:
+    async def scenario() -> AuditWriter:
+        writer = AuditWriter(max_queue_size=1, policy=BackpressurePolicy.BLOCK, block_timeout=0.01)
+        assert await writer.submit(_event())
+        assert not await writer.submit(_event())
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.dropped == 1
+
+
+def test_sample_policy_sheds_load_once_half_full() -> None:
+    async def scenario() -> AuditWriter:
+        writer = AuditWriter(max_queue_size=10, policy=BackpressurePolicy.SAMPLE, sample_rate=0.0)
+        for _ in range(10):
+            await writer.submit(_event())
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.queue_depth == 5
+    assert writer.sampled_out == 5
+
+
+def test_restart_on_a_new_event_loop_gets_a_fresh_queue() -> None:
+    def no_database():
+        raise RuntimeError("no database")
+
+    writer = AuditWriter(
+        max_queue_size=1,
+        policy=BackpressurePolicy.BLOCK,
+        block_timeout=0.01,
+        flush_interval=0.01,
+        session_factory=no_database,
+    )
+
+    async def first_lifespan() -> None:
+        writer.start()
+        await writer.stop()
+        # Waiting on the full queue ties it to this loop
+        assert await writer.submit(_event())
+        assert not await writer.submit(_event())
+
+    async def second_lifespan() -> None:
+        writer.start()
+        for _ in range(3):
+            assert await writer.submit(_event())
+            await asyncio.sleep(0.05)
+        await writer.stop()
+
+    asyncio.run(first_lifespan())
+    asyncio.run(second_lifespan())
+    # The event left over from the first loop plus the three new ones reached the writer
+    assert writer.failed == 4
+    assert writer.queue_depth == 0
+
+
+class RecordingWriter(AuditWriter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.submitted: List[Dict[str, Any]] = []
+
+    async def submit(self, event: Dict[str, Any], verify_user: bool = False) -> bool:
+        self.submitted.append({**event, "verify_user": verify_user})
+        return True
+
+
+async def test_middleware_ignores_malformed_user_ids() -> None:
+    async def app(scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def send(message) -> None:
+        pass
+
+    writer = RecordingWriter()
+    middleware = AuditMiddleware(app, writer=writer)
+    # A latin-1 superscript two passes str.isdigit(); the last id overflows the column
+    for header in (b"\xb2", b"\xd9\xa3", b"12", str(MAX_USER_ID + 1).encode()):
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"x-user-id", header)]}
+        await middleware(scope, None, send)
+
+    assert [(e["user_id"], e["verify_user"]) for e in writer.submitted] == [
+        (None, False),
+        (None, False),
+        (12, True),
+        (None, False),
+    ]
+
+
+async def _write(session_factory, *user_ids: int) -> AuditWriter:
+    writer = AuditWriter(session_factory=session_factory)
+    for user_id in user_ids:
+        await writer.submit({**_event(), "user_id": user_id}, verify_user=True)
+    await writer.stop()
+    return writer
+
+
+async def _logged_user_ids(session_factory) -> List[Any]:
+    async with session_factory() as session:
+        return sorted((await session.execute(select(AuditLog.user_id))).scalars(), key=str)
+
+
+@pytest.mark.foreign_keys
+async def test_out_of_range_user_id_is_logged_without_a_user(gated_catalog, session_factory) -> None:
+    writer = await _write(session_factory, 10, MAX_USER_ID + 1, 99)
+    # One batch, not a fallback to a session per row
+    assert (writer.batches, writer.written, writer.failed) == (1, 3, 0)
+    assert await _logged_user_ids(session_factory) == [10, None, None]
+    assert MAX_USER_ID + 1 not in user_exists_cache
+
+
+@pytest.mark.foreign_keys
+async def test_failed_user_lookup_logs_rows_without_a_user(gated_catalog, engine, session_factory) -> None:
+    def fail_lookup(_conn, _cursor, sql, *_) -> None:
+        if sql.lstrip().startswith("SELECT"):
+            raise RuntimeError("lookup failed")
+
+    event.listen(engine.sync_engine, "before_cursor_execute", fail_lookup)
+    try:
+        writer = await _write(session_factory, 10, 99)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", fail_lookup)
+
+    assert (writer.batches, writer.written, writer.failed) == (1, 2, 0)
+    assert await _logged_user_ids(session_factory) == [None, None]
+    # Nothing is remembered about ids that were never checked
+    assert 10 not in user_exists_cache and 99 not in user_exists_cache
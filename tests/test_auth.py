@@ -0,0 +1,95 @@
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.auth import Principal, create_access_token
+from app.core.common.cache import principal_cache
+from app.core.models.enums import UserRole
+from app.core.models.user import User
+from app.dependencies.auth import get_current_principal
+from app.schemas.user import UserUpdate
+from app.services.users.user_service import UserService
+
+
+def _user(user_id: int, role: UserRole = UserRole.LEARNER, token_version: int = 0) -> User:
+    return User(
+        id=user_id,
+        email=f"u{user_id}@x.io",
+        first_name="U",
+        last_name=str(user_id),
+        role=role,
+        token_version=token_version,
+    )
+
+
+@pytest.fixture
+async def users(session) -> None:
+    session.add_all([_user(1, UserRole.ADMIN), _user(10), _user(11, token_version=1)])
+    await session.commit()
+
+
+@pytest.fixture
+def authenticate(session):
+    # A bearer token for ``user_id`` when ``ver`` is given, else the X-User-Id header
+    async def authenticate(user_id: int, ver: Optional[int] = None) -> Principal:
+        request = Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": []})
+        if ver is None:
+            return await get_current_principal(request, session, x_user_id=user_id, credentials=None)
+        token = create_access_token({"sub": str(user_id), "ver": ver})
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        return await get_current_principal(request, session, x_user_id=None, credentials=credentials)
+
+    return authenticate
+
+
+async def _rejected(authenticate, *args, **kwargs) -> str:
+    with pytest.raises(HTTPException) as exc:
+        await authenticate(*args, **kwargs)
+    assert exc.value.status_code == 401
+    return exc.value.detail
+
+
+async def test_cached_principal_skips_the_database(users, authenticate, statements) -> None:
+    first = await authenticate(10, ver=0)
+    assert (first.id, first.role, first.token_version) == (10, UserRole.LEARNER, 0)
+    assert len(statements) == 1
+
+    statements.clear()
+    assert await authenticate(10, ver=0) is first
+    assert await authenticate(10) is first
+    assert statements == []
+
+
+async def test_token_with_old_version_is_revoked(users, authenticate) -> None:
+    assert await _rejected(authenticate, 11, ver=0) == "Token has been revoked. Please log in again."
+    # Also once the principal is cached
+    assert (await authenticate(11, ver=1)).id == 11
+    assert await _rejected(authenticate, 11, ver=0) == "Token has been revoked. Please log in again."
+
+
+async def test_role_change_revokes_cached_tokens(session, users, authenticate) -> None:
+    await authenticate(10, ver=0)
+    admin = await session.get(User, 1)
+    await UserService(session).update_user(10, UserUpdate(role=UserRole.INSTRUCTOR), admin)
+
+    await _rejected(authenticate, 10, ver=0)
+    principal = await authenticate(10, ver=1)
+    assert principal.role is UserRole.INSTRUCTOR
+
+
+async def test_deleted_user_is_rejected_at_once(session, users, authenticate) -> None:
+    await authenticate(10)
+    admin = await session.get(User, 1)
+    await UserService(session).delete_user(10, admin)
+    await _rejected(authenticate, 10)
+
+
+async def test_unknown_ids_are_not_cached(session, users, authenticate) -> None:
+    await _rejected(authenticate, 12)
+    assert 12 not in principal_cache
+
+    session.add(_user(12))
+    await session.commit()
+    assert (await authenticate(12)).id == 12
@@ -0,0 +1,27 @@
+import pytest
+
+from app.core.models.course import Course
+from app.services.courses.course_service import CourseService
+
+
+@pytest.fixture
+async def course(session) -> Course:
+    return await CourseService(session).create({"title": "Graphs", "description": "d", "category": "cs"})
+
+
+async def test_create_is_one_statement(session, statements) -> None:
+    course = await CourseService(session).create({"title": "Graphs", "description": "d", "category": "cs"})
+    assert course.id is not None
+    assert len(statements) == 1
+
+
+async def test_update_is_one_statement(session, course, statements) -> None:
+    updated = await CourseService(session).update(course, {"title": "Graphs II"})
+    assert updated is course and updated.title == "Graphs II"
+    assert len(statements) == 1
+    assert (await session.get(Course, course.id)).title == "Graphs II"
+
+
+async def test_update_by_id_of_a_missing_row_returns_none(session, course, statements) -> None:
+    assert await CourseService(session).update_by_id(course.id + 1, {"title": "nope"}) is None
+    assert len(statements) == 1
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.core.models.course import Course
+from app.core.models.module import Module
+from app.services.modules.module_service import ModuleService
+
+pytestmark = pytest.mark.foreign_keys
+
+
+@pytest.fixture
+async def module_ids(session) -> list:
+    session.add(Course(id=1, title="t", description="d", category="c"))
+    await session.commit()
+    items = [(i, {"course_id": 1, "name": f"m{i}", "weight": 1.0}) for i in range(3)]
+    created, _ = await ModuleService(session).bulk_create(items)
+    return created
+
+
+async def test_bulk_create_reports_bad_items(session) -> None:
+    session.add(Course(id=1, title="t", description="d", category="c"))
+    await session.commit()
+    items = [(i, {"course_id": 1, "name": f"m{i}", "weight": 1.0}) for i in range(5)]
+    items[3] = (3, {"course_id": 999, "name": "orphan", "weight": 1.0})
+
+    created, errors = await ModuleService(session).bulk_create(items, chunk_size=2)
+    assert len(created) == 4
+    assert [e["index"] for e in errors] == [3]
+    assert (await session.execute(select(func.count()).select_from(Module))).scalar_one() == 4
+
+
+async def test_bulk_update_reports_missing_ids(session, module_ids) -> None:
+    updated, errors = await ModuleService(session).bulk_update(
+        [(0, {"id": module_ids[0], "name": "renamed"}), (1, {"id": 12345, "name": "x"})]
+    )
+    assert updated == [module_ids[0]]
+    assert errors[0]["index"] == 1
+    renamed = await session.get(Module, module_ids[0], populate_existing=True)
+    assert renamed.name == "renamed"
+
+
+async def test_bulk_delete_reports_missing_ids(session, module_ids) -> None:
+    deleted, errors = await ModuleService(session).bulk_delete([(0, module_ids[1]), (1, 12345)])
+    assert deleted == [module_ids[1]]
+    assert errors[0]["detail"] == "Module 12345 not found"
+    assert (await session.execute(select(func.count()).select_from(Module))).scalar_one() == 2
+
+
+def test_parse_bulk_payload_accepts_ndjson_and_reports_invalid_items() -> None:
+    pytest.importorskip("httpx")
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.dependencies.decorators import BulkPayload, parse_bulk_payload
+    from app.schemas.module import ModuleCreate
+
+    app = FastAPI()
+
+    @app.post("/bulk")
+    async def bulk(payload: BulkPayload = Depends(parse_bulk_payload(ModuleCreate))) -> dict:
+        return {"items": payload.items, "errors": payload.errors}
+
+    client = TestClient(app)
+    body = '{"course_id": 1, "name": "a"}\n{"name": "no course"}\n\n{"course_id": 2, "name": "b"}\n'
+    response = client.post("/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    data = response.json()
+    assert [item[0] for item in data["items"]] == [0, 2]
+    assert data["errors"][0]["index"] == 1
+
+    response = client.post("/bulk", json=[{"course_id": 1, "name": "a"}])
+    assert response.json()["items"] == [[0, {"name": "a", "weight": 1.0, "course_id": 1}]]
+
+    assert client.post("/bulk", content="{not json", headers={"Content-Type": "application/json"}).status_code == 400
@@ -0,0 +1,24 @@
+import time
+
+from app.core.common.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    assert cache.get(1) == "a"
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+
+
+def test_ttl_cache_expires_entries() -> None:
+    cache: TTLCache[int, bool] = TTLCache(maxsize=10, ttl=60)
+    cache.set(1, False, ttl=0.01)
+    assert cache.get(1) is False
+    time.sleep(0.02)
+    assert cache.get(1) is None
+    assert len(cache) == 0
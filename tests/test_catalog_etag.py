@@ -0,0 +1,91 @@
+import pytest
+from fastapi import Request, Response
+
+from app.core.models.course import Course
+from app.core.models.module import Module
+from app.schemas.lesson import LessonCreate
+from app.schemas.module import ModuleUpdate
+from app.services.lessons.lesson_routes import list_lessons_by_module
+from app.services.lessons.lesson_service import LessonService
+from app.services.modules.module_routes import list_modules_by_course
+from app.services.modules.module_service import ModuleService
+
+
+def make_request(path: str, etag: str = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers})
+
+
+@pytest.fixture
+async def catalog(session) -> None:
+    session.add_all(
+        [
+            Course(id=1, title="c1", description="d", category="x"),
+            Course(id=2, title="c2", description="d", category="x"),
+            Module(id=1, course_id=1, name="m1"),
+            Module(id=2, course_id=2, name="m2"),
+        ]
+    )
+    await session.commit()
+
+
+@pytest.fixture
+def modules(session, admin, catalog):
+    async def modules(course_id: int, etag: str = None):
+        response = Response()
+        result = await list_modules_by_course(
+            course_id,
+            make_request(f"/modules/by-course/{course_id}", etag),
+            response,
+            limit=100,
+            cursor=None,
+            _=admin,
+            session=session,
+        )
+        return result, response.headers.get("etag")
+
+    return modules
+
+
+@pytest.fixture
+def lessons(session, admin, catalog):
+    async def lessons(module_id: int, etag: str = None):
+        response = Response()
+        result = await list_lessons_by_module(
+            module_id,
+            make_request(f"/lessons/by-module/{module_id}", etag),
+            response,
+            limit=100,
+            cursor=None,
+            _=admin,
+            session=session,
+        )
+        return result, response.headers.get("etag")
+
+    return lessons
+
+
+async def test_matching_etag_revalidates(modules) -> None:
+    _, etag = await modules(1)
+    revalidated, _ = await modules(1, etag)
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert (await modules(1, f"W/{etag}"))[0].status_code == 304
+
+
+async def test_write_changes_only_its_course_etag(session, modules) -> None:
+    _, etag = await modules(1)
+    _, other_etag = await modules(2)
+
+    await ModuleService(session).update_module(1, ModuleUpdate(name="renamed"))
+    after_update, new_etag = await modules(1, etag)
+    assert [m.name for m in after_update] == ["renamed"]
+    assert new_etag != etag
+    assert (await modules(2, other_etag))[0].status_code == 304
+
+
+async def test_lesson_write_changes_module_etag(session, lessons) -> None:
+    _, etag = await lessons(1)
+    await LessonService(session).create_lesson(LessonCreate(module_id=1, name="l1", content_type="text"), None)
+    result, _ = await lessons(1, etag)
+    assert [l.name for l in result] == ["l1"]
@@ -0,0 +1,35 @@
+from fastapi import Request, Response
+
+from app.core.models.course import Course, course_prerequisite
+from app.services.courses.course_routes import list_courses
+
+
+async def test_course_listing_is_three_queries(engine, session, statements, admin) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            Course.__table__.insert(),
+            [{"id": i, "title": f"c{i}", "description": "d", "category": "x"} for i in range(1, 51)],
+        )
+        await conn.execute(
+            course_prerequisite.insert(),
+            [{"course_id": i, "prereq_course_id": i - 1} for i in range(2, 51)]
+            + [{"course_id": 50, "prereq_course_id": 1}],
+        )
+    statements.clear()
+
+    request = Request({"type": "http", "method": "GET", "path": "/courses/", "query_string": b"", "headers": []})
+    courses = await list_courses(
+        request=request,
+        response=Response(),
+        offset=None,
+        limit=100,
+        cursor=None,
+        _=admin,
+        session=session,
+    )
+    assert len(courses) == 50
+    # catalog version (for the ETag), the page, and all prerequisites in one query
+    assert len(statements) == 3
+    assert courses[0].prerequisite_ids == []
+    assert courses[1].prerequisite_ids == [1]
+    assert courses[49].prerequisite_ids == [1, 49]
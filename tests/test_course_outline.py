@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.core.common.cache import course_outline_cache
+from app.core.common.catalog_version import COURSE
+from app.core.models.course import Course
+from app.core.models.enums import LessonActivityType
+from app.core.models.lesson import Lesson, LessonActivity, LessonResource
+from app.core.models.module import Module
+from app.core.models.resource_version import resource_version
+from app.schemas.lesson import LessonCreate, LessonUpdate
+from app.services.courses.course_service import CourseService
+from app.services.lessons.lesson_service import LessonService
+
+
+@pytest.fixture
+async def catalog(session) -> None:
+    session.add_all(
+        [
+            Course(id=1, title="Python", description="d", category="x"),
+            Course(id=2, title="Other", description="d", category="x"),
+            Module(id=2, course_id=1, name="Advanced"),
+            Module(id=1, course_id=1, name="Basics"),
+            Module(id=3, course_id=2, name="Elsewhere"),
+            Lesson(id=11, module_id=1, name="Loops", content_type="video"),
+            Lesson(id=10, module_id=1, name="Variables", content_type="text"),
+            Lesson(id=20, module_id=2, name="Generators", content_type="text"),
+            LessonResource(id=1, lesson_id=10, file_path="/v.pdf", type="pdf"),
+            LessonActivity(id=1, lesson_id=11, type=LessonActivityType.QUIZ),
+        ]
+    )
+    await session.commit()
+
+
+async def test_outline_is_eager_loaded_in_order(session, catalog, statements) -> None:
+    outline = json.loads(await CourseService(session).course_outline(1, version=0))
+    assert [m["id"] for m in outline["modules"]] == [1, 2]
+    assert [l["id"] for l in outline["modules"][0]["lessons"]] == [10, 11]
+    assert outline["modules"][0]["lessons"][0]["resources"] == [{"id": 1, "file_path": "/v.pdf", "type": "pdf"}]
+    assert outline["modules"][0]["lessons"][1]["activities"] == [{"id": 1, "type": "quiz"}]
+    # course, prerequisites, modules, lessons, resources, activities, then
+    # the version again before caching
+    assert len(statements) == 7
+
+
+async def test_cached_outline_runs_no_queries(session, catalog, statements) -> None:
+    courses = CourseService(session)
+    first = await courses.course_outline(1, version=0)
+    statements.clear()
+    assert await courses.course_outline(1, version=0) == first
+    assert statements == []
+
+
+async def test_writes_to_another_course_keep_the_outline(session, catalog, statements) -> None:
+    courses = CourseService(session)
+    await courses.course_outline(1)
+    await LessonService(session).create_lesson(LessonCreate(module_id=3, name="Unrelated", content_type="text"), None)
+    statements.clear()
+    await courses.course_outline(1)
+    # Only the version lookup
+    assert len(statements) == 1
+
+
+async def test_writes_to_the_course_change_its_outline(session, catalog) -> None:
+    courses = CourseService(session)
+    await courses.course_outline(1)
+    await LessonService(session).update_lesson(20, LessonUpdate(name="Iterators"))
+    outline = json.loads(await courses.course_outline(1))
+    assert outline["modules"][1]["lessons"][0]["name"] == "Iterators"
+
+
+async def test_version_bumped_elsewhere_is_not_served_stale(engine, session, catalog) -> None:
+    courses = CourseService(session)
+    await courses.course_outline(1)
+
+    # Another worker's write: nothing in this process is invalidated
+    async with engine.begin() as conn:
+        await conn.execute(update(Lesson).where(Lesson.id == 20).values(name="Iterators"))
+        await conn.execute(insert(resource_version).values(resource=COURSE, resource_id=1, version=1))
+
+    outline = json.loads(await courses.course_outline(1))
+    assert outline["modules"][1]["lessons"][0]["name"] == "Iterators"
+
+
+async def test_outline_newer_than_its_version_is_not_cached(session, catalog) -> None:
+    # A lagging replica answered the version, the tree has moved on since
+    await LessonService(session).update_lesson(20, LessonUpdate(name="Iterators"))
+    outline = json.loads(await CourseService(session).course_outline(1, version=0))
+    assert outline["modules"][1]["lessons"][0]["name"] == "Iterators"
+    assert (1, 0) not in course_outline_cache
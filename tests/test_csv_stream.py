@@ -0,0 +1,124 @@
+import asyncio
+import csv
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.common import csv_stream, parallel_csv
+from app.core.config import get_settings
+from app.services.lessons.lesson_service import _IMPORT_COLUMNS as COLUMNS
+from app.services.lessons.lesson_service import LessonService
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="rows.csv")
+
+
+def test_batches_match_dict_reader_across_chunk_boundaries(monkeypatch) -> None:
+    settings = get_settings().copy(update={"csv_read_chunk_size": 7, "csv_max_record_bytes": 64})
+    monkeypatch.setattr(csv_stream, "get_settings", lambda: settings)
+
+    head = (
+        "\n"
+        "id,name,note\r\n"
+        '1,"multi\nline, with ""quotes""",x\r\n'
+        '2,3" floppy,y\n'
+        "\n"
+        "3,short\n"
+    )
+    data = b"\xef\xbb\xbf" + head.encode() + b"4,caf\xe9,z\n" + b'5,"unterminated\n'
+
+    async def scenario() -> tuple:
+        upload = _upload(data)
+        header = await csv_stream.read_csv_header(upload)
+        batches = [batch async for batch, _ in csv_stream.iter_csv_batches(upload, 2)]
+        return header, batches
+
+    header, batches = asyncio.run(scenario())
+    assert header == ["id", "name", "note"]
+    # Two records per batch; the blank line is one of them but yields no row
+    assert [len(batch) for batch in batches] == [2, 1, 2]
+
+    rows = [row for batch in batches for row in batch]
+    expected = enumerate(csv.DictReader(io.StringIO(head.lstrip("\n"))), start=2)
+    assert rows[:3] == [(num, row) for num, row in expected]
+    assert rows[1][1]["name"] == '3" floppy'
+    assert rows[3][0] == 5 and isinstance(rows[3][1], ValueError)
+    assert rows[4] == (6, {"id": "5", "name": "unterminated\n", "note": None})
+
+
+def test_header_check_reads_only_the_first_record() -> None:
+    class CountingFile(io.BytesIO):
+        consumed = 0
+
+        def read(self, size=-1):
+            data = super().read(size)
+            self.consumed += len(data)
+            return data
+
+    raw = CountingFile(b"user_id,course_id\n" + b"1,2\n" * 1_000_000)
+    upload = UploadFile(file=raw, filename="big.csv")
+
+    assert asyncio.run(csv_stream.read_csv_header(upload)) == ["user_id", "course_id"]
+    assert raw.consumed <= get_settings().csv_read_chunk_size
+    assert raw.tell() == 0
+
+
+def test_parallel_parsing_matches_inline_parsing(tmp_path) -> None:
+    data = (
+        b"\xef\xbb\xbf\n"
+        b"module_id,name,content_type\r\n"
+        b'1,"Intro, part ""one""\nand two",video\r\n'
+        b'2,3" floppy,text\n'
+        b"\n"
+        b"x,bad id,text\n"
+        b"3,caf\xe9,text\n"
+        b"4,,quiz\n"
+        b'5,"a\n\n""b""",quiz\n'
+        b"6,no newline,video"
+    )
+    path = tmp_path / "lessons.csv"
+    path.write_bytes(data)
+    parse_row = LessonService._parse_import_row
+
+    def flatten(batches) -> list:
+        return [
+            (num, str(row) if isinstance(row, Exception) else row)
+            for batch, _ in batches
+            for num, row in batch
+        ]
+
+    async def scenario() -> dict:
+        seen = {}
+        upload = UploadFile(file=open(path, "rb"), filename="lessons.csv")
+        inline = [b async for b in csv_stream.iter_parsed_batches(upload, 2, parse_row)]
+        seen["inline"] = flatten(inline)
+        for piece_bytes in (1, 16, 1 << 20):
+            pool = parallel_csv.CsvParsePool(max_workers=2, piece_bytes=piece_bytes)
+            try:
+                batches = [b async for b in pool.parsed_batches(str(path), 2, parse_row, COLUMNS)]
+                position = batches[1][1]
+                resumed = pool.parsed_batches(str(path), 2, parse_row, COLUMNS, position)
+                resumed = flatten([b async for b in resumed])
+                seen[piece_bytes] = (flatten(batches), position.row_num, resumed)
+            finally:
+                pool.shutdown()
+        await upload.close()
+        return seen
+
+    seen = asyncio.run(scenario())
+    inline = seen.pop("inline")
+    assert [num for num, _ in inline] == [2, 3, 4, 5, 6, 7, 8]
+    assert inline[0][1]["name"] == 'Intro, part "one"\nand two'
+    assert inline[1][1]["name"] == '3" floppy'
+    assert inline[3][1] == "Row is not valid UTF-8"
+    for piece_bytes, (rows, resume_row, resumed) in seen.items():
+        assert rows == inline, piece_bytes
+        assert resumed == [row for row in rows if row[0] >= resume_row], piece_bytes
+
+
+def test_parse_pool_refuses_to_fork_the_server() -> None:
+    assert parallel_csv.parse_pool.start_method == "forkserver"
+    with pytest.raises(ValueError):
+        parallel_csv.CsvParsePool(start_method="fork")
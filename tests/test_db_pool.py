@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.db.pool import InstrumentedAsyncPool, pool_stats
+from app.core.db.session import _engine_options, _engine_url
+
+
+def test_asyncpg_url_gets_statement_cache_size() -> None:
+    url = _engine_url("postgresql+asyncpg://u:p@localhost/db")
+    assert "prepared_statement_cache_size=" in url
+
+    explicit = _engine_url("postgresql+asyncpg://u:p@localhost/db?prepared_statement_cache_size=0")
+    assert explicit.endswith("prepared_statement_cache_size=0")
+
+    assert _engine_options("postgresql+asyncpg://u:p@localhost/db")["poolclass"] is InstrumentedAsyncPool
+    assert "poolclass" not in _engine_options("sqlite+aiosqlite:///:memory:")
+
+
+def test_instrumented_pool_reports_checkouts(tmp_path) -> None:
+    pytest.importorskip("aiosqlite")
+
+    async def scenario() -> dict:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedAsyncPool,
+            pool_size=2,
+            max_overflow=0,
+        )
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            during = pool_stats(engine.pool)
+        after = pool_stats(engine.pool)
+        await engine.dispose()
+        return {"during": during, "after": after}
+
+    stats = asyncio.run(scenario())
+    assert stats["during"]["checked_out"] == 1
+    assert stats["after"]["checked_out"] == 0
+    assert stats["after"]["checked_in"] == 1
+    assert stats["after"]["checkouts"] == 1
+    assert stats["after"]["size"] == 2
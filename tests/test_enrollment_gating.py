@@ -0,0 +1,138 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import delete, insert, select
+
+from app.core.common.copy_import import ImportEngine
+from app.core.models.enrollment import Enrollment
+from app.core.models.user import User
+from app.schemas.enrollment import EnrollmentCreate
+from app.services.enrollments import enrollment_service
+from app.services.enrollments.enrollment_service import EnrollmentService
+
+def _upload(rows: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(rows.encode()), filename="enrollments.csv")
+
+
+async def test_enroll_user_checks_prerequisites(gated_catalog, session) -> None:
+    service = EnrollmentService(session)
+    admin = await session.get(User, 10)
+    allowed = await service.enroll_user(EnrollmentCreate(user_id=10, course_id=3), admin)
+    assert allowed.course_id == 3
+
+    with pytest.raises(HTTPException) as exc:
+        await service.enroll_user(EnrollmentCreate(user_id=11, course_id=3), admin)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "User 11 has not completed prerequisites of course 3: 2"
+
+    overridden = await service.enroll_user(
+        EnrollmentCreate(user_id=11, course_id=3), admin, override_prerequisites=True
+    )
+    assert overridden.user_id == 11
+
+
+async def test_import_reports_prerequisite_violations_per_row(gated_catalog, session, statements) -> None:
+    rows = (
+        "user_id,course_id,progress,completion_percentage\n"
+        "11,3,0,0\n"  # missing 2
+        "12,1,1,100\n"  # completes 1 for the row below
+        "12,2,1,100\n"
+        "12,3,0,0\n"
+        "x,3,0,0\n"
+        "10,3,0,0\n"
+    )
+    success, errors, messages = await EnrollmentService(session).import_enrollments_csv(_upload(rows))
+    assert success == 4
+    assert errors == 2
+    assert messages[0] == "Row 2: User 11 has not completed prerequisites of course 3: 2"
+    assert messages[1].startswith("Row 6: invalid literal")
+    # One prerequisite query for the whole batch, not one per row
+    assert sum("course_prerequisite" in sql for sql in statements) == 1
+
+    enrolled = set((await session.execute(select(Enrollment.user_id, Enrollment.course_id))).all())
+    assert {(12, 3), (10, 3)} <= enrolled and (11, 3) not in enrolled
+
+
+async def test_import_validates_each_chunk_with_set_queries(gated_catalog, session, statements) -> None:
+    rows = (
+        "user_id,course_id,progress,completion_percentage\n"
+        "99,1,0,0\n"
+        "12,9,0,0\n"
+        "10,1,0,0\n"  # already enrolled
+        "12,1,0,0\n"
+        "12,1,0,0\n"  # repeated in the file
+        "11,2,0,0\n"
+    )
+    service = EnrollmentService(session)
+    success, errors, messages = await service.import_enrollments_csv(_upload(rows), override_prerequisites=True)
+    assert (success, errors) == (2, 4)
+    assert messages == [
+        "Row 2: User 99 not found",
+        "Row 3: Course 9 not found",
+        "Row 4: User 10 already enrolled in course 1",
+        "Row 6: User 12 already enrolled in course 1",
+    ]
+    # users, courses and existing pairs, whatever the row count
+    assert sum(sql.lstrip().upper().startswith("SELECT") for sql in statements) == 3
+
+    enrolled = (await session.execute(select(Enrollment.user_id, Enrollment.course_id))).all()
+    assert enrolled.count((12, 1)) == 1
+
+
+async def test_copy_engine_falls_back_off_postgres(gated_catalog, session) -> None:
+    rows = "user_id,course_id,progress,completion_percentage\n99,1,0,0\n12,1,0,0\n12,1,0,0\n"
+    result = await EnrollmentService(session).import_enrollments_csv(_upload(rows), engine=ImportEngine.COPY)
+    assert result == (1, 2, ["Row 2: User 99 not found", "Row 4: User 12 already enrolled in course 1"])
+
+
+def test_copy_engine_statements_compile_for_postgres() -> None:
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateTable
+
+    from app.services.enrollments.enrollment_service import (
+        _enrollment_staging,
+        _staged_enrollment_insert,
+        _staged_enrollment_rejects,
+    )
+
+    dialect = postgresql.dialect()
+    ddl = str(CreateTable(_enrollment_staging).compile(dialect=dialect))
+    assert ddl.startswith("\nCREATE TEMPORARY TABLE") and "ON COMMIT DROP" in ddl
+    assert 'LEFT OUTER JOIN "user"' in str(_staged_enrollment_rejects().compile(dialect=dialect))
+    insert_sql = str(_staged_enrollment_insert().compile(dialect=dialect))
+    assert insert_sql.startswith("INSERT INTO enrollment ") and "NOT (EXISTS" in insert_sql
+    assert insert_sql.endswith("RETURNING enrollment.user_id, enrollment.course_id")
+
+
+async def test_copy_engine_reports_rows_the_guarded_insert_skips(gated_catalog, session, monkeypatch) -> None:
+    # The COPY helpers are asyncpg-only; stage with plain SQL instead, and
+    # change the data between the reject query and the final insert
+    async def stage(session, staging, records) -> None:
+        connection = await session.connection()
+        await connection.run_sync(staging.create)
+        columns = [column.name for column in staging.columns]
+        await session.execute(insert(staging), [dict(zip(columns, row)) for row in records])
+
+    async def discard_and_race(session, staging, row_nums) -> None:
+        await session.execute(delete(staging).where(staging.c.row_num.in_(row_nums)))
+        await session.execute(delete(User).where(User.id == 12))
+        await session.execute(
+            insert(Enrollment).values(user_id=11, course_id=2, progress=0, completion_percentage=0)
+        )
+
+    monkeypatch.setattr(enrollment_service, "copy_to_staging", stage)
+    monkeypatch.setattr(enrollment_service, "discard_staged", discard_and_race)
+
+    def row(user_id: int, course_id: int) -> dict:
+        return {"user_id": user_id, "course_id": course_id, "progress": 0.0, "completion_percentage": 0.0}
+
+    parsed = [(2, row(12, 1)), (3, row(11, 2)), (4, row(10, 3)), (5, ValueError("bad row"))]
+    inserted, errors, user_ids = await EnrollmentService(session)._import_chunk_copy(parsed, gated=False)
+    assert inserted + len(errors) == len(parsed)
+    assert (inserted, user_ids) == (1, {10})
+    assert errors == [
+        (2, "User 12 not found"),
+        (3, "User 11 already enrolled in course 2"),
+        (5, "bad row"),
+    ]
@@ -0,0 +1,167 @@
+import asyncio
+import io
+import os
+from typing import Iterator, List
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select
+
+from app.core.auth import Principal
+from app.core.common.parallel_csv import parse_pool
+from app.core.config import get_settings
+from app.core.models.enrollment import Enrollment
+from app.core.models.enums import ImportJobStatus, ImportKind, UserRole
+from app.core.models.import_job import ImportJob
+from app.services.imports import import_service, import_worker
+from app.services.imports.import_service import ImportJobService, job_progress
+from app.services.imports.import_worker import ImportWorker
+
+ROWS = (
+    "user_id,course_id,progress,completion_percentage\n"
+    "10,3,0,0\n"
+    "99,1,0,0\n"
+    "12,1,0,0\n"  # interrupted while committing this batch
+    "12,2,0,0\n"
+    "11,2,0,0\n"
+    "12,9,0,0\n"
+)
+
+ADMIN = Principal(id=10, role=UserRole.ADMIN, email=None, token_version=0)
+
+
+@pytest.fixture(params=[False, True], ids=["inline", "parallel"])
+def parallel(request) -> bool:
+    return request.param
+
+
+@pytest.fixture
+def spool_dir(tmp_path, monkeypatch) -> str:
+    settings = get_settings().copy(update={"import_spool_dir": str(tmp_path / "spool")})
+    monkeypatch.setattr(import_service, "get_settings", lambda: settings)
+    return settings.import_spool_dir
+
+
+@pytest.fixture
+async def job(gated_catalog, session, spool_dir, parallel) -> ImportJob:
+    upload = UploadFile(file=io.BytesIO(ROWS.encode()), filename="enrollments.csv")
+    return await ImportJobService(session).submit(
+        ImportKind.ENROLLMENTS, upload, {"batch_size": 2, "parallel": parallel}, ADMIN
+    )
+
+
+@pytest.fixture
+def worker(session_factory) -> Iterator[ImportWorker]:
+    yield ImportWorker(session_factory=session_factory)
+    parse_pool.shutdown()
+
+
+@pytest.fixture
+def opened(monkeypatch) -> List[str]:
+    """
+    Paths the import worker opens from here on.
+    """
+
+    paths: List[str] = []
+
+    def spy_open(path, *args, **kwargs):
+        paths.append(path)
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(import_worker, "open", spy_open, raising=False)
+    return paths
+
+
+@pytest.fixture
+def restarted(session_factory) -> ImportWorker:
+    # A worker in a new process: all it has is the job row and the spooled file
+    return ImportWorker(session_factory=session_factory)
+
+
+@pytest.fixture
+async def interrupted(job, worker, session_factory, monkeypatch) -> ImportJob:
+    # Cancel the worker while it records the second batch
+    checkpoints = []
+
+    async def interrupt_second_batch(*args) -> None:
+        checkpoints.append(args[3])
+        if len(checkpoints) == 2:
+            raise asyncio.CancelledError
+        await import_service.record_batch(*args)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(import_worker, "record_batch", interrupt_second_batch)
+        with pytest.raises(asyncio.CancelledError):
+            await worker.run_job(*await worker.claim())
+    async with session_factory() as session:
+        return await session.get(ImportJob, job.id)
+
+
+async def test_submit_spools_the_upload(job, spool_dir) -> None:
+    assert job.status is ImportJobStatus.QUEUED
+    assert os.path.dirname(job.file_path) == spool_dir
+    assert os.path.exists(job.file_path)
+
+
+async def test_submit_without_spool_dir_is_refused(gated_catalog, session, monkeypatch) -> None:
+    settings = get_settings().copy(update={"import_spool_dir": None})
+    monkeypatch.setattr(import_service, "get_settings", lambda: settings)
+    upload = UploadFile(file=io.BytesIO(ROWS.encode()), filename="enrollments.csv")
+    with pytest.raises(HTTPException) as exc:
+        await ImportJobService(session).submit(ImportKind.ENROLLMENTS, upload, {}, ADMIN)
+    assert exc.value.status_code == 503
+
+
+async def test_interrupted_job_is_requeued_at_last_committed_batch(interrupted) -> None:
+    assert interrupted.status is ImportJobStatus.QUEUED
+    assert (interrupted.rows_processed, interrupted.next_row) == (2, 4)
+
+
+async def test_resumed_job_imports_every_row_once(
+    interrupted, restarted, opened, session_factory, parallel
+) -> None:
+    parsed_rows = parse_pool.rows
+    await restarted.run_job(*await restarted.claim())
+    # The spooled file is opened again and only the interrupted batch re-parsed
+    assert opened == [interrupted.file_path]
+    assert parse_pool.rows - parsed_rows == (4 if parallel else 0)
+
+    async with session_factory() as session:
+        done = await ImportJobService(session).get_job(interrupted.id, ADMIN)
+        stmt = select(Enrollment.user_id, Enrollment.course_id).where(Enrollment.id > 3)
+        enrolled = sorted((await session.execute(stmt)).all())
+    assert done.status is ImportJobStatus.SUCCEEDED
+    assert done.attempts == 2
+    assert (done.rows_processed, done.success_count, done.error_count) == (6, 4, 2)
+    assert done.bytes_processed == done.file_size == len(ROWS)
+    assert not os.path.exists(done.file_path)
+    assert enrolled == [(10, 3), (11, 2), (12, 1), (12, 2)]
+
+
+async def test_finished_job_reports_errors_and_progress(interrupted, restarted, session_factory) -> None:
+    await restarted.run_job(*await restarted.claim())
+    async with session_factory() as session:
+        service = ImportJobService(session)
+        report = "".join([chunk async for chunk in service.stream_errors_csv(interrupted.id)])
+        done = await service.get_job(interrupted.id, ADMIN)
+    assert report == "row,message\n3,User 99 not found\n7,Course 9 not found\n"
+
+    progress = job_progress(done)
+    assert progress.eta_seconds == 0.0
+    assert progress.errors_url == f"/imports/{interrupted.id}/errors"
+
+
+async def test_job_whose_spooled_file_is_gone_is_failed_not_claimed(
+    interrupted, restarted, opened, session_factory
+) -> None:
+    # e.g. spooled to a local directory on another host
+    os.remove(interrupted.file_path)
+    assert await restarted.claim() is None
+    assert opened == []
+
+    async with session_factory() as session:
+        failed = await session.get(ImportJob, interrupted.id)
+    assert failed.status is ImportJobStatus.FAILED
+    assert failed.attempts == 1
+    assert failed.error.startswith(f"Spooled upload {interrupted.file_path} is missing")
+    assert restarted.stats()["failed"] == 1
@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import update
+
+from app.core.common.catalog_version import touch_courses, touch_progress
+from app.core.models.course import Course, course_prerequisite
+from app.core.models.enrollment import Enrollment
+from app.core.models.enums import UserRole
+from app.core.models.user import User
+from app.schemas.course import CourseSetPrerequisitesRequest
+from app.schemas.enrollment import EnrollmentUpdate
+from app.services.courses.course_service import CourseService
+from app.services.courses.prerequisite_closure import refresh_closure
+from app.services.enrollments.enrollment_service import EnrollmentService
+from app.services.learning_paths.learning_path_service import LearningPathService, plan_path
+from app.services.users.user_service import UserService
+
+
+def test_plan_path_skips_completed_branches() -> None:
+    # 5 requires 3 and 4; 3 requires 2, which requires 1; 4 requires 1
+    prereqs = {5: [3, 4], 3: [2], 2: [1], 4: [1]}
+    assert plan_path(prereqs, 5, []) == [1, 2, 3, 4, 5]
+    # 3 done: 2 is only needed through 3, but 1 is still needed for 4
+    assert plan_path(prereqs, 5, [3]) == [1, 4, 5]
+    assert plan_path(prereqs, 5, [3, 4]) == [5]
+    assert plan_path(prereqs, 5, [5]) == []
+
+
+@pytest.fixture
+async def catalog(session, admin) -> None:
+    # 4 requires 1 and 3, 3 requires 2, 2 requires 1; user 11 completed 1,
+    # user 12 is part way through 2
+    session.add_all(Course(id=i, title=f"c{i}", description="d", category="x") for i in range(1, 5))
+    session.add_all(
+        User(id=i, email=f"u{i}@x.io", first_name="U", last_name=str(i), role=UserRole.LEARNER)
+        for i in (10, 11, 12)
+    )
+    session.add_all(
+        [
+            Enrollment(id=1, user_id=11, course_id=1, completion_percentage=100.0),
+            Enrollment(id=2, user_id=12, course_id=2, completion_percentage=40.0),
+        ]
+    )
+    await session.commit()
+    courses = CourseService(session)
+    for course_id, prereqs in ((2, [1]), (3, [2]), (4, [1, 3])):
+        await courses.set_prerequisites(course_id, CourseSetPrerequisitesRequest(prerequisite_ids=prereqs), admin)
+
+
+async def test_learning_paths_are_batched(session, catalog, statements) -> None:
+    paths, unknown = await LearningPathService(session).learning_paths([12, 10, 11, 99], 4)
+    assert list(paths) == [12, 10, 11]
+    assert paths == {12: [1, 2, 3, 4], 10: [1, 2, 3, 4], 11: [2, 3, 4]}
+    assert unknown == [99]
+    # course lookup, counters, subgraph, users, enrollments
+    assert len(statements) == 5
+
+
+async def test_cached_learning_paths_only_read_the_counters(session, catalog, statements) -> None:
+    service = LearningPathService(session)
+    await service.learning_paths([10, 11, 12], 4)
+    statements.clear()
+    paths, _ = await service.learning_paths([10, 11, 12], 4)
+    assert paths == {10: [1, 2, 3, 4], 11: [2, 3, 4], 12: [1, 2, 3, 4]}
+    # course lookup, counters
+    assert len(statements) == 2
+
+
+async def test_progress_update_refreshes_the_learning_path(session, catalog) -> None:
+    service = LearningPathService(session)
+    assert await service.learning_path(12, 4) == [1, 2, 3, 4]
+    await EnrollmentService(session).update_enrollment(2, EnrollmentUpdate(completion_percentage=100.0))
+    assert await service.learning_path(12, 4) == [1, 3, 4]
+
+
+async def test_progress_committed_by_another_worker_is_not_served_stale(
+    session, session_factory, catalog
+) -> None:
+    service = LearningPathService(session)
+    assert await service.learning_path(12, 4) == [1, 2, 3, 4]
+    # A write through another process touches nothing in this one's cache
+    async with session_factory() as other:
+        touch_progress(other, [12])
+        await other.execute(update(Enrollment).where(Enrollment.id == 2).values(completion_percentage=100.0))
+        await other.commit()
+    assert await service.learning_path(12, 4) == [1, 3, 4]
+
+
+async def test_prerequisite_change_committed_by_another_worker_is_not_served_stale(
+    session, session_factory, catalog
+) -> None:
+    service = LearningPathService(session)
+    assert await service.learning_path(11, 4) == [2, 3, 4]
+    # 3 now requires 1 instead of 2
+    async with session_factory() as other:
+        touch_courses(other, [3], catalog=True)
+        edge = course_prerequisite.c
+        await other.execute(update(course_prerequisite).where(edge.course_id == 3).values(prereq_course_id=1))
+        await refresh_closure(other, [3, 4])
+        await other.commit()
+    assert await service.learning_path(11, 4) == [3, 4]
+
+
+async def test_deleted_learner_is_reported_unknown(session, catalog, admin) -> None:
+    service = LearningPathService(session)
+    await service.learning_paths([10, 11], 4)
+    await UserService(session).delete_user(10, admin)
+    assert await service.learning_paths([10, 11], 4) == ({11: [2, 3, 4]}, [10])
@@ -0,0 +1,40 @@
+from app.core.metrics import LatencyHistogram, LatencyRegistry, OTHER_ROUTE, bucket_index
+
+
+def test_histogram_quantiles_within_bucket_precision() -> None:
+    histogram = LatencyHistogram(slot_seconds=15, num_slots=4)
+    for value in range(1, 1001):
+        histogram.record(float(value), now=100.0)
+
+    stats = histogram.snapshot(60, now=100.0)
+    assert stats["count"] == 1000
+    assert stats["max"] == 1000.0
+    assert 500 <= stats["p50"] <= 500 * 1.1
+    assert 990 <= stats["p99"] <= 1000
+
+
+def test_histogram_window_drops_old_slots() -> None:
+    histogram = LatencyHistogram(slot_seconds=15, num_slots=4)
+    histogram.record(5.0, now=0.0)
+    histogram.record(7.0, now=50.0)
+
+    assert histogram.snapshot(15, now=50.0)["count"] == 1
+    assert histogram.snapshot(60, now=50.0)["count"] == 2
+    assert histogram.total_count == 2
+
+
+def test_registry_caps_series_cardinality() -> None:
+    registry = LatencyRegistry(slot_seconds=15, num_slots=4, max_series=2)
+    registry.record("/courses/", "GET", 1.0)
+    registry.record("/courses/{course_id}", "GET", 1.0)
+    registry.record("/users/", "GET", 1.0)
+
+    routes = {row["route"] for row in registry.snapshot(60)}
+    assert len(registry) == 3
+    assert OTHER_ROUTE in routes
+
+
+def test_bucket_index_is_monotonic() -> None:
+    values = [0.001, 0.5, 1.0, 10.0, 250.0, 10_000.0, 10_000_000.0]
+    indexes = [bucket_index(v) for v in values]
+    assert indexes == sorted(indexes)
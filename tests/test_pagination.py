@@ -0,0 +1,96 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.common.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.core.models.enums import UserRole
+from app.core.models.user import User
+from app.main import create_app
+from app.services.users.user_service import UserService
+
+
+def test_cursor_round_trip_and_rejects_foreign_sort() -> None:
+    cursor = encode_cursor("email", "b@example.com", 7)
+    assert decode_cursor(cursor, "email") == {"value": "b@example.com", "id": 7}
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "id")
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor", "id")
+
+
+def _crafted(payload: dict) -> str:
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "sort, payload",
+    [
+        ("id", {"s": "id", "v": 5, "i": "5"}),
+        ("id", {"s": "id", "v": 5, "i": [5]}),
+        ("id", {"s": "id", "v": 5, "i": True}),
+        ("id", {"s": "id", "v": 5, "i": None}),
+        ("email", {"s": "email", "v": 12, "i": 3}),
+        ("email", {"s": "email", "v": ["a"], "i": 3}),
+        ("created_at", {"s": "created_at", "v": {"$dt": 1}, "i": 3}),
+        ("created_at", {"s": "created_at", "v": "2024-01-01", "i": 3}),
+        ("role", {"s": "role", "v": "superuser", "i": 3}),
+    ],
+)
+def test_crafted_cursor_types_are_rejected(sort, payload) -> None:
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(_crafted(payload), sort, getattr(User, sort), User.id)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid pagination cursor"
+
+
+def test_cursor_types_follow_the_sort_column() -> None:
+    created = datetime(2024, 1, 2, 3, 4, 5)
+    for sort, value in (("email", "a@example.com"), ("created_at", created), ("role", UserRole.ADMIN)):
+        cursor = encode_cursor(sort, value, 9)
+        decoded = decode_cursor(cursor, sort, getattr(User, sort), User.id)
+        assert decoded == {"value": getattr(value, "value", value), "id": 9}
+
+
+@pytest.fixture
+async def users(session) -> None:
+    # Emails sort in reverse id order
+    session.add_all(
+        User(id=i, email=f"{chr(ord('z') - i)}@example.com", first_name="F", last_name="L", role=UserRole.LEARNER)
+        for i in range(1, 12)
+    )
+    await session.commit()
+
+
+@pytest.mark.parametrize("sort, expected", [("id", list(range(1, 12))), ("email", list(range(11, 0, -1)))])
+async def test_list_page_walks_every_row_once(session, users, sort, expected) -> None:
+    service = UserService(session)
+    seen, cursor = [], None
+    while True:
+        page, cursor = await service.list_users_page(cursor=cursor, limit=4, sort=sort)
+        seen.extend(user.id for user in page)
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+async def test_only_cursor_pages_are_capped(session, users) -> None:
+    service = UserService(session)
+    assert len(await service.list_users(offset=0, limit=MAX_PAGE_SIZE + 1)) == 11
+    for limit in (0, MAX_PAGE_SIZE + 1):
+        with pytest.raises(HTTPException) as exc:
+            await service.list_users_page(limit=limit)
+        assert exc.value.status_code == 422
+
+
+def test_offset_listings_keep_an_unbounded_limit() -> None:
+    paths = create_app().openapi()["paths"]
+    for path in ("/users/", "/courses/", "/enrollments/"):
+        (limit,) = [param for param in paths[path]["get"]["parameters"] if param["name"] == "limit"]
+        assert not {"minimum", "maximum"} & set(limit["schema"])
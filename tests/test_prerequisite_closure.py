@@ -0,0 +1,112 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+
+from app.core.models.course import Course, course_prerequisite_closure
+from app.schemas.course import CourseSetPrerequisitesRequest
+from app.services.courses.course_service import CourseService
+from app.services.courses.prerequisite_closure import (
+    backfill_closure,
+    check_closure,
+    compute_closure,
+    topological_order,
+)
+
+
+def test_compute_closure_uses_longest_chain() -> None:
+    # 4 -> 3 -> 2 -> 1 and a shortcut 4 -> 1
+    closure = compute_closure([(2, 1), (3, 2), (4, 3), (4, 1)])
+    assert closure[4] == {3: 1, 2: 2, 1: 3}
+    assert closure[1] == {}
+
+    partial = compute_closure([(5, 4)], nodes=[5], known={4: closure[4]})
+    assert partial == {5: {4: 1, 3: 2, 2: 3, 1: 4}}
+
+    with pytest.raises(ValueError):
+        compute_closure([(1, 2), (2, 1)])
+
+
+def test_topological_order_breaks_ties_by_id() -> None:
+    # 4 requires 2 and 3, both of which require 1; 5 requires 4
+    edges = [(2, 1), (3, 1), (4, 2), (4, 3), (5, 4)]
+    assert topological_order(edges, range(1, 6)) == [1, 2, 3, 4, 5]
+    # Only edges inside the subset count
+    assert topological_order(edges, [5, 3, 1]) == [1, 3, 5]
+
+
+def request(*ids: int) -> CourseSetPrerequisitesRequest:
+    return CourseSetPrerequisitesRequest(prerequisite_ids=list(ids))
+
+
+async def closure_rows(session) -> set:
+    result = await session.execute(select(course_prerequisite_closure))
+    return set(result.all())
+
+
+@pytest.fixture
+async def chain(session, admin) -> CourseService:
+    # 5 -> 4 -> 3 -> 2 -> 1, with 3 added last so its dependents get refreshed
+    session.add_all(Course(id=i, title=f"c{i}", description="d", category="x") for i in range(1, 6))
+    await session.commit()
+    service = CourseService(session)
+    await service.set_prerequisites(2, request(1), admin)
+    await service.set_prerequisites(4, request(3), admin)
+    await service.set_prerequisites(5, request(4), admin)
+    await service.set_prerequisites(3, request(2), admin)
+    return service
+
+
+async def test_closure_is_maintained_through_dependents(session, chain) -> None:
+    rows = await closure_rows(session)
+    assert (1, 5, 4) in rows and (2, 4, 2) in rows
+    assert len(rows) == 10
+    assert await chain.prerequisite_closure(5) == [1, 2, 3, 4]
+    assert await chain.dependent_closure(2) == [3, 4, 5]
+
+
+async def test_cycle_is_rejected_with_its_path(chain, admin) -> None:
+    with pytest.raises(HTTPException) as exc:
+        await chain.set_prerequisites(1, request(5), admin)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Prerequisites would create a cycle: 1 -> 2 -> 3 -> 4 -> 5 -> 1"
+
+
+async def test_cycle_path_is_the_shortest_through_the_dependents(session, admin) -> None:
+    # 4 requires 2 and 3, both of which require 1; 5 requires 4
+    session.add_all(Course(id=i, title=f"c{i}", description="d", category="x") for i in range(1, 6))
+    await session.commit()
+    service = CourseService(session)
+    for course_id, prereqs in ((2, [1]), (3, [1]), (4, [2, 3]), (5, [4])):
+        await service.set_prerequisites(course_id, request(*prereqs), admin)
+
+    with pytest.raises(HTTPException) as exc:
+        await service.set_prerequisites(1, request(3, 5), admin)
+    assert exc.value.detail == "Prerequisites would create a cycle: 1 -> 3 -> 1"
+    with pytest.raises(HTTPException) as exc:
+        await service.set_prerequisites(1, request(5), admin)
+    assert exc.value.detail == "Prerequisites would create a cycle: 1 -> 2 -> 4 -> 5 -> 1"
+    with pytest.raises(HTTPException) as exc:
+        await service.set_prerequisites(4, request(4), admin)
+    assert exc.value.detail == "Prerequisites would create a cycle: 4 -> 4"
+
+
+async def test_cutting_an_edge_drops_the_paths_through_it(session, chain, admin) -> None:
+    await chain.set_prerequisites(3, request(), admin)
+    assert await closure_rows(session) == {(1, 2, 1), (3, 4, 1), (3, 5, 2), (4, 5, 1)}
+
+
+async def test_deleting_a_course_drops_its_paths(session, chain, admin) -> None:
+    await chain.delete_course(3, admin)
+    assert await closure_rows(session) == {(1, 2, 1), (4, 5, 1)}
+    assert await check_closure(session) == {"missing": [], "extra": [], "changed": []}
+
+
+async def test_check_and_backfill_repair_a_lost_closure(session, chain, admin) -> None:
+    await chain.delete_course(3, admin)
+    expected = await closure_rows(session)
+    await session.execute(delete(course_prerequisite_closure))
+    await session.commit()
+
+    assert (await check_closure(session))["missing"] == [(1, 2, 1), (4, 5, 1)]
+    await backfill_closure(session)
+    assert await closure_rows(session) == expected
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.core.models  # noqa: F401  (register tables)
+from app.core.common.cache import principal_cache, user_exists_cache
+from app.core.db import session as db_session
+from app.core.db.base import Base
+from app.core.models.course import Course
+from app.core.models.enrollment import Enrollment
+from app.core.models.enums import UserRole
+from app.core.models.user import User
+from app.main import create_app
+
+
+def _seed(url: str, course_title: str) -> None:
+    async def scenario() -> None:
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                User.__table__.insert().values(
+                    id=1, email="admin@example.com", first_name="A", last_name="B", role=UserRole.ADMIN
+                )
+            )
+            await conn.execute(
+                Course.__table__.insert().values(
+                    id=1, title=course_title, description="d", category="c"
+                )
+            )
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    primary = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    replica = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    _seed(primary, "from primary")
+    _seed(replica, "from replica")
+
+    settings = db_session.settings.copy(
+        update={"database_url": primary, "read_database_url": replica}
+    )
+    monkeypatch.setattr(db_session, "settings", settings)
+    for factory in (
+        db_session.get_engine,
+        db_session.get_read_engine,
+        db_session.get_sessionmaker,
+        db_session.get_read_sessionmaker,
+    ):
+        factory.cache_clear()
+    principal_cache.clear()
+    user_exists_cache.clear()
+
+    yield TestClient(create_app())
+
+    asyncio.run(db_session.dispose_engine())
+    for factory in (
+        db_session.get_engine,
+        db_session.get_read_engine,
+        db_session.get_sessionmaker,
+        db_session.get_read_sessionmaker,
+    ):
+        factory.cache_clear()
+    principal_cache.clear()
+    user_exists_cache.clear()
+
+
+def _title(client: TestClient, **headers: str) -> str:
+    response = client.get("/courses/1", headers={"X-User-Id": "1", **headers})
+    assert response.status_code == 200
+    return response.json()["title"]
+
+
+def test_reads_go_to_replica_unless_pinned(client: TestClient) -> None:
+    assert _title(client) == "from replica"
+    assert _title(client, **{"X-Read-Primary": "true"}) == "from primary"
+
+
+def test_successful_write_pins_client_to_primary(client: TestClient) -> None:
+    response = client.put(
+        "/users/1",
+        json={"first_name": "Ada"},
+        headers={"X-User-Id": "1"},
+    )
+    assert response.status_code == 200
+    assert "kg_read_primary_until" in response.headers["set-cookie"]
+
+    assert _title(client) == "from primary"
+
+
+def test_learning_paths_are_planned_from_the_primary(client: TestClient, tmp_path) -> None:
+    # The completion has not reached the replica yet
+    engine = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    with engine.begin() as conn:
+        conn.execute(Enrollment.__table__.insert().values(user_id=1, course_id=1, completion_percentage=100.0))
+    engine.dispose()
+
+    response = client.get("/users/1/learning-path/1", headers={"X-User-Id": "1"})
+    assert response.status_code == 200
+    assert response.json()["course_ids"] == []
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.models.course import Course
+from app.core.models.lesson import Lesson
+from app.core.models.module import Module
+from app.services.search.inverted_index import highlight, tokenize
+from app.services.search.search_service import SearchService
+
+
+def test_tokenize_and_highlight() -> None:
+    assert tokenize("The Graphs of Libraries") == ["graph", "library"]
+    assert highlight("Graph theory: graphs", ["graph"]) == "<mark>Graph</mark> theory: <mark>graphs</mark>"
+
+
+def test_postgres_statement_uses_index_and_keyset() -> None:
+    stmt = SearchService.postgres_statement("graph theory", "lesson", (0.5, "lesson", 7), 21)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "websearch_to_tsquery" in sql
+    assert "search_document.vector @@" in sql
+    assert "ts_rank(search_document.vector" in sql
+    assert "(ranked.kind, ranked.source_id) >" in sql
+    # Highlighting wraps the limited page, not every match
+    assert sql.index("ts_headline") < sql.index("LIMIT")
+
+
+@pytest.fixture
+async def service(session) -> SearchService:
+    session.add_all(
+        [
+            Course(id=1, title="Graph Theory", description="Paths and trees", category="math"),
+            Course(id=2, title="Databases", description="Storing graphs in tables", category="cs"),
+            Module(id=1, course_id=2, name="Graph databases"),
+        ]
+    )
+    session.add_all(Lesson(id=i, module_id=1, name=f"Graph lesson {i}", content_type="text") for i in range(1, 6))
+    await session.commit()
+    return SearchService(session)
+
+
+def _keys(hits: list) -> list:
+    return [(hit["kind"], hit["id"]) for hit in hits]
+
+
+async def test_memory_search_ranks_and_highlights(service) -> None:
+    top, _ = await service.search("graphs", limit=3)
+    assert _keys(top) == [("course", 1), ("lesson", 1), ("lesson", 2)]
+    assert top[0]["highlight"] == "<mark>Graph</mark> Theory"
+
+    both_terms, _ = await service.search("graph trees")
+    assert _keys(both_terms) == [("course", 1)]
+
+
+async def test_memory_search_filters_by_kind(service) -> None:
+    courses, _ = await service.search("graph", kind="course")
+    assert [hit["id"] for hit in courses] == [1, 2]
+    assert courses[1]["snippet"] == "Storing <mark>graphs</mark> in tables"
+
+
+async def test_memory_search_pages_every_hit_once(service) -> None:
+    pages, cursor = [], None
+    while True:
+        hits, cursor = await service.search("graph", cursor=cursor, limit=2)
+        pages.append(hits)
+        if cursor is None:
+            break
+    paged = [key for page in pages for key in _keys(page)]
+    assert len(paged) == 8 and len(set(paged)) == 8
+    assert [len(page) for page in pages] == [2, 2, 2, 2]
+
+
+async def test_orm_writes_invalidate_the_memory_index(session, service) -> None:
+    await service.search("graph")
+    session.add(Lesson(id=6, module_id=1, name="Spanning trees", content_type="text"))
+    await session.commit()
+    hits, _ = await service.search("spanning")
+    assert _keys(hits) == [("lesson", 6)]